@@ -0,0 +1,183 @@
+import argparse
+from typing import Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlencode, urlparse
+from uuid import UUID
+
+from flask import Flask
+from flask.testing import FlaskClient
+from werkzeug.test import TestResponse
+
+from authentication.oauth_client import OAuthClient
+from starter_app.starter_app import create_app
+from test_support.db_template import TestDatabaseTemplate, test_db_template
+from test_support.load_test import (
+    LoadTestResult,
+    RequestFunction,
+    load_baseline,
+    load_test,
+    print_load_results,
+    save_load_results,
+)
+
+BACKGROUND_ACCOUNTS = 400
+BACKGROUND_MEMBERS = 25
+SHARED_ACCOUNTS = 150
+ACCOUNT_MEMBERS = 2000
+RESULTS = "benchmarks/results/load_test.json"
+BASELINE = "benchmarks/results/load_test_baseline.json"
+
+
+class StubOAuthClient(OAuthClient):
+    def __init__(self) -> None:
+        super().__init__("load-test", "load-test", "http://localhost")
+
+    def auth_url(self, state: str) -> str:
+        return f"https://accounts.example.com/auth?{urlencode({'state': state})}"
+
+    def fetch_email(self, code: str) -> Optional[str]:
+        return code
+
+
+class Seed:
+    def __init__(self, db: TestDatabaseTemplate, workers: int, requests: int) -> None:
+        self.emails: List[str] = []
+        self.account_ids: List[UUID] = []
+        self.removable_user_ids: List[List[UUID]] = []
+
+        background_account_ids = [
+            db.account(f"background account {index}")
+            for index in range(BACKGROUND_ACCOUNTS)
+        ]
+        for index, account_id in enumerate(background_account_ids):
+            db.add_users(
+                [
+                    f"background-{index}-{member}@example.com"
+                    for member in range(BACKGROUND_MEMBERS)
+                ],
+                account_id,
+            )
+
+        for worker in range(workers):
+            email = f"load-{worker}@example.com"
+            user_id, account_id = db.account_with_user(email, f"load account {worker}")
+            db.add_users(
+                [
+                    f"member-{worker}-{member}@example.com"
+                    for member in range(ACCOUNT_MEMBERS)
+                ],
+                account_id,
+            )
+            for shared_account_id in background_account_ids[:SHARED_ACCOUNTS]:
+                db.membership(user_id=user_id, account_id=shared_account_id)
+
+            self.emails.append(email)
+            self.account_ids.append(account_id)
+            self.removable_user_ids.append(
+                db.add_users(
+                    [
+                        f"removable-{worker}-{request}@example.com"
+                        for request in range(requests)
+                    ],
+                    account_id,
+                )
+            )
+
+
+def sign_in(client: FlaskClient, email: str) -> TestResponse:
+    location = client.get("/authenticate").location
+    state = parse_qs(urlparse(location).query)["state"][0]
+    return client.get(f"/oauth/callback?{urlencode({'state': state, 'code': email})}")
+
+
+def signed_in_client(app: Flask, email: str) -> FlaskClient:
+    client = app.test_client()
+    client.get(sign_in(client, email).location)
+    return client
+
+
+def scenarios(app: Flask, seed: Seed) -> Dict[str, Callable[[int], RequestFunction]]:
+    def oauth_callback(worker: int) -> RequestFunction:
+        return lambda _: (
+            sign_in(app.test_client(), seed.emails[worker]).location == "/dashboard"
+        )
+
+    def accounts(worker: int) -> RequestFunction:
+        client = signed_in_client(app, seed.emails[worker])
+        return lambda _: client.get("/accounts").status_code == 200
+
+    def accounts_not_modified(worker: int) -> RequestFunction:
+        client = signed_in_client(app, seed.emails[worker])
+        etag = client.get("/accounts").headers["ETag"]
+        return lambda _: (
+            client.get("/accounts", headers={"If-None-Match": etag}).status_code == 304
+        )
+
+    def account(worker: int) -> RequestFunction:
+        client = signed_in_client(app, seed.emails[worker])
+        path = f"/accounts/{seed.account_ids[worker]}"
+        return lambda _: client.get(path).status_code == 200
+
+    def add_member(worker: int) -> RequestFunction:
+        client = signed_in_client(app, seed.emails[worker])
+        path = f"/accounts/{seed.account_ids[worker]}/members"
+        return lambda request: (
+            client.post(
+                path, data={"email": f"added-{worker}-{request}@example.com"}
+            ).status_code
+            == 302
+        )
+
+    def remove_member(worker: int) -> RequestFunction:
+        client = signed_in_client(app, seed.emails[worker])
+        account_id = seed.account_ids[worker]
+        user_ids = seed.removable_user_ids[worker]
+        return lambda request: (
+            client.post(
+                f"/accounts/{account_id}/members/{user_ids[request]}/remove"
+            ).status_code
+            == 302
+        )
+
+    return {
+        "oauth callback": oauth_callback,
+        "GET /accounts": accounts,
+        "GET /accounts (304)": accounts_not_modified,
+        "GET /accounts/<id>": account,
+        "POST add member": add_member,
+        "POST remove member": remove_member,
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Load test the starter app")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--save-baseline", action="store_true")
+    arguments = parser.parse_args()
+
+    db = test_db_template()
+    db.clear()
+    try:
+        seed = Seed(db, arguments.concurrency, arguments.requests)
+        app = create_app(oauth_client=StubOAuthClient())
+
+        results: List[LoadTestResult] = [
+            load_test(
+                name,
+                worker,
+                concurrency=arguments.concurrency,
+                requests_per_worker=arguments.requests,
+            )
+            for name, worker in scenarios(app, seed).items()
+        ]
+    finally:
+        db.clear()
+
+    print_load_results(results, load_baseline(BASELINE))
+    save_load_results(RESULTS, results)
+    if arguments.save_baseline:
+        save_load_results(BASELINE, results)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,18 @@
+import os
+import shutil
+from typing import Any
+
+from prometheus_client import multiprocess
+
+metrics_directory = os.environ.setdefault(
+    "PROMETHEUS_MULTIPROC_DIR", "/tmp/starter_app_metrics"
+)
+
+
+def on_starting(_: Any) -> None:
+    shutil.rmtree(metrics_directory, ignore_errors=True)
+    os.makedirs(metrics_directory)
+
+
+def child_exit(_: Any, worker: Any) -> None:
+    multiprocess.mark_process_dead(worker.pid)
@@ -1,19 +1,42 @@
-from typing import Union
+import csv
+import io
+import re
+from typing import Union, List, Iterator, Tuple, Optional
+from urllib.parse import urlencode
 from uuid import UUID
 
-from flask import Blueprint, render_template, g, flash, redirect, request, session
+from flask import (
+    Blueprint,
+    render_template,
+    g,
+    flash,
+    redirect,
+    request,
+    session,
+    jsonify,
+    Response,
+    stream_with_context,
+)
 from flask.typing import ResponseReturnValue
 
 from accounts.accounts_gateway import AccountsGateway
-from accounts.accounts_service import AccountsService
+from accounts.accounts_service import AccountsService, MemberOutcome
+from accounts.session_authorization import SessionAuthorization
 from accounts.users_gateway import UsersGateway
 from authentication.authenticate_user import authenticate_user
+from database_support.pagination import PageCursor
+from starter_app.page_cache import PageCache
+
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
 
 
 def accounts_page(
     accounts_gateway: AccountsGateway,
     users_gateway: UsersGateway,
     accounts_service: AccountsService,
+    session_authorization: SessionAuthorization,
+    page_cache: PageCache,
 ) -> Blueprint:
     api = Blueprint("accounts_page", __name__)
 
@@ -23,45 +46,124 @@ def accounts_page(
 
     @api.get("/accounts")
     def index() -> ResponseReturnValue:
-        return render_template(
-            "accounts.html", accounts=accounts_gateway.list_for_user(g.user_id)
+        def render() -> str:
+            after, limit = requested_page()
+            page = accounts_gateway.page_for_user(g.user_id, limit=limit, after=after)
+
+            return render_template(
+                "accounts.html",
+                accounts=page.items,
+                next_page=next_page_url("/accounts", page.next_cursor, limit),
+            )
+
+        return page_cache.private(
+            [
+                "accounts",
+                g.user_id,
+                session_authorization.version(g.user_id),
+                g.username,
+                g.account_id,
+                g.account_name,
+                request.full_path,
+            ],
+            render,
         )
 
     @api.get("/accounts/<account_id>")
     def show(account_id: UUID) -> ResponseReturnValue:
-        account = accounts_gateway.find_for_user(
-            account_id=account_id, user_id=g.user_id
+        account = session_authorization.find_for_user(
+            session, account_id=account_id, user_id=g.user_id
         )
         if account is None:
             flash("Account not found", "error")
             return redirect("/accounts")
 
+        after, limit = requested_page()
+        page = users_gateway.page_for_account(account_id, limit=limit, after=after)
+
         return render_template(
             "account.html",
             account=account,
-            users=users_gateway.find_for_account(account_id),
+            users=page.items,
+            next_page=next_page_url(f"/accounts/{account_id}", page.next_cursor, limit),
+        )
+
+    @api.get("/accounts/<account_id>/members.csv")
+    def export_members(account_id: UUID) -> ResponseReturnValue:
+        account = session_authorization.find_for_user(
+            session, account_id=account_id, user_id=g.user_id
+        )
+        if account is None:
+            flash("Account not found", "error")
+            return redirect("/accounts")
+
+        def lines() -> Iterator[str]:
+            yield csv_line("id", "email")
+            for user in users_gateway.find_for_account_iter(account_id):
+                yield csv_line(str(user.id), user.email)
+
+        return Response(
+            stream_with_context(lines()),
+            mimetype="text/csv",
+            headers={"Content-Disposition": "attachment; filename=members.csv"},
         )
 
     @api.post("/accounts/<account_id>/members")
     def add_member(account_id: UUID) -> ResponseReturnValue:
-        account = accounts_gateway.find_for_owner(
-            account_id=account_id, user_id=g.user_id
+        account = session_authorization.find_for_owner(
+            session, account_id=account_id, user_id=g.user_id
         )
         if account is None:
+            if request.is_json:
+                return jsonify({"error": "Must be owner to add a member"}), 403
             flash("Must be owner to add a member", "error")
             return redirect(f"/accounts/{account_id}")
 
-        email = request.form["email"]
-        success = accounts_service.add_to_account(email=email, account_id=account_id)
-        if not success:
-            flash(f"Unable to add user {email} to account {account.name}", "error")
+        emails = requested_emails()
+        if emails is None:
+            return jsonify({"error": "Expected a list of emails"}), 400
+
+        outcomes = accounts_service.add_many_to_account(
+            emails=emails, account_id=account_id
+        )
+        if request.is_json:
+            return jsonify(
+                {email: outcome.value for email, outcome in outcomes.items()}
+            )
+
+        if len(outcomes) == 0:
+            flash("Please enter at least one email", "error")
+
+        added = [
+            email
+            for email, outcome in outcomes.items()
+            if outcome in (MemberOutcome.ADDED, MemberOutcome.CREATED)
+        ]
+        if len(added) > 0:
+            flash(f"Added {len(added)} member(s) to {account.name}", "success")
+
+        already_members = [
+            email
+            for email, outcome in outcomes.items()
+            if outcome == MemberOutcome.ALREADY_MEMBER
+        ]
+        if len(already_members) > 0:
+            flash(f"Already members: {', '.join(already_members)}", "error")
+
+        invalid = [
+            email
+            for email, outcome in outcomes.items()
+            if outcome == MemberOutcome.INVALID
+        ]
+        if len(invalid) > 0:
+            flash(f"Invalid emails: {', '.join(invalid)}", "error")
 
         return redirect(f"/accounts/{account_id}")
 
     @api.post("/accounts/<account_id>/members/<user_id>/remove")
     def remove_member(account_id: UUID, user_id: UUID) -> ResponseReturnValue:
-        account = accounts_gateway.find_for_owner(
-            account_id=account_id, user_id=g.user_id
+        account = session_authorization.find_for_owner(
+            session, account_id=account_id, user_id=g.user_id
         )
         if account is None:
             flash("Must be owner to remove a member", "error")
@@ -73,8 +175,8 @@ def accounts_page(
 
     @api.post("/accounts/<account_id>/switch")
     def switch_to_account(account_id: UUID) -> ResponseReturnValue:
-        account = accounts_gateway.find_for_user(
-            account_id=account_id, user_id=g.user_id
+        account = session_authorization.find_for_user(
+            session, account_id=account_id, user_id=g.user_id
         )
         if account is None:
             flash("Account not found", "error")
@@ -89,3 +191,39 @@ def accounts_page(
         return redirect("/accounts")
 
     return api
+
+
+def requested_page() -> Tuple[Optional[PageCursor], int]:
+    after = PageCursor.decode(request.args.get("after"))
+    limit = request.args.get("limit", DEFAULT_PAGE_SIZE, type=int)
+
+    return after, min(max(limit, 1), MAX_PAGE_SIZE)
+
+
+def next_page_url(path: str, cursor: Optional[PageCursor], limit: int) -> Optional[str]:
+    if cursor is None:
+        return None
+
+    return f"{path}?{urlencode({'after': cursor.encode(), 'limit': limit})}"
+
+
+def requested_emails() -> Optional[List[str]]:
+    if request.is_json:
+        body = request.get_json(silent=True)
+        emails = body.get("emails") if isinstance(body, dict) else None
+        if not isinstance(emails, list) or not all(
+            isinstance(email, str) for email in emails
+        ):
+            return None
+    else:
+        emails = re.split(
+            r"[\s,;]+", request.form.get("emails", request.form.get("email", ""))
+        )
+
+    return [email.strip() for email in emails if email.strip() != ""]
+
+
+def csv_line(*values: str) -> str:
+    line = io.StringIO()
+    csv.writer(line).writerow(values)
+    return line.getvalue()
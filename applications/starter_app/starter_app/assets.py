@@ -0,0 +1,183 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import posixpath
+import re
+import shutil
+import sys
+from typing import Dict, List, Optional, Tuple
+
+import brotli  # type: ignore[import-untyped]
+from flask import Blueprint, abort, request, send_from_directory, url_for
+from flask.typing import ResponseReturnValue
+
+MANIFEST = "manifest.json"
+COMPRESSIBLE = (".css", ".js", ".svg", ".json", ".txt", ".html")
+ENCODINGS = [("br", ".br"), ("gzip", ".gz")]
+MAX_AGE_SECONDS = 31536000
+CSS_REFERENCE = re.compile(r"""(@import\s+|url\()\s*(["']?)([^"')\s]+)\2""")
+
+
+class AssetManifest:
+    def __init__(self, assets: Dict[str, str]) -> None:
+        self.__assets = assets
+        self.__fingerprinted = frozenset(assets.values())
+        self.version = hashlib.sha256(
+            json.dumps(assets, sort_keys=True).encode()
+        ).hexdigest()[:16]
+
+    @classmethod
+    def load(cls, directory: str) -> "AssetManifest":
+        try:
+            with open(os.path.join(directory, MANIFEST)) as file:
+                return cls(json.load(file))
+        except FileNotFoundError:
+            return cls({})
+
+    def url(self, filename: str) -> str:
+        fingerprinted = self.__assets.get(filename)
+        if fingerprinted is None:
+            return url_for("static", filename=filename)
+
+        return url_for("assets_api.asset", filename=fingerprinted)
+
+    def includes(self, fingerprinted: str) -> bool:
+        return fingerprinted in self.__fingerprinted
+
+
+def assets_api(directory: str, manifest: AssetManifest) -> Blueprint:
+    api = Blueprint("assets_api", __name__)
+    root = os.path.abspath(directory)
+
+    @api.get("/assets/<path:filename>")
+    def asset(filename: str) -> ResponseReturnValue:
+        if not manifest.includes(filename):
+            abort(404)
+
+        encoding, suffix = accepted_encoding(root, filename)
+        response = send_from_directory(
+            root,
+            filename + suffix,
+            mimetype=mimetypes.guess_type(filename)[0] or "application/octet-stream",
+            max_age=MAX_AGE_SECONDS,
+        )
+        if encoding is not None:
+            response.headers["Content-Encoding"] = encoding
+        response.headers[
+            "Cache-Control"
+        ] = f"public, max-age={MAX_AGE_SECONDS}, immutable"
+        response.vary.add("Accept-Encoding")
+        return response
+
+    return api
+
+
+def accepted_encoding(root: str, filename: str) -> Tuple[Optional[str], str]:
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings.quality(encoding) > 0 and os.path.isfile(
+            os.path.join(root, filename + suffix)
+        ):
+            return encoding, suffix
+
+    return None, ""
+
+
+def build_assets(source: str, destination: str) -> Dict[str, str]:
+    shutil.rmtree(destination, ignore_errors=True)
+    pending = sorted(
+        os.path.relpath(os.path.join(directory, name), source).replace(os.sep, "/")
+        for directory, _, files in os.walk(source)
+        for name in files
+    )
+    manifest: Dict[str, str] = {}
+
+    while len(pending) > 0:
+        ready = [
+            path
+            for path in pending
+            if all(
+                reference in manifest for reference in references(source, path, pending)
+            )
+        ]
+        if len(ready) == 0:
+            raise Exception(f"Unable to resolve asset references in {pending}")
+
+        for path in ready:
+            with open(os.path.join(source, path), "rb") as file:
+                content = file.read()
+            if path.endswith(".css"):
+                content = rewrite_references(content, path, manifest)
+
+            manifest[path] = fingerprint(path, content)
+            write_asset(os.path.join(destination, manifest[path]), content)
+
+        pending = [path for path in pending if path not in manifest]
+
+    os.makedirs(destination, exist_ok=True)
+    with open(os.path.join(destination, MANIFEST), "w") as file:
+        json.dump(manifest, file, indent=2, sort_keys=True)
+
+    return manifest
+
+
+def references(source: str, path: str, paths: List[str]) -> List[str]:
+    if not path.endswith(".css"):
+        return []
+
+    with open(os.path.join(source, path)) as file:
+        content = file.read()
+
+    return [
+        reference
+        for reference in (
+            resolve(path, match.group(3)) for match in CSS_REFERENCE.finditer(content)
+        )
+        if reference in paths and reference != path
+    ]
+
+
+def rewrite_references(content: bytes, path: str, manifest: Dict[str, str]) -> bytes:
+    def replace(match: re.Match[str]) -> str:
+        reference = manifest.get(resolve(path, match.group(3)))
+        if reference is None:
+            return match.group(0)
+
+        relative = posixpath.relpath(reference, posixpath.dirname(path) or ".")
+        return f"{match.group(1)}{match.group(2)}{relative}{match.group(2)}"
+
+    return CSS_REFERENCE.sub(replace, content.decode()).encode()
+
+
+def resolve(path: str, reference: str) -> str:
+    return posixpath.normpath(posixpath.join(posixpath.dirname(path), reference))
+
+
+def fingerprint(path: str, content: bytes) -> str:
+    root, extension = posixpath.splitext(path)
+    return f"{root}.{hashlib.sha256(content).hexdigest()[:12]}{extension}"
+
+
+def write_asset(path: str, content: bytes) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as file:
+        file.write(content)
+
+    if not path.endswith(COMPRESSIBLE):
+        return
+
+    for suffix, compressed in [
+        (".gz", gzip.compress(content, compresslevel=9, mtime=0)),
+        (".br", brotli.compress(content, quality=11)),
+    ]:
+        if len(compressed) < len(content):
+            with open(path + suffix, "wb") as file:
+                file.write(compressed)
+
+
+if __name__ == "__main__":
+    static = os.path.join(os.path.dirname(__file__), "static")
+    destination = sys.argv[1] if len(sys.argv) > 1 else "build/assets"
+    for path, fingerprinted in build_assets(static, destination).items():
+        print(f"{path} -> {fingerprinted}")
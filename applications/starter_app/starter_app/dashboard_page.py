@@ -1,12 +1,13 @@
 from typing import Union
 
-from flask import Blueprint, session, redirect, render_template
+from flask import Blueprint, session, redirect, render_template, g
 from flask.typing import ResponseReturnValue
 
 from authentication.authenticate_user import authenticate_user
+from starter_app.page_cache import PageCache
 
 
-def dashboard_page() -> Blueprint:
+def dashboard_page(page_cache: PageCache) -> Blueprint:
     api = Blueprint("dashboard_page", __name__)
 
     @api.before_request
@@ -15,7 +16,10 @@ def dashboard_page() -> Blueprint:
 
     @api.get("/dashboard")
     def dashboard() -> ResponseReturnValue:
-        return render_template("dashboard.html")
+        return page_cache.private(
+            ["dashboard", g.user_id, g.username, g.account_id, g.account_name],
+            lambda: render_template("dashboard.html"),
+        )
 
     @api.get("/logout")
     def logout() -> ResponseReturnValue:
@@ -9,9 +9,38 @@ class Environment:
     client_id: str
     client_secret: str
     host_url: str
+    oauth_connect_timeout_seconds: float
+    oauth_read_timeout_seconds: float
+    oauth_retries: int
+    oauth_pool_size: int
     allowed_domains: str
     allowed_addresses: str
+    allowed_emails_file: str
     database_url: str
+    database_pool_size: int
+    database_max_overflow: int
+    database_pool_timeout_seconds: float
+    database_pool_pre_ping: bool
+    database_pool_recycle_seconds: int
+    database_statement_cache_size: int
+    database_prepare_statements: bool
+    database_replica_urls: str
+    session_store: str
+    session_lifetime_seconds: float
+    session_sweep_interval_seconds: float
+    authorization_cache_ttl_seconds: float
+    authorization_cache_size: int
+    page_cache_ttl_seconds: float
+    page_cache_size: int
+    index_max_age_seconds: int
+    assets_directory: str
+    template_bytecode_cache_directory: str
+    template_warm_up: bool
+    sql_instrumentation: bool
+    sql_repeated_statement_threshold: int
+    readiness_probe_interval_seconds: float
+    readiness_max_checkout_seconds: float
+    readiness_max_round_trip_seconds: float
     use_flask_debug_mode: bool
 
     @classmethod
@@ -22,9 +51,71 @@ class Environment:
             client_id=cls.require_env("CLIENT_ID"),
             client_secret=cls.require_env("CLIENT_SECRET"),
             host_url=cls.require_env("HOST_URL"),
+            oauth_connect_timeout_seconds=float(
+                os.environ.get("OAUTH_CONNECT_TIMEOUT_SECONDS", 3.05)
+            ),
+            oauth_read_timeout_seconds=float(
+                os.environ.get("OAUTH_READ_TIMEOUT_SECONDS", 10)
+            ),
+            oauth_retries=int(os.environ.get("OAUTH_RETRIES", 2)),
+            oauth_pool_size=int(os.environ.get("OAUTH_POOL_SIZE", 10)),
             allowed_domains=os.environ.get("ALLOWED_DOMAINS", ""),
             allowed_addresses=os.environ.get("ALLOWED_ADDRESSES", ""),
+            allowed_emails_file=os.environ.get("ALLOWED_EMAILS_FILE", ""),
             database_url=cls.require_env("DATABASE_URL"),
+            database_pool_size=int(os.environ.get("DATABASE_POOL_SIZE", 2)),
+            database_max_overflow=int(os.environ.get("DATABASE_MAX_OVERFLOW", 10)),
+            database_pool_timeout_seconds=float(
+                os.environ.get("DATABASE_POOL_TIMEOUT_SECONDS", 30)
+            ),
+            database_pool_pre_ping=os.environ.get("DATABASE_POOL_PRE_PING", "false")
+            == "true",
+            database_pool_recycle_seconds=int(
+                os.environ.get("DATABASE_POOL_RECYCLE_SECONDS", -1)
+            ),
+            database_statement_cache_size=int(
+                os.environ.get("DATABASE_STATEMENT_CACHE_SIZE", 128)
+            ),
+            database_prepare_statements=os.environ.get(
+                "DATABASE_PREPARE_STATEMENTS", "false"
+            )
+            == "true",
+            database_replica_urls=os.environ.get("DATABASE_REPLICA_URLS", ""),
+            session_store=os.environ.get("SESSION_STORE", "cookie"),
+            session_lifetime_seconds=float(
+                os.environ.get("SESSION_LIFETIME_SECONDS", 604800)
+            ),
+            session_sweep_interval_seconds=float(
+                os.environ.get("SESSION_SWEEP_INTERVAL_SECONDS", 300)
+            ),
+            authorization_cache_ttl_seconds=float(
+                os.environ.get("AUTHORIZATION_CACHE_TTL_SECONDS", 0)
+            ),
+            authorization_cache_size=int(
+                os.environ.get("AUTHORIZATION_CACHE_SIZE", 10000)
+            ),
+            page_cache_ttl_seconds=float(os.environ.get("PAGE_CACHE_TTL_SECONDS", 300)),
+            page_cache_size=int(os.environ.get("PAGE_CACHE_SIZE", 1000)),
+            index_max_age_seconds=int(os.environ.get("INDEX_MAX_AGE_SECONDS", 300)),
+            assets_directory=os.environ.get("ASSETS_DIRECTORY", "build/assets"),
+            template_bytecode_cache_directory=os.environ.get(
+                "TEMPLATE_BYTECODE_CACHE_DIRECTORY", ""
+            ),
+            template_warm_up=os.environ.get("TEMPLATE_WARM_UP", "false") == "true",
+            sql_instrumentation=os.environ.get("SQL_INSTRUMENTATION", "false")
+            == "true",
+            sql_repeated_statement_threshold=int(
+                os.environ.get("SQL_REPEATED_STATEMENT_THRESHOLD", 3)
+            ),
+            readiness_probe_interval_seconds=float(
+                os.environ.get("READINESS_PROBE_INTERVAL_SECONDS", 5)
+            ),
+            readiness_max_checkout_seconds=float(
+                os.environ.get("READINESS_MAX_CHECKOUT_SECONDS", 0.25)
+            ),
+            readiness_max_round_trip_seconds=float(
+                os.environ.get("READINESS_MAX_ROUND_TRIP_SECONDS", 0.25)
+            ),
             use_flask_debug_mode=os.environ.get("USE_FLASK_DEBUG_MODE", "true")
             == "true",
         )
@@ -1,12 +1,46 @@
+from typing import Optional
+
 from flask import Blueprint, jsonify
 from flask.typing import ResponseReturnValue
 
+from database_support.database_probe import DatabaseProbe
+
 
-def health_api() -> Blueprint:
+def health_api(probe: Optional[DatabaseProbe] = None) -> Blueprint:
     api = Blueprint("health_api", __name__)
 
     @api.get("/health")
     def health() -> ResponseReturnValue:
         return jsonify({"status": "UP"})
 
+    @api.get("/ready")
+    def ready() -> ResponseReturnValue:
+        if probe is None:
+            return jsonify({"status": "UP"})
+
+        result = probe.result()
+        response = jsonify(
+            {
+                "status": result.status,
+                "database": {
+                    "checkout_ms": milliseconds(result.checkout_seconds),
+                    "round_trip_ms": milliseconds(result.round_trip_seconds),
+                    "age_seconds": round(result.age_seconds, 3),
+                    "error": result.error,
+                },
+                "pool": {
+                    "size": result.pool.size,
+                    "checked_out": result.pool.checked_out,
+                    "overflow": result.pool.overflow,
+                },
+            }
+        )
+        response.status_code = 503 if result.status == "DOWN" else 200
+        response.headers["Cache-Control"] = "no-store"
+        return response
+
     return api
+
+
+def milliseconds(seconds: Optional[float]) -> Optional[float]:
+    return None if seconds is None else round(seconds * 1000, 3)
@@ -3,8 +3,10 @@ from typing import Union
 from flask import Blueprint, render_template, session, redirect
 from flask.typing import ResponseReturnValue
 
+from starter_app.page_cache import PageCache
 
-def index_page() -> Blueprint:
+
+def index_page(page_cache: PageCache, max_age_seconds: int = 300) -> Blueprint:
     api = Blueprint("index_page", __name__)
 
     @api.before_request
@@ -16,6 +18,8 @@ def index_page() -> Blueprint:
 
     @api.get("/")
     def index() -> ResponseReturnValue:
-        return render_template("index.html")
+        return page_cache.public(
+            ["index"], lambda: render_template("index.html"), max_age_seconds
+        )
 
     return api
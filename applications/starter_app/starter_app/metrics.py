@@ -0,0 +1,121 @@
+import os
+import time
+from typing import Callable, Optional
+
+from flask import Blueprint, Flask, Response, g, request
+from flask.typing import ResponseReturnValue
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    CollectorRegistry,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    multiprocess,
+)
+
+from database_support.pool_metrics import PoolStats
+from database_support.statement_events import StatementEvent
+
+MULTIPROCESS_DIRECTORY = "PROMETHEUS_MULTIPROC_DIR"
+
+
+class Metrics:
+    def __init__(self, registry: Optional[CollectorRegistry] = None) -> None:
+        self.registry = registry or CollectorRegistry()
+        self.__request_seconds = Histogram(
+            "http_request_duration_seconds",
+            "Time spent handling requests",
+            ["endpoint", "method", "status"],
+            registry=self.registry,
+        )
+        self.__statement_seconds = Histogram(
+            "db_statement_duration_seconds",
+            "Time spent executing statements",
+            ["caller"],
+            buckets=[0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1],
+            registry=self.registry,
+        )
+        self.__oauth_seconds = Histogram(
+            "oauth_round_trip_seconds",
+            "Time spent exchanging authorization codes for an email",
+            registry=self.registry,
+        )
+        self.__logins = Counter(
+            "logins",
+            "Sign in attempts by outcome",
+            ["outcome"],
+            registry=self.registry,
+        )
+        self.__pool_size = Gauge(
+            "db_pool_size",
+            "Connections held open by the pool",
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+        self.__pool_checked_out = Gauge(
+            "db_pool_checked_out",
+            "Connections currently in use",
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+        self.__pool_overflow = Gauge(
+            "db_pool_overflow",
+            "Connections opened beyond the pool size",
+            multiprocess_mode="livesum",
+            registry=self.registry,
+        )
+        self.__pool_checkout_wait_max = Gauge(
+            "db_pool_checkout_wait_max_seconds",
+            "Longest wait for a pooled connection",
+            multiprocess_mode="max",
+            registry=self.registry,
+        )
+
+    def register(self, app: Flask, pool_stats: Callable[[], PoolStats]) -> None:
+        @app.before_request
+        def start_timer() -> None:
+            g.metrics_started = time.perf_counter()
+
+        @app.after_request
+        def observe_request(response: Response) -> Response:
+            started = g.get("metrics_started")
+            if started is not None:
+                self.__request_seconds.labels(
+                    request.endpoint or "unmatched",
+                    request.method,
+                    str(response.status_code),
+                ).observe(time.perf_counter() - started)
+            self.record_pool(pool_stats())
+            return response
+
+    def record_statement(self, event: StatementEvent) -> None:
+        self.__statement_seconds.labels(event.caller).observe(event.duration_seconds)
+
+    def record_oauth_round_trip(self, seconds: float) -> None:
+        self.__oauth_seconds.observe(seconds)
+
+    def record_login(self, outcome: str) -> None:
+        self.__logins.labels(outcome).inc()
+
+    def record_pool(self, stats: PoolStats) -> None:
+        self.__pool_size.set(stats.size)
+        self.__pool_checked_out.set(stats.checked_out)
+        self.__pool_overflow.set(stats.overflow)
+        self.__pool_checkout_wait_max.set(stats.checkout_wait_seconds_max)
+
+
+def metrics_api(metrics: Metrics) -> Blueprint:
+    api = Blueprint("metrics_api", __name__)
+
+    @api.get("/metrics")
+    def scrape() -> ResponseReturnValue:
+        if MULTIPROCESS_DIRECTORY in os.environ:
+            registry = CollectorRegistry()
+            multiprocess.MultiProcessCollector(registry)  # type: ignore[no-untyped-call]
+        else:
+            registry = metrics.registry
+
+        return Response(generate_latest(registry), content_type=CONTENT_TYPE_LATEST)
+
+    return api
@@ -1,12 +1,16 @@
 import logging
 import secrets
+import time
 
 from flask import Blueprint, session, redirect, request, flash
 from flask.typing import ResponseReturnValue
 
 from accounts.accounts_service import AccountsService
+from accounts.session_authorization import SessionAuthorization
 from authentication.allowed_emails import AllowedEmails
 from authentication.oauth_client import OAuthClient
+from authentication.server_session import regenerate_session
+from starter_app.metrics import Metrics
 
 logger = logging.getLogger(__name__)
 
@@ -15,6 +19,8 @@ def oauth_api(
     accounts_service: AccountsService,
     oauth_client: OAuthClient,
     allowed_email_addresses: AllowedEmails,
+    session_authorization: SessionAuthorization,
+    metrics: Metrics,
 ) -> Blueprint:
     api = Blueprint("oauth_api", __name__)
 
@@ -30,21 +36,20 @@ def oauth_api(
         if request.args["state"] != session.pop("state", ""):
             session.clear()
             logger.error("state does not match")
+            metrics.record_login("state_mismatch")
             flash("Please try signing in again", "error")
             return redirect("/")
-        access_token = oauth_client.fetch_access_token(request.args["code"])
-        if access_token is None:
-            logger.error("no access token found")
-            flash("Please try signing in again", "error")
-            return redirect("/")
-
-        email = oauth_client.read_email_from_token(access_token)
+        started = time.perf_counter()
+        email = oauth_client.fetch_email(request.args["code"])
+        metrics.record_oauth_round_trip(time.perf_counter() - started)
         if email is None:
-            logger.error("no email found on access token")
+            logger.error("no verified email found for authorization code")
+            metrics.record_login("no_email")
             flash("Please try signing in again", "error")
             return redirect("/")
         if not allowed_email_addresses.include(email):
             logger.error("email address %s not allowed", email)
+            metrics.record_login("not_allowed")
             flash(f"You are not authorized to sign in as {email}", "error")
             return redirect("/")
 
@@ -52,19 +57,24 @@ def oauth_api(
 
         if user is None:
             logger.error("unable to create user for email address %s", email)
+            metrics.record_login("user_error")
             flash(f"Unable to sign in as {email}", "error")
             return redirect("/")
 
+        regenerate_session(session)
         session["user_id"] = user.id
         session["username"] = user.email
+        session_authorization.refresh(session, user.id)
 
         if user.account_id is None or user.account_name is None:
+            metrics.record_login("new_user")
             flash(f"Welcome {user.email}, please create an account", "success")
             return redirect("/accounts/new")
 
         session["account_name"] = user.account_name
         session["account_id"] = user.account_id
 
+        metrics.record_login("success")
         flash(f"Welcome, {email}", "success")
         return redirect("/dashboard")
 
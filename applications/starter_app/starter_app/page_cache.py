@@ -0,0 +1,76 @@
+import hashlib
+import os
+from typing import Callable, Sequence
+
+from flask import Flask, Response, make_response, request, session
+
+from accounts.authorization_cache import CacheBackend
+
+FLASHES_KEY = "_flashes"
+
+
+class PageCache:
+    def __init__(
+        self, backend: CacheBackend, release: str, ttl_seconds: float = 300
+    ) -> None:
+        self.__backend = backend
+        self.__release = release
+        self.__ttl_seconds = ttl_seconds
+
+    def private(self, parts: Sequence[object], render: Callable[[], str]) -> Response:
+        return self.__respond(parts, render, "private, no-cache")
+
+    def public(
+        self, parts: Sequence[object], render: Callable[[], str], max_age_seconds: int
+    ) -> Response:
+        return self.__respond(parts, render, f"public, max-age={max_age_seconds}")
+
+    def __respond(
+        self, parts: Sequence[object], render: Callable[[], str], cache_control: str
+    ) -> Response:
+        if len(session.get(FLASHES_KEY, [])) > 0:
+            response = make_response(render())
+            response.headers["Cache-Control"] = "no-store"
+            return response
+
+        etag = self.__etag(parts)
+        if request.if_none_match.contains_weak(etag):
+            response = Response(status=304)
+        else:
+            response = make_response(self.__body(etag, render))
+
+        response.set_etag(etag)
+        response.headers["Cache-Control"] = cache_control
+        response.vary.add("Cookie")
+        return response
+
+    def __body(self, etag: str, render: Callable[[], str]) -> str:
+        key = f"page:{etag}"
+        cached = self.__backend.get(key)
+        if cached is not None:
+            return str(cached)
+
+        body = render()
+        self.__backend.set(key, body, self.__ttl_seconds)
+        return body
+
+    def __etag(self, parts: Sequence[object]) -> str:
+        digest = hashlib.sha256(self.__release.encode())
+        for part in parts:
+            digest.update(b"\0" + str(part).encode())
+
+        return digest.hexdigest()[:32]
+
+
+def template_release(app: Flask) -> str:
+    digest = hashlib.sha256()
+    if app.template_folder is None:
+        return digest.hexdigest()[:16]
+
+    root = os.path.join(app.root_path, app.template_folder)
+    for directory, _, files in sorted(os.walk(root)):
+        for name in sorted(files):
+            with open(os.path.join(directory, name), "rb") as file:
+                digest.update(name.encode() + b"\0" + file.read())
+
+    return digest.hexdigest()[:16]
@@ -0,0 +1,67 @@
+import json
+import logging
+from collections import Counter
+from typing import Any, Dict, List
+
+from flask import Flask, Response, g, has_request_context, request
+
+from database_support.database_template import is_read
+from database_support.statement_events import StatementEvent
+
+logger = logging.getLogger(__name__)
+
+
+class RequestStatements:
+    def __init__(self, repeated_statement_threshold: int = 3) -> None:
+        self.__repeated_statement_threshold = repeated_statement_threshold
+
+    def record(self, event: StatementEvent) -> None:
+        if not has_request_context():
+            return
+
+        if "sql_statements" not in g:
+            g.sql_statements = []
+        g.sql_statements.append(event)
+
+    def register(self, app: Flask) -> None:
+        app.after_request(self.__after_request)
+
+    def __after_request(self, response: Response) -> Response:
+        events: List[StatementEvent] = g.get("sql_statements", [])
+        duration_ms = sum(event.duration_seconds for event in events) * 1000
+        repeated = self.__repeated(events)
+
+        response.headers.add(
+            "Server-Timing",
+            f'db;dur={duration_ms:.1f};desc="{len(events)} statements"',
+        )
+        line = json.dumps(
+            {
+                "event": "request_statements",
+                "method": request.method,
+                "path": request.path,
+                "status": response.status_code,
+                "statements": len(events),
+                "rows": sum(max(event.row_count, 0) for event in events),
+                "duration_ms": round(duration_ms, 3),
+                "repeated_statements": repeated,
+            }
+        )
+        if len(repeated) > 0:
+            logger.warning(line)
+        else:
+            logger.info(line)
+
+        return response
+
+    def __repeated(self, events: List[StatementEvent]) -> List[Dict[str, Any]]:
+        counts = Counter(
+            (event.statement, event.caller)
+            for event in events
+            if is_read(event.statement)
+        )
+        return [
+            {"statement": " ".join(statement.split()), "caller": caller, "count": count}
+            for (statement, caller), count in counts.items()
+            if count >= self.__repeated_statement_threshold
+        ]
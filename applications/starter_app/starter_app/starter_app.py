@@ -1,52 +1,182 @@
+from typing import Optional
+
 import sqlalchemy
 from flask import Flask
 
 from accounts.accounts_gateway import AccountsGateway
 from accounts.accounts_service import AccountsService
+from accounts.authorization_cache import AuthorizationCache, InMemoryCacheBackend
 from accounts.memberships_gateway import MembershipsGateway
+from accounts.session_authorization import SessionAuthorization
 from accounts.users_gateway import UsersGateway
 from authentication.allowed_emails import AllowedEmails
 from authentication.oauth_client import OAuthClient
+from authentication.server_session import (
+    DatabaseSessionStore,
+    InMemorySessionStore,
+    ServerSessionInterface,
+    SessionSweeper,
+    SessionStore,
+)
+from database_support.database_probe import DatabaseProbe
 from database_support.database_template import DatabaseTemplate
 from starter_app.accounts_page import accounts_page
+from starter_app.assets import AssetManifest, assets_api
 from starter_app.dashboard_page import dashboard_page
 from starter_app.environment import Environment
 from starter_app.health_api import health_api
 from starter_app.index_page import index_page
+from starter_app.metrics import Metrics, metrics_api
 from starter_app.new_account_page import new_account_page
 from starter_app.oauth_api import oauth_api
+from starter_app.page_cache import PageCache, template_release
+from starter_app.request_statements import RequestStatements
+from starter_app.template_warm_up import use_bytecode_cache, warm_up_templates
 
 
-def create_app(env: Environment = Environment.from_env()) -> Flask:
+def create_app(
+    env: Environment = Environment.from_env(),
+    oauth_client: Optional[OAuthClient] = None,
+) -> Flask:
     app = Flask(__name__)
     app.secret_key = env.secret_key
 
-    oauth_client = OAuthClient(env.client_id, env.client_secret, env.host_url)
-    allowed_emails = AllowedEmails(
-        domains=env.allowed_domains,
-        addresses=env.allowed_addresses,
+    oauth_client = oauth_client or OAuthClient(
+        env.client_id,
+        env.client_secret,
+        env.host_url,
+        connect_timeout_seconds=env.oauth_connect_timeout_seconds,
+        read_timeout_seconds=env.oauth_read_timeout_seconds,
+        retries=env.oauth_retries,
+        pool_size=env.oauth_pool_size,
+    )
+    if env.allowed_emails_file != "":
+        allowed_emails = AllowedEmails.from_file(env.allowed_emails_file)
+    else:
+        allowed_emails = AllowedEmails(
+            domains=env.allowed_domains,
+            addresses=env.allowed_addresses,
+        )
+
+    db = sqlalchemy.create_engine(
+        env.database_url,
+        pool_size=env.database_pool_size,
+        max_overflow=env.database_max_overflow,
+        pool_timeout=env.database_pool_timeout_seconds,
+        pool_pre_ping=env.database_pool_pre_ping,
+        pool_recycle=env.database_pool_recycle_seconds,
+    )
+    replicas = [
+        sqlalchemy.create_engine(
+            url.strip(),
+            pool_size=env.database_pool_size,
+            max_overflow=env.database_max_overflow,
+            pool_timeout=env.database_pool_timeout_seconds,
+            pool_pre_ping=True,
+            pool_recycle=env.database_pool_recycle_seconds,
+        )
+        for url in env.database_replica_urls.split(",")
+        if url.strip() != ""
+    ]
+    metrics = Metrics()
+    request_statements = RequestStatements(env.sql_repeated_statement_threshold)
+    if env.sql_instrumentation:
+        request_statements.register(app)
+
+    db_template = DatabaseTemplate(
+        db,
+        statement_cache_size=env.database_statement_cache_size,
+        prepare_statements=env.database_prepare_statements,
+        replicas=replicas,
+        listeners=[metrics.record_statement]
+        + ([request_statements.record] if env.sql_instrumentation else []),
     )
+    metrics.register(app, db_template.pool_stats)
+
+    @app.teardown_request
+    def reset_read_your_writes(_: Optional[BaseException]) -> None:
+        db_template.reset_read_your_writes()
 
-    db = sqlalchemy.create_engine(env.database_url, pool_size=2)
-    db_template = DatabaseTemplate(db)
+    if env.session_store != "cookie":
+        session_store: SessionStore = (
+            InMemorySessionStore()
+            if env.session_store == "memory"
+            else DatabaseSessionStore(db_template)
+        )
+        app.session_interface = ServerSessionInterface(
+            session_store,
+            lifetime_seconds=env.session_lifetime_seconds,
+            skip_paths=["/assets/", "/static/", "/metrics", "/health", "/ready"],
+        )
+        SessionSweeper(
+            session_store, interval_seconds=env.session_sweep_interval_seconds
+        ).start()
 
-    accounts_gateway = AccountsGateway(db_template)
+    authorization_cache = None
+    if env.authorization_cache_ttl_seconds > 0:
+        authorization_cache = AuthorizationCache(
+            InMemoryCacheBackend(max_size=env.authorization_cache_size),
+            ttl_seconds=env.authorization_cache_ttl_seconds,
+        )
+
+    accounts_gateway = AccountsGateway(db_template, authorization_cache)
     users_gateway = UsersGateway(db_template)
     accounts_service = AccountsService(
         db=db_template,
         accounts_gateway=accounts_gateway,
         users_gateway=users_gateway,
-        memberships_gateway=MembershipsGateway(db_template),
+        memberships_gateway=MembershipsGateway(db_template, authorization_cache),
+    )
+
+    session_authorization = SessionAuthorization(
+        accounts_gateway, users_gateway, authorization_cache
+    )
+
+    asset_manifest = AssetManifest.load(env.assets_directory)
+    app.add_template_global(asset_manifest.url, "asset_url")
+
+    page_cache = PageCache(
+        InMemoryCacheBackend(max_size=env.page_cache_size),
+        release=f"{template_release(app)}.{asset_manifest.version}",
+        ttl_seconds=env.page_cache_ttl_seconds,
     )
 
-    app.register_blueprint(index_page())
-    app.register_blueprint(oauth_api(accounts_service, oauth_client, allowed_emails))
-    app.register_blueprint(dashboard_page())
+    app.register_blueprint(index_page(page_cache, env.index_max_age_seconds))
     app.register_blueprint(
-        accounts_page(accounts_gateway, users_gateway, accounts_service)
+        oauth_api(
+            accounts_service,
+            oauth_client,
+            allowed_emails,
+            session_authorization,
+            metrics,
+        )
+    )
+    app.register_blueprint(dashboard_page(page_cache))
+    app.register_blueprint(
+        accounts_page(
+            accounts_gateway,
+            users_gateway,
+            accounts_service,
+            session_authorization,
+            page_cache,
+        )
     )
     app.register_blueprint(new_account_page(accounts_service))
 
-    app.register_blueprint(health_api())
+    app.register_blueprint(assets_api(env.assets_directory, asset_manifest))
+    database_probe = DatabaseProbe(
+        db_template,
+        interval_seconds=env.readiness_probe_interval_seconds,
+        max_checkout_seconds=env.readiness_max_checkout_seconds,
+        max_round_trip_seconds=env.readiness_max_round_trip_seconds,
+    )
+    database_probe.start()
+    app.register_blueprint(health_api(database_probe))
+    app.register_blueprint(metrics_api(metrics))
+
+    if env.template_bytecode_cache_directory != "":
+        use_bytecode_cache(app, env.template_bytecode_cache_directory)
+    if env.template_warm_up:
+        warm_up_templates(app)
 
     return app
@@ -0,0 +1,18 @@
+import os
+from typing import List
+
+from flask import Flask
+from jinja2 import FileSystemBytecodeCache
+
+
+def use_bytecode_cache(app: Flask, directory: str) -> None:
+    os.makedirs(directory, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(directory)
+
+
+def warm_up_templates(app: Flask) -> List[str]:
+    names = app.jinja_env.list_templates(extensions=["html"])
+    for name in names:
+        app.jinja_env.get_template(name)
+
+    return names
@@ -3,11 +3,14 @@ from uuid import UUID
 from flask import Blueprint, Flask
 from flask.testing import FlaskClient
 
+from starter_app.assets import AssetManifest
+
 
 def test_client(blueprint: Blueprint) -> FlaskClient:
     app = Flask(__name__, template_folder="../starter_app/templates")
     app.config["TESTING"] = True
     app.register_blueprint(blueprint)
+    app.add_template_global(AssetManifest({}).url, "asset_url")
     app.secret_key = "just testing"
     return app.test_client()
 
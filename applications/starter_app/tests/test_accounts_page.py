@@ -1,13 +1,19 @@
+import html
+import re
 from unittest import TestCase
 
 from flask import session
 
 from accounts.accounts_gateway import AccountsGateway
 from accounts.accounts_service import AccountsService
+from accounts.authorization_cache import InMemoryCacheBackend
 from accounts.memberships_gateway import MembershipsGateway
+from accounts.session_authorization import SessionAuthorization
 from accounts.users_gateway import UsersGateway
 from starter_app.accounts_page import accounts_page
+from starter_app.page_cache import PageCache
 from test_support.db_template import test_db_template
+from test_support.unwrap_optional import unwrap
 from tests.blueprint_test_support import test_client, log_in
 
 
@@ -25,8 +31,13 @@ class TestAccountsPage(TestCase):
             users_gateway=users_gateway,
             memberships_gateway=memberships_gateway,
         )
+        self.memberships_gateway = memberships_gateway
         self.accounts_page = accounts_page(
-            accounts_gateway, users_gateway, accounts_service
+            accounts_gateway,
+            users_gateway,
+            accounts_service,
+            SessionAuthorization(accounts_gateway, users_gateway),
+            PageCache(InMemoryCacheBackend(), release="test"),
         )
 
     def test_index(self) -> None:
@@ -44,6 +55,39 @@ class TestAccountsPage(TestCase):
         self.assertIn("owner", response.text)
         self.assertNotIn("another account", response.text)
 
+    def test_index_not_modified(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        response = client.get("/accounts")
+        etag = unwrap(self, response.get_etag()[0])
+        not_modified = client.get("/accounts", headers={"If-None-Match": f'"{etag}"'})
+
+        self.assertEqual("private, no-cache", response.headers["Cache-Control"])
+        self.assertEqual(304, not_modified.status_code)
+        self.assertEqual("", not_modified.text)
+
+    def test_index_modified_after_membership_change(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        other_account_id = self.db.account("another account")
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        etag = unwrap(self, client.get("/accounts").get_etag()[0])
+        self.memberships_gateway.create(
+            account_id=other_account_id, user_id=user_id, owner=False
+        )
+        response = client.get("/accounts", headers={"If-None-Match": f'"{etag}"'})
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn("another account", response.text)
+        self.assertNotEqual(etag, response.get_etag()[0])
+
     def test_show(self) -> None:
         user_id, account_id = self.db.account_with_user(
             email="test@example.com", account_name="some account"
@@ -59,6 +103,27 @@ class TestAccountsPage(TestCase):
         self.assertIn("Add user", response.text)
         self.assertIn("other@example.com", response.text)
 
+    def test_show_paginates(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        self.db.add_users(["first@example.com", "second@example.com"], account_id)
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        first_page = client.get(f"/accounts/{account_id}?limit=2")
+        next_page = re.search(r'href="([^"]+)">Next page', first_page.text)
+        last_page = client.get(html.unescape(unwrap(self, next_page).group(1)))
+
+        self.assertEqual(200, last_page.status_code)
+        self.assertNotIn("Next page", last_page.text)
+        self.assertEqual(
+            3,
+            sum(
+                page.text.count("@example.com</td>") for page in [first_page, last_page]
+            ),
+        )
+
     def test_show_not_owner(self) -> None:
         owner_id, account_id = self.db.account_with_user(
             email="test@example.com", account_name="some account"
@@ -82,6 +147,37 @@ class TestAccountsPage(TestCase):
         self.assertEqual(302, response.status_code)
         self.assertEqual("/accounts", response.headers.get("Location"))
 
+    def test_export_members(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        other_user_id = self.db.add_user(
+            email="other@example.com", account_id=account_id
+        )
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        response = client.get(f"/accounts/{account_id}/members.csv")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("text/csv; charset=utf-8", response.content_type)
+        self.assertEqual("id,email", response.text.splitlines()[0])
+        self.assertCountEqual(
+            [f"{user_id},test@example.com", f"{other_user_id},other@example.com"],
+            response.text.splitlines()[1:],
+        )
+
+    def test_export_members_not_found(self) -> None:
+        client = test_client(self.accounts_page)
+        log_in(client)
+
+        response = client.get(
+            "/accounts/9a8e7aeb-55f0-460f-9870-1ee73e26049e/members.csv"
+        )
+
+        self.assertEqual(302, response.status_code)
+        self.assertEqual("/accounts", response.headers.get("Location"))
+
     def test_add_member(self) -> None:
         user_id, account_id = self.db.account_with_user(
             email="test@example.com", account_name="some account"
@@ -102,6 +198,120 @@ class TestAccountsPage(TestCase):
         self.assertEqual(200, response.status_code)
         self.assertIn("other@example.com", response.text)
 
+    def test_add_members(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        self.db.user(email="existing@example.com")
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        add_response = client.post(
+            f"/accounts/{account_id}/members",
+            data={"emails": "existing@example.com,\nnew@example.com test@example.com"},
+        )
+        self.assertEqual(302, add_response.status_code)
+
+        response = client.get(f"/accounts/{account_id}")
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn("existing@example.com", response.text)
+        self.assertIn("new@example.com", response.text)
+        self.assertIn("Added 2 member(s) to some account", response.text)
+        self.assertIn("Already members: test@example.com", response.text)
+
+    def test_add_members_json(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        self.db.user(email="existing@example.com")
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        response = client.post(
+            f"/accounts/{account_id}/members",
+            json={
+                "emails": [
+                    "existing@example.com",
+                    "new@example.com",
+                    "test@example.com",
+                ]
+            },
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {
+                "existing@example.com": "added",
+                "new@example.com": "created",
+                "test@example.com": "already_member",
+            },
+            response.json,
+        )
+
+    def test_add_members_invalid_emails(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        add_response = client.post(
+            f"/accounts/{account_id}/members",
+            data={"emails": "John Smith <j@example.com>, new@example.com"},
+        )
+        self.assertEqual(302, add_response.status_code)
+
+        response = client.get(f"/accounts/{account_id}")
+
+        self.assertIn("Added 1 member(s) to some account", response.text)
+        self.assertIn(
+            "Invalid emails: John, Smith, &lt;j@example.com&gt;", response.text
+        )
+        self.assertEqual(
+            [],
+            self.db.query_to_dict(
+                "select id from users where email in ('John', 'Smith')"
+            ),
+        )
+
+    def test_add_members_json_invalid_emails(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        response = client.post(
+            f"/accounts/{account_id}/members",
+            json={"emails": ["John", "new@example.com"]},
+        )
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual(
+            {"John": "invalid", "new@example.com": "created"}, response.json
+        )
+
+    def test_add_members_json_malformed(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            email="test@example.com", account_name="some account"
+        )
+        client = test_client(self.accounts_page)
+        log_in(client, user_id=user_id, account_id=account_id)
+
+        for body in [
+            {"emails": "ab@example.com"},
+            ["ab@example.com"],
+            {"emails": [1, 2]},
+            {},
+        ]:
+            response = client.post(f"/accounts/{account_id}/members", json=body)
+
+            self.assertEqual(400, response.status_code)
+            self.assertEqual({"error": "Expected a list of emails"}, response.json)
+
+        self.assertEqual(1, len(self.db.query_to_dict("select id from users")))
+
     def test_add_member_not_owner(self) -> None:
         owner_id, account_id = self.db.account_with_user(
             email="test@example.com", account_name="some account"
@@ -0,0 +1,109 @@
+import gzip
+import os
+import tempfile
+from unittest import TestCase
+
+import brotli  # type: ignore[import-untyped]
+from flask import Flask
+
+from starter_app.assets import AssetManifest, assets_api, build_assets
+
+
+class TestAssets(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.source = os.path.join(self.directory.name, "static")
+        self.destination = os.path.join(self.directory.name, "assets")
+        self.write("css/app.css", '@import "theme.css";\nbody { margin: 0; }\n')
+        self.write(
+            "css/theme.css",
+            "body { background: url('../images/logo.svg'); color: black; }\n" * 10,
+        )
+        self.write("images/logo.svg", "<svg></svg>")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def write(self, path: str, content: str) -> None:
+        os.makedirs(os.path.dirname(os.path.join(self.source, path)), exist_ok=True)
+        with open(os.path.join(self.source, path), "w") as file:
+            file.write(content)
+
+    def read(self, path: str) -> bytes:
+        with open(os.path.join(self.destination, path), "rb") as file:
+            return file.read()
+
+    def test_build_assets(self) -> None:
+        manifest = build_assets(self.source, self.destination)
+
+        self.assertEqual(
+            ["css/app.css", "css/theme.css", "images/logo.svg"], sorted(manifest)
+        )
+        self.assertRegex(manifest["css/app.css"], r"^css/app\.[0-9a-f]{12}\.css$")
+        self.assertIn(
+            f'@import "{os.path.basename(manifest["css/theme.css"])}";',
+            self.read(manifest["css/app.css"]).decode(),
+        )
+        self.assertIn(
+            f"url('../{manifest['images/logo.svg']}')",
+            self.read(manifest["css/theme.css"]).decode(),
+        )
+
+    def test_build_assets_compresses_text(self) -> None:
+        manifest = build_assets(self.source, self.destination)
+
+        theme = self.read(manifest["css/theme.css"])
+        self.assertEqual(
+            theme, gzip.decompress(self.read(manifest["css/theme.css"] + ".gz"))
+        )
+        self.assertEqual(
+            theme, brotli.decompress(self.read(manifest["css/theme.css"] + ".br"))
+        )
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(self.destination, manifest["images/logo.svg"] + ".gz")
+            )
+        )
+
+    def test_fingerprint_changes_with_references(self) -> None:
+        before = build_assets(self.source, self.destination)
+        self.write("images/logo.svg", "<svg><g></g></svg>")
+
+        after = build_assets(self.source, self.destination)
+
+        self.assertNotEqual(before["css/theme.css"], after["css/theme.css"])
+        self.assertNotEqual(before["css/app.css"], after["css/app.css"])
+
+    def test_serves_assets(self) -> None:
+        build_assets(self.source, self.destination)
+        manifest = AssetManifest.load(self.destination)
+        app = Flask(__name__, static_folder=self.source)
+        app.register_blueprint(assets_api(self.destination, manifest))
+        client = app.test_client()
+
+        with app.test_request_context():
+            url = manifest.url("css/theme.css")
+            fallback = manifest.url("css/missing.css")
+
+        compressed = client.get(url, headers={"Accept-Encoding": "gzip, br"})
+        plain = client.get(url)
+
+        self.assertEqual("/static/css/missing.css", fallback)
+        self.assertEqual(200, compressed.status_code)
+        self.assertEqual("br", compressed.headers["Content-Encoding"])
+        self.assertEqual("text/css", compressed.mimetype)
+        self.assertIn("immutable", compressed.headers["Cache-Control"])
+        self.assertIn("Accept-Encoding", compressed.headers["Vary"])
+        self.assertEqual(
+            plain.data, brotli.decompress(compressed.get_data(as_text=False))
+        )
+        self.assertNotIn("Content-Encoding", plain.headers)
+        self.assertEqual(404, client.get("/assets/css/theme.css").status_code)
+        self.assertEqual(404, client.get("/assets/manifest.json").status_code)
+
+    def test_missing_manifest(self) -> None:
+        manifest = AssetManifest.load(self.destination)
+
+        self.assertFalse(manifest.includes("css/app.css"))
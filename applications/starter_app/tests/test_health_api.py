@@ -1,6 +1,8 @@
 from unittest import TestCase
 
+from database_support.database_probe import DatabaseProbe
 from starter_app.health_api import health_api
+from test_support.db_template import test_db_template
 from tests.blueprint_test_support import test_client
 
 
@@ -12,3 +14,34 @@ class TestHealthApi(TestCase):
 
         self.assertEqual(200, response.status_code)
         self.assertEqual({"status": "UP"}, response.json)
+
+    def test_ready_without_probe(self) -> None:
+        client = test_client(health_api())
+
+        response = client.get("/ready")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual({"status": "UP"}, response.json)
+
+    def test_ready(self) -> None:
+        probe = DatabaseProbe(test_db_template())
+        probe.check()
+        client = test_client(health_api(probe))
+
+        response = client.get("/ready")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("no-store", response.headers["Cache-Control"])
+        body = response.json or {}
+        self.assertEqual("UP", body["status"])
+        self.assertGreater(body["database"]["round_trip_ms"], 0)
+        self.assertIsNone(body["database"]["error"])
+        self.assertIn("checked_out", body["pool"])
+
+    def test_not_ready_before_first_probe(self) -> None:
+        client = test_client(health_api(DatabaseProbe(test_db_template())))
+
+        response = client.get("/ready")
+
+        self.assertEqual(503, response.status_code)
+        self.assertEqual("DOWN", (response.json or {})["status"])
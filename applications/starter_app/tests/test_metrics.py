@@ -0,0 +1,87 @@
+from unittest import TestCase
+
+from flask import Blueprint
+from flask.typing import ResponseReturnValue
+
+from database_support.pool_metrics import PoolStats
+from database_support.statement_events import StatementEvent
+from starter_app.metrics import Metrics, metrics_api
+from tests.blueprint_test_support import test_client
+
+POOL_STATS = PoolStats(
+    size=2,
+    checked_out=1,
+    checked_in=1,
+    overflow=0,
+    checkouts=10,
+    checkout_wait_seconds_total=0.01,
+    checkout_wait_seconds_max=0.005,
+)
+
+
+class TestMetrics(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.metrics = Metrics()
+
+        api = Blueprint("metrics_test", __name__)
+
+        @api.get("/hello")
+        def hello() -> ResponseReturnValue:
+            return "hello"
+
+        self.client = test_client(api)
+        self.client.application.register_blueprint(metrics_api(self.metrics))
+        self.metrics.register(self.client.application, lambda: POOL_STATS)
+
+    def test_request_latency(self) -> None:
+        self.client.get("/hello")
+        self.client.get("/missing")
+
+        response = self.client.get("/metrics")
+
+        self.assertEqual(200, response.status_code)
+        self.assertIn("text/plain", response.content_type)
+        self.assertIn(
+            'http_request_duration_seconds_count{endpoint="metrics_test.hello",'
+            'method="GET",status="200"} 1.0',
+            response.text,
+        )
+        self.assertIn(
+            'http_request_duration_seconds_count{endpoint="unmatched",'
+            'method="GET",status="404"} 1.0',
+            response.text,
+        )
+
+    def test_pool_stats(self) -> None:
+        self.client.get("/hello")
+
+        response = self.client.get("/metrics")
+
+        self.assertIn("db_pool_size 2.0", response.text)
+        self.assertIn("db_pool_checked_out 1.0", response.text)
+        self.assertIn("db_pool_checkout_wait_max_seconds 0.005", response.text)
+
+    def test_statements_oauth_and_logins(self) -> None:
+        self.metrics.record_statement(
+            StatementEvent(
+                statement="select 1",
+                duration_seconds=0.002,
+                row_count=1,
+                caller="UsersGateway.find_by_id",
+            )
+        )
+        self.metrics.record_oauth_round_trip(0.3)
+        self.metrics.record_login("success")
+        self.metrics.record_login("success")
+        self.metrics.record_login("not_allowed")
+
+        response = self.client.get("/metrics")
+
+        self.assertIn(
+            'db_statement_duration_seconds_count{caller="UsersGateway.find_by_id"} 1.0',
+            response.text,
+        )
+        self.assertIn("oauth_round_trip_seconds_count 1.0", response.text)
+        self.assertIn('logins_total{outcome="success"} 2.0', response.text)
+        self.assertIn('logins_total{outcome="not_allowed"} 1.0', response.text)
@@ -0,0 +1,86 @@
+from typing import List
+from unittest import TestCase
+
+from flask import Blueprint, flash, get_flashed_messages
+from flask.typing import ResponseReturnValue
+
+from accounts.authorization_cache import InMemoryCacheBackend
+from starter_app.page_cache import PageCache
+from test_support.unwrap_optional import unwrap
+from tests.blueprint_test_support import test_client
+
+
+class TestPageCache(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.renders: List[str] = []
+        self.page_cache = PageCache(InMemoryCacheBackend(), release="test")
+
+        api = Blueprint("page_cache_test", __name__)
+
+        @api.get("/page")
+        def page() -> ResponseReturnValue:
+            return self.page_cache.public(["page"], self.render, max_age_seconds=60)
+
+        @api.get("/private")
+        def private() -> ResponseReturnValue:
+            return self.page_cache.private(["private"], self.render)
+
+        @api.get("/flash")
+        def flash_message() -> ResponseReturnValue:
+            flash("hello", "success")
+            return "flashed"
+
+        self.client = test_client(api)
+
+    def render(self) -> str:
+        self.renders.append("rendered")
+        messages = get_flashed_messages()
+        return f"some page{messages}" if len(messages) > 0 else "some page"
+
+    def test_public(self) -> None:
+        response = self.client.get("/page")
+
+        self.assertEqual(200, response.status_code)
+        self.assertEqual("some page", response.text)
+        self.assertEqual("public, max-age=60", response.headers["Cache-Control"])
+        self.assertIn("Cookie", response.headers["Vary"])
+        self.assertIsNotNone(response.get_etag()[0])
+
+    def test_private(self) -> None:
+        response = self.client.get("/private")
+
+        self.assertEqual("private, no-cache", response.headers["Cache-Control"])
+
+    def test_not_modified_skips_rendering(self) -> None:
+        etag = unwrap(self, self.client.get("/page").get_etag()[0])
+
+        response = self.client.get("/page", headers={"If-None-Match": f'W/"{etag}"'})
+
+        self.assertEqual(304, response.status_code)
+        self.assertEqual(etag, response.get_etag()[0])
+        self.assertEqual(1, len(self.renders))
+
+    def test_reuses_rendered_page(self) -> None:
+        first = self.client.get("/page")
+        second = self.client.get("/page")
+
+        self.assertEqual(first.text, second.text)
+        self.assertEqual(1, len(self.renders))
+
+    def test_release_changes_etag(self) -> None:
+        etag = self.client.get("/page").get_etag()[0]
+        self.page_cache = PageCache(InMemoryCacheBackend(), release="next")
+
+        self.assertNotEqual(etag, self.client.get("/page").get_etag()[0])
+
+    def test_pending_flash_messages_are_not_cached(self) -> None:
+        self.client.get("/flash")
+
+        response = self.client.get("/page")
+
+        self.assertEqual("no-store", response.headers["Cache-Control"])
+        self.assertIsNone(response.get_etag()[0])
+        self.assertEqual(
+            "public, max-age=60", self.client.get("/page").headers["Cache-Control"]
+        )
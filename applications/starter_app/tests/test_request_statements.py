@@ -0,0 +1,80 @@
+import json
+from unittest import TestCase
+
+from flask import Blueprint
+from flask.typing import ResponseReturnValue
+
+from database_support.statement_events import StatementEvent
+from starter_app.request_statements import RequestStatements
+from tests.blueprint_test_support import test_client
+
+
+def event(statement: str, caller: str = "UsersGateway.find") -> StatementEvent:
+    return StatementEvent(
+        statement=statement, duration_seconds=0.002, row_count=1, caller=caller
+    )
+
+
+class TestRequestStatements(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.request_statements = RequestStatements(repeated_statement_threshold=3)
+
+        api = Blueprint("request_statements_test", __name__)
+
+        @api.get("/single")
+        def single() -> ResponseReturnValue:
+            self.request_statements.record(event("select 1"))
+            return "ok"
+
+        @api.get("/repeated")
+        def repeated() -> ResponseReturnValue:
+            for _ in range(3):
+                self.request_statements.record(event("select *\n  from users"))
+            for _ in range(3):
+                self.request_statements.record(event("update users set email = ''"))
+            return "ok"
+
+        self.client = test_client(api)
+        self.request_statements.register(self.client.application)
+
+    def test_server_timing(self) -> None:
+        with self.assertLogs("starter_app.request_statements", "INFO") as logs:
+            response = self.client.get("/single")
+
+        self.assertEqual(
+            'db;dur=2.0;desc="1 statements"', response.headers["Server-Timing"]
+        )
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual("INFO", logs.records[0].levelname)
+        self.assertEqual("/single", line["path"])
+        self.assertEqual(1, line["statements"])
+        self.assertEqual([], line["repeated_statements"])
+
+    def test_flags_repeated_statements(self) -> None:
+        with self.assertLogs("starter_app.request_statements", "INFO") as logs:
+            self.client.get("/repeated")
+
+        line = json.loads(logs.records[0].getMessage())
+        self.assertEqual("WARNING", logs.records[0].levelname)
+        self.assertEqual(6, line["statements"])
+        self.assertEqual(
+            [
+                {
+                    "statement": "select * from users",
+                    "caller": "UsersGateway.find",
+                    "count": 3,
+                }
+            ],
+            line["repeated_statements"],
+        )
+
+    def test_requests_are_separate(self) -> None:
+        with self.assertLogs("starter_app.request_statements", "INFO"):
+            self.client.get("/single")
+            response = self.client.get("/single")
+
+        self.assertIn('desc="1 statements"', response.headers["Server-Timing"])
+
+    def test_ignores_statements_outside_requests(self) -> None:
+        self.request_statements.record(event("select 1"))
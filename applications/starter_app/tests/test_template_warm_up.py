@@ -0,0 +1,51 @@
+import os
+import tempfile
+from typing import Dict
+from unittest import TestCase
+
+from flask import Flask
+
+from starter_app.template_warm_up import use_bytecode_cache, warm_up_templates
+
+
+def app() -> Flask:
+    return Flask(__name__, template_folder="../starter_app/templates")
+
+
+class TestTemplateWarmUp(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.directory = tempfile.TemporaryDirectory()
+        self.cache_directory = os.path.join(self.directory.name, "templates")
+
+    def tearDown(self) -> None:
+        self.directory.cleanup()
+        super().tearDown()
+
+    def test_warm_up_templates(self) -> None:
+        warm_app = app()
+
+        names = warm_up_templates(warm_app)
+
+        self.assertIn("layout.html", names)
+        self.assertIn("accounts.html", names)
+        self.assertEqual(len(names), len(warm_app.jinja_env.cache or {}))
+
+    def test_bytecode_cache(self) -> None:
+        first_app = app()
+        use_bytecode_cache(first_app, self.cache_directory)
+        names = warm_up_templates(first_app)
+
+        cached = self.cached_files()
+        second_app = app()
+        use_bytecode_cache(second_app, self.cache_directory)
+        warm_up_templates(second_app)
+
+        self.assertEqual(len(names), len(cached))
+        self.assertEqual(cached, self.cached_files())
+
+    def cached_files(self) -> Dict[str, int]:
+        return {
+            name: os.stat(os.path.join(self.cache_directory, name)).st_mtime_ns
+            for name in os.listdir(self.cache_directory)
+        }
@@ -2,9 +2,13 @@ from dataclasses import dataclass
 from typing import Optional, cast, Union, List
 from uuid import UUID
 
-from sqlalchemy import Connection
+from sqlalchemy import Connection, RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection
 
+from accounts.authorization_cache import AuthorizationCache
+from database_support.async_database_template import AsyncDatabaseTemplate
 from database_support.database_template import DatabaseTemplate
+from database_support.pagination import Page, PageCursor, map_page
 from database_support.result_mapping import map_one_result, map_results
 
 
@@ -21,94 +25,273 @@ class AccountRecordWithOwnership:
     owner: bool
 
 
+CREATE = """insert into accounts (name) values (:name) returning id, name"""
+
+LIST_FOR_USER = """
+    select accounts.id, accounts.name, memberships.owner from accounts
+    join memberships on accounts.id = memberships.account_id
+    where memberships.user_id = :user_id
+    order by memberships.owner desc
+    """
+
+FIND_FOR_USER = """
+    select accounts.id, accounts.name, memberships.owner from accounts
+    join memberships on accounts.id = memberships.account_id
+    where memberships.user_id = :user_id
+    and accounts.id = :account_id
+    """
+
+FIND_FOR_OWNER = """
+    select accounts.id, accounts.name from accounts
+    join memberships on accounts.id = memberships.account_id
+    where memberships.user_id = :user_id
+    and accounts.id = :account_id
+    and memberships.owner is true
+    """
+
+
+def page_for_user_statement(after: Optional[PageCursor]) -> str:
+    seek = (
+        ""
+        if after is None
+        else "and (memberships.created_at, memberships.id) > (:after_created_at, :after_id)"
+    )
+    return f"""
+    select accounts.id, accounts.name, memberships.owner,
+        memberships.created_at as cursor_created_at, memberships.id as cursor_id
+    from accounts
+    join memberships on accounts.id = memberships.account_id
+    where memberships.user_id = :user_id
+    {seek}
+    order by memberships.created_at, memberships.id
+    limit :limit
+    """
+
+
+def account_record(row: RowMapping) -> AccountRecord:
+    return AccountRecord(
+        id=cast(UUID, row["id"]),
+        name=row["name"],
+    )
+
+
+def account_record_with_ownership(row: RowMapping) -> AccountRecordWithOwnership:
+    return AccountRecordWithOwnership(
+        id=cast(UUID, row["id"]),
+        name=row["name"],
+        owner=row["owner"],
+    )
+
+
 class AccountsGateway:
-    def __init__(self, db: DatabaseTemplate) -> None:
+    def __init__(
+        self,
+        db: DatabaseTemplate,
+        authorization_cache: Optional[AuthorizationCache] = None,
+    ) -> None:
         self.__db = db
+        self.__authorization_cache = authorization_cache
 
     def create(
         self, name: str, connection: Optional[Connection] = None
     ) -> Union[None, AccountRecord]:
         result = self.__db.query(
-            statement="""insert into accounts (name) values (:name) returning id, name""",
+            statement=CREATE,
             connection=connection,
             name=name,
         )
 
-        return map_one_result(
-            result,
-            lambda row: AccountRecord(
-                id=cast(UUID, row["id"]),
-                name=row["name"],
-            ),
-        )
+        return map_one_result(result, account_record)
 
     def list_for_user(
         self, user_id: UUID, connection: Optional[Connection] = None
     ) -> List[AccountRecordWithOwnership]:
         result = self.__db.query(
-            statement="""
-            select accounts.id, accounts.name, memberships.owner from accounts
-            join memberships on accounts.id = memberships.account_id
-            where memberships.user_id = :user_id
-            order by memberships.owner desc
-            """,
+            statement=LIST_FOR_USER,
             connection=connection,
             user_id=user_id,
         )
 
-        return map_results(
-            result,
-            lambda row: AccountRecordWithOwnership(
-                id=cast(UUID, row["id"]),
-                name=row["name"],
-                owner=row["owner"],
-            ),
+        return map_results(result, account_record_with_ownership)
+
+    def page_for_user(
+        self,
+        user_id: UUID,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        connection: Optional[Connection] = None,
+    ) -> Page[AccountRecordWithOwnership]:
+        result = self.__db.query(
+            statement=page_for_user_statement(after),
+            connection=connection,
+            user_id=user_id,
+            after_created_at=None if after is None else after.created_at,
+            after_id=None if after is None else after.id,
+            limit=limit + 1,
         )
 
+        return map_page(result, limit, account_record_with_ownership)
+
     def find_for_user(
         self, account_id: UUID, user_id: UUID, connection: Optional[Connection] = None
+    ) -> Union[None, AccountRecordWithOwnership]:
+        if self.__authorization_cache is None or connection is not None:
+            return self.__find_for_user(account_id, user_id, connection)
+
+        return self.__authorization_cache.get_or_load(
+            "member",
+            account_id,
+            user_id,
+            lambda: self.__find_for_user(account_id, user_id),
+        )
+
+    def find_for_owner(
+        self, account_id: UUID, user_id: UUID, connection: Optional[Connection] = None
+    ) -> Union[None, AccountRecord]:
+        if self.__authorization_cache is None or connection is not None:
+            return self.__find_for_owner(account_id, user_id, connection)
+
+        return self.__authorization_cache.get_or_load(
+            "owner",
+            account_id,
+            user_id,
+            lambda: self.__find_for_owner(account_id, user_id),
+        )
+
+    def __find_for_user(
+        self, account_id: UUID, user_id: UUID, connection: Optional[Connection] = None
     ) -> Union[None, AccountRecordWithOwnership]:
         result = self.__db.query(
-            statement="""
-            select accounts.id, accounts.name, memberships.owner from accounts
-            join memberships on accounts.id = memberships.account_id
-            where memberships.user_id = :user_id
-            and accounts.id = :account_id
-            """,
+            statement=FIND_FOR_USER,
             connection=connection,
+            primary=True,
             user_id=user_id,
             account_id=account_id,
         )
 
-        return map_one_result(
-            result,
-            lambda row: AccountRecordWithOwnership(
-                id=cast(UUID, row["id"]),
-                name=row["name"],
-                owner=row["owner"],
-            ),
-        )
+        return map_one_result(result, account_record_with_ownership)
 
-    def find_for_owner(
+    def __find_for_owner(
         self, account_id: UUID, user_id: UUID, connection: Optional[Connection] = None
     ) -> Union[None, AccountRecord]:
         result = self.__db.query(
-            statement="""
-            select accounts.id, accounts.name from accounts
-            join memberships on accounts.id = memberships.account_id
-            where memberships.user_id = :user_id
-            and accounts.id = :account_id
-            and memberships.owner is true
-            """,
+            statement=FIND_FOR_OWNER,
             connection=connection,
+            primary=True,
             user_id=user_id,
             account_id=account_id,
         )
 
-        return map_one_result(
-            result,
-            lambda row: AccountRecord(
-                id=cast(UUID, row["id"]),
-                name=row["name"],
-            ),
+        return map_one_result(result, account_record)
+
+
+class AsyncAccountsGateway:
+    def __init__(
+        self,
+        db: AsyncDatabaseTemplate,
+        authorization_cache: Optional[AuthorizationCache] = None,
+    ) -> None:
+        self.__db = db
+        self.__authorization_cache = authorization_cache
+
+    async def create(
+        self, name: str, connection: Optional[AsyncConnection] = None
+    ) -> Union[None, AccountRecord]:
+        result = await self.__db.query(
+            statement=CREATE,
+            connection=connection,
+            name=name,
+        )
+
+        return map_one_result(result, account_record)
+
+    async def list_for_user(
+        self, user_id: UUID, connection: Optional[AsyncConnection] = None
+    ) -> List[AccountRecordWithOwnership]:
+        result = await self.__db.query(
+            statement=LIST_FOR_USER,
+            connection=connection,
+            user_id=user_id,
+        )
+
+        return map_results(result, account_record_with_ownership)
+
+    async def page_for_user(
+        self,
+        user_id: UUID,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Page[AccountRecordWithOwnership]:
+        result = await self.__db.query(
+            statement=page_for_user_statement(after),
+            connection=connection,
+            user_id=user_id,
+            after_created_at=None if after is None else after.created_at,
+            after_id=None if after is None else after.id,
+            limit=limit + 1,
         )
+
+        return map_page(result, limit, account_record_with_ownership)
+
+    async def find_for_user(
+        self,
+        account_id: UUID,
+        user_id: UUID,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Union[None, AccountRecordWithOwnership]:
+        if self.__authorization_cache is None or connection is not None:
+            return await self.__find_for_user(account_id, user_id, connection)
+
+        return await self.__authorization_cache.get_or_load_async(
+            "member",
+            account_id,
+            user_id,
+            lambda: self.__find_for_user(account_id, user_id),
+        )
+
+    async def find_for_owner(
+        self,
+        account_id: UUID,
+        user_id: UUID,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Union[None, AccountRecord]:
+        if self.__authorization_cache is None or connection is not None:
+            return await self.__find_for_owner(account_id, user_id, connection)
+
+        return await self.__authorization_cache.get_or_load_async(
+            "owner",
+            account_id,
+            user_id,
+            lambda: self.__find_for_owner(account_id, user_id),
+        )
+
+    async def __find_for_user(
+        self,
+        account_id: UUID,
+        user_id: UUID,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Union[None, AccountRecordWithOwnership]:
+        result = await self.__db.query(
+            statement=FIND_FOR_USER,
+            connection=connection,
+            user_id=user_id,
+            account_id=account_id,
+        )
+
+        return map_one_result(result, account_record_with_ownership)
+
+    async def __find_for_owner(
+        self,
+        account_id: UUID,
+        user_id: UUID,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Union[None, AccountRecord]:
+        result = await self.__db.query(
+            statement=FIND_FOR_OWNER,
+            connection=connection,
+            user_id=user_id,
+            account_id=account_id,
+        )
+
+        return map_one_result(result, account_record)
@@ -1,5 +1,7 @@
+import re
 from dataclasses import dataclass
-from typing import Optional
+from enum import Enum
+from typing import Optional, List, Dict
 from uuid import UUID
 
 from sqlalchemy import Connection
@@ -9,6 +11,8 @@ from accounts.memberships_gateway import MembershipsGateway
 from accounts.users_gateway import UsersGateway, UserRecord
 from database_support.database_template import DatabaseTemplate
 
+EMAIL = re.compile(r"[^@\s<>,;]+@[^@\s<>,;]+")
+
 
 @dataclass
 class UserAccount:
@@ -18,6 +22,13 @@ class UserAccount:
     account_name: Optional[str]
 
 
+class MemberOutcome(Enum):
+    ADDED = "added"
+    CREATED = "created"
+    ALREADY_MEMBER = "already_member"
+    INVALID = "invalid"
+
+
 class AccountsService:
     def __init__(
         self,
@@ -32,26 +43,21 @@ class AccountsService:
         self.memberships_gateway = memberships_gateway
 
     def create_or_find_user(self, email: str) -> Optional[UserAccount]:
-        with self.db.begin() as connection:
-            record = self.__create_or_find_user(email=email, connection=connection)
-            if record is None:
-                return None
-
-            accounts = self.accounts_gateway.list_for_user(record.id, connection)
-            if len(accounts) == 0:
-                return UserAccount(
-                    id=record.id,
-                    email=record.email,
-                    account_id=None,
-                    account_name=None,
-                )
-
-            return UserAccount(
-                id=record.id,
-                email=record.email,
-                account_id=accounts[0].id,
-                account_name=accounts[0].name,
-            )
+        record = self.users_gateway.create_or_find_with_account(email)
+        if record is None:
+            # A concurrent insert of the same email makes the first statement's
+            # insert do nothing while its snapshot cannot see the other row yet,
+            # so it returns nothing. Running it again sees the committed user.
+            record = self.users_gateway.create_or_find_with_account(email)
+        if record is None:
+            return None
+
+        return UserAccount(
+            id=record.id,
+            email=record.email,
+            account_id=record.account_id,
+            account_name=record.account_name,
+        )
 
     def create_account(
         self, user_id: UUID, account_name: str
@@ -88,16 +94,74 @@ class AccountsService:
 
             return membership_id is not None
 
+    def add_many_to_account(
+        self, emails: List[str], account_id: UUID
+    ) -> Dict[str, MemberOutcome]:
+        unique_emails = list({email.lower(): email for email in emails}.values())
+        valid_emails = [
+            email for email in unique_emails if EMAIL.fullmatch(email) is not None
+        ]
+        if len(valid_emails) == 0:
+            return {email: MemberOutcome.INVALID for email in unique_emails}
+
+        with self.db.begin() as connection:
+            existing_users = self.users_gateway.find_by_emails(
+                valid_emails, connection=connection
+            )
+            existing_emails = {user.email.lower() for user in existing_users}
+            new_emails = [
+                email for email in valid_emails if email.lower() not in existing_emails
+            ]
+            created_users = self.users_gateway.create_many(
+                new_emails, connection=connection
+            )
+            created_emails = {user.email.lower() for user in created_users}
+
+            concurrently_created_emails = [
+                email for email in new_emails if email.lower() not in created_emails
+            ]
+            if len(concurrently_created_emails) > 0:
+                concurrently_created_users = self.users_gateway.find_by_emails(
+                    concurrently_created_emails, connection=connection
+                )
+                existing_users += concurrently_created_users
+                existing_emails |= {
+                    user.email.lower() for user in concurrently_created_users
+                }
+
+            users = {
+                user.email.lower(): user for user in existing_users + created_users
+            }
+            memberships = self.memberships_gateway.create_many(
+                account_id=account_id,
+                user_ids=[user.id for user in users.values()],
+                connection=connection,
+            )
+            added_user_ids = {membership.user_id for membership in memberships}
+
+            outcomes = {}
+            for email in unique_emails:
+                if EMAIL.fullmatch(email) is None:
+                    outcomes[email] = MemberOutcome.INVALID
+                elif users[email.lower()].id not in added_user_ids:
+                    outcomes[email] = MemberOutcome.ALREADY_MEMBER
+                elif email.lower() in existing_emails:
+                    outcomes[email] = MemberOutcome.ADDED
+                else:
+                    outcomes[email] = MemberOutcome.CREATED
+
+            return outcomes
+
     def remove_from_account(self, user_id: UUID, account_id: UUID) -> None:
         self.memberships_gateway.delete(account_id=account_id, user_id=user_id)
 
     def __create_or_find_user(
         self, email: str, connection: Connection
     ) -> Optional[UserRecord]:
-        user_record = self.users_gateway.find_by_email(
+        user_record = self.users_gateway.create_or_find(
             email=email, connection=connection
         )
         if user_record is not None:
             return user_record
 
-        return self.users_gateway.create(email=email, connection=connection)
+        return self.users_gateway.find_by_email(email=email, connection=connection)
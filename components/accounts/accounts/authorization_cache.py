@@ -0,0 +1,159 @@
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import (
+    Any,
+    Awaitable,
+    Callable,
+    List,
+    Optional,
+    Protocol,
+    Tuple,
+    TypeVar,
+    cast,
+)
+from uuid import UUID
+
+T = TypeVar("T")
+
+
+class CacheBackend(Protocol):
+    def get(self, key: str) -> Optional[Any]:
+        ...
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        ...
+
+    def delete(self, keys: List[str]) -> None:
+        ...
+
+
+class InMemoryCacheBackend:
+    def __init__(
+        self, max_size: int = 10000, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.__max_size = max_size
+        self.__clock = clock
+        self.__entries: OrderedDict[str, Tuple[float, Any]] = OrderedDict()
+        self.__lock = threading.Lock()
+
+    def get(self, key: str) -> Optional[Any]:
+        with self.__lock:
+            entry = self.__entries.get(key)
+            if entry is None:
+                return None
+
+            expires_at, value = entry
+            if expires_at <= self.__clock():
+                del self.__entries[key]
+                return None
+
+            self.__entries.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_seconds: float) -> None:
+        with self.__lock:
+            self.__entries[key] = (self.__clock() + ttl_seconds, value)
+            self.__entries.move_to_end(key)
+            while len(self.__entries) > self.__max_size:
+                self.__entries.popitem(last=False)
+
+    def delete(self, keys: List[str]) -> None:
+        with self.__lock:
+            for key in keys:
+                self.__entries.pop(key, None)
+
+
+@dataclass
+class AuthorizationCacheStats:
+    hits: int
+    misses: int
+
+    @property
+    def hit_ratio(self) -> float:
+        lookups = self.hits + self.misses
+        return 0.0 if lookups == 0 else self.hits / lookups
+
+
+class AuthorizationCache:
+    KINDS = ["member", "owner"]
+    USER_KINDS = ["membership_version"]
+
+    def __init__(self, backend: CacheBackend, ttl_seconds: float = 30) -> None:
+        self.__backend = backend
+        self.__ttl_seconds = ttl_seconds
+        self.__lock = threading.Lock()
+        self.__hits = 0
+        self.__misses = 0
+
+    def get_or_load(
+        self, kind: str, account_id: UUID, user_id: UUID, load: Callable[[], T]
+    ) -> T:
+        return self.__get_or_load(self.__key(kind, account_id, user_id), load)
+
+    def get_or_load_for_user(
+        self, kind: str, user_id: UUID, load: Callable[[], T]
+    ) -> T:
+        return self.__get_or_load(self.__user_key(kind, user_id), load)
+
+    async def get_or_load_async(
+        self,
+        kind: str,
+        account_id: UUID,
+        user_id: UUID,
+        load: Callable[[], Awaitable[T]],
+    ) -> T:
+        key = self.__key(kind, account_id, user_id)
+        cached = self.__backend.get(key)
+        self.__count(hit=cached is not None)
+        if cached is not None:
+            return cast(T, cached[0])
+
+        value = await load()
+        if value is not None:
+            self.__backend.set(key, (value,), self.__ttl_seconds)
+        return value
+
+    def invalidate(self, account_id: UUID, user_id: UUID) -> None:
+        self.__backend.delete(
+            [self.__key(kind, account_id, user_id) for kind in self.KINDS]
+            + [self.__user_key(kind, user_id) for kind in self.USER_KINDS]
+        )
+
+    def stats(self) -> AuthorizationCacheStats:
+        with self.__lock:
+            return AuthorizationCacheStats(hits=self.__hits, misses=self.__misses)
+
+    def __get_or_load(self, key: str, load: Callable[[], T]) -> T:
+        cached = self.__backend.get(key)
+        self.__count(hit=cached is not None)
+        if cached is not None:
+            return cast(T, cached[0])
+
+        value = load()
+        if value is not None:
+            self.__backend.set(key, (value,), self.__ttl_seconds)
+        return value
+
+    def __count(self, hit: bool) -> None:
+        with self.__lock:
+            if hit:
+                self.__hits += 1
+            else:
+                self.__misses += 1
+
+    @staticmethod
+    def __key(kind: str, account_id: UUID, user_id: UUID) -> str:
+        return f"authorization:{kind}:{_normalize(account_id)}:{_normalize(user_id)}"
+
+    @staticmethod
+    def __user_key(kind: str, user_id: UUID) -> str:
+        return f"authorization:{kind}:{_normalize(user_id)}"
+
+
+def _normalize(id: UUID) -> str:
+    try:
+        return str(UUID(str(id)))
+    except ValueError:
+        return str(id)
@@ -1,11 +1,14 @@
 from dataclasses import dataclass
-from typing import Optional, cast, Union
+from typing import Optional, cast, Union, List
 from uuid import UUID
 
-from sqlalchemy import Connection
+from sqlalchemy import Connection, RowMapping, event
+from sqlalchemy.ext.asyncio import AsyncConnection
 
+from accounts.authorization_cache import AuthorizationCache
+from database_support.async_database_template import AsyncDatabaseTemplate
 from database_support.database_template import DatabaseTemplate
-from database_support.result_mapping import map_one_result
+from database_support.result_mapping import map_one_result, map_results
 
 
 @dataclass
@@ -16,9 +19,77 @@ class MembershipRecord:
     owner: bool
 
 
+CREATE = """
+    with inserted as (
+        insert into memberships (account_id, user_id, owner)
+            values (:account_id, :user_id, :owner)
+            returning id, user_id
+    ), bumped as (
+        update users set membership_version = membership_version + 1
+            where id in (select user_id from inserted)
+    )
+    select id from inserted
+    """
+
+CREATE_MANY = """
+    with inserted as (
+        insert into memberships (account_id, user_id, owner)
+            values {values}
+            on conflict (user_id, account_id) do nothing
+            returning id, account_id, user_id, owner
+    ), bumped as (
+        update users set membership_version = membership_version + 1
+            where id in (select user_id from inserted)
+    )
+    select id, account_id, user_id, owner from inserted
+    """
+
+DELETE = """
+    with deleted as (
+        delete from memberships where account_id = :account_id and user_id = :user_id
+            returning user_id
+    )
+    update users set membership_version = membership_version + 1
+        where id in (select user_id from deleted)
+    """
+
+
+def membership_record(row: RowMapping) -> MembershipRecord:
+    return MembershipRecord(
+        id=cast(UUID, row["id"]),
+        account_id=cast(UUID, row["account_id"]),
+        user_id=cast(UUID, row["user_id"]),
+        owner=row["owner"],
+    )
+
+
+def invalidate_after_commit(
+    authorization_cache: Optional[AuthorizationCache],
+    account_id: UUID,
+    user_ids: List[UUID],
+    connection: Optional[Connection],
+) -> None:
+    if authorization_cache is None or len(user_ids) == 0:
+        return
+
+    def invalidate(_: Optional[Connection] = None) -> None:
+        for user_id in user_ids:
+            authorization_cache.invalidate(account_id, user_id)
+
+    if connection is None or not connection.in_transaction():
+        invalidate()
+    else:
+        event.listen(connection, "commit", invalidate, once=True)
+
+
 class MembershipsGateway:
-    def __init__(self, db: DatabaseTemplate) -> None:
+    def __init__(
+        self,
+        db: DatabaseTemplate,
+        authorization_cache: Optional[AuthorizationCache] = None,
+    ) -> None:
         self.__db = db
+        self.__authorization_cache = authorization_cache
 
     def create(
         self,
@@ -28,26 +99,126 @@ class MembershipsGateway:
         connection: Optional[Connection] = None,
     ) -> Union[None, UUID]:
         result = self.__db.query(
-            statement="""
-                    insert into memberships (account_id, user_id, owner)
-                        values (:account_id, :user_id, :owner)
-                        returning id
-                    """,
+            statement=CREATE,
             connection=connection,
-            id=id,
             account_id=account_id,
             user_id=user_id,
             owner=owner,
         )
+        self.__invalidate(account_id, [user_id], connection)
 
         return map_one_result(result, lambda row: cast(UUID, row["id"]))
 
+    def create_many(
+        self,
+        account_id: UUID,
+        user_ids: List[UUID],
+        owner: bool = False,
+        connection: Optional[Connection] = None,
+    ) -> List[MembershipRecord]:
+        rows = self.__db.insert_many(
+            statement=CREATE_MANY,
+            values=[
+                {"account_id": account_id, "user_id": user_id, "owner": owner}
+                for user_id in user_ids
+            ],
+            connection=connection,
+        )
+        self.__invalidate(account_id, user_ids, connection)
+
+        return map_results(rows, membership_record)
+
     def delete(
         self, account_id: UUID, user_id: UUID, connection: Optional[Connection] = None
     ) -> None:
         self.__db.query(
-            statement="""delete from memberships where account_id = :account_id and user_id = :user_id""",
+            statement=DELETE,
+            connection=connection,
+            account_id=account_id,
+            user_id=user_id,
+        )
+        self.__invalidate(account_id, [user_id], connection)
+
+    def __invalidate(
+        self,
+        account_id: UUID,
+        user_ids: List[UUID],
+        connection: Optional[Connection],
+    ) -> None:
+        invalidate_after_commit(
+            self.__authorization_cache, account_id, user_ids, connection
+        )
+
+
+class AsyncMembershipsGateway:
+    def __init__(
+        self,
+        db: AsyncDatabaseTemplate,
+        authorization_cache: Optional[AuthorizationCache] = None,
+    ) -> None:
+        self.__db = db
+        self.__authorization_cache = authorization_cache
+
+    async def create(
+        self,
+        account_id: UUID,
+        user_id: UUID,
+        owner: bool,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Union[None, UUID]:
+        result = await self.__db.query(
+            statement=CREATE,
             connection=connection,
             account_id=account_id,
             user_id=user_id,
+            owner=owner,
+        )
+        self.__invalidate(account_id, [user_id], connection)
+
+        return map_one_result(result, lambda row: cast(UUID, row["id"]))
+
+    async def create_many(
+        self,
+        account_id: UUID,
+        user_ids: List[UUID],
+        owner: bool = False,
+        connection: Optional[AsyncConnection] = None,
+    ) -> List[MembershipRecord]:
+        rows = await self.__db.insert_many(
+            statement=CREATE_MANY,
+            values=[
+                {"account_id": account_id, "user_id": user_id, "owner": owner}
+                for user_id in user_ids
+            ],
+            connection=connection,
+        )
+        self.__invalidate(account_id, user_ids, connection)
+
+        return map_results(rows, membership_record)
+
+    async def delete(
+        self,
+        account_id: UUID,
+        user_id: UUID,
+        connection: Optional[AsyncConnection] = None,
+    ) -> None:
+        await self.__db.query(
+            statement=DELETE,
+            connection=connection,
+            account_id=account_id,
+            user_id=user_id,
+        )
+        self.__invalidate(account_id, [user_id], connection)
+
+    def __invalidate(
+        self,
+        account_id: UUID,
+        user_ids: List[UUID],
+        connection: Optional[AsyncConnection],
+    ) -> None:
+        invalidate_after_commit(
+            self.__authorization_cache,
+            account_id,
+            user_ids,
+            None if connection is None else connection.sync_connection,
         )
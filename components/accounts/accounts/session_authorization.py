@@ -0,0 +1,167 @@
+import json
+from dataclasses import dataclass
+from typing import Any, Dict, MutableMapping, Optional, Tuple, Union
+from uuid import UUID
+
+from accounts.accounts_gateway import (
+    AccountsGateway,
+    AccountRecord,
+    AccountRecordWithOwnership,
+)
+from accounts.authorization_cache import AuthorizationCache
+from accounts.users_gateway import UsersGateway
+
+SESSION_KEY = "authorization"
+
+
+@dataclass(frozen=True)
+class AuthorizationSnapshot:
+    user_id: str
+    version: int
+    accounts: Dict[str, Tuple[str, bool]]
+    complete: bool
+
+    def to_session(self) -> Dict[str, Any]:
+        return {
+            "user_id": self.user_id,
+            "version": self.version,
+            "accounts": {
+                id: [name, owner] for id, (name, owner) in self.accounts.items()
+            },
+            "complete": self.complete,
+        }
+
+    @classmethod
+    def from_session(cls, value: Any) -> Optional["AuthorizationSnapshot"]:
+        try:
+            return cls(
+                user_id=value["user_id"],
+                version=value["version"],
+                accounts={
+                    id: (name, owner) for id, (name, owner) in value["accounts"].items()
+                },
+                complete=value["complete"],
+            )
+        except (KeyError, TypeError, ValueError, AttributeError):
+            return None
+
+
+class SessionAuthorization:
+    def __init__(
+        self,
+        accounts_gateway: AccountsGateway,
+        users_gateway: UsersGateway,
+        authorization_cache: Optional[AuthorizationCache] = None,
+        max_accounts: int = 50,
+        max_snapshot_bytes: int = 1500,
+    ) -> None:
+        self.__accounts_gateway = accounts_gateway
+        self.__users_gateway = users_gateway
+        self.__authorization_cache = authorization_cache
+        self.__max_accounts = max_accounts
+        self.__max_snapshot_bytes = max_snapshot_bytes
+
+    def refresh(
+        self, session: MutableMapping[str, Any], user_id: UUID
+    ) -> AuthorizationSnapshot:
+        version = self.version(user_id)
+        page = self.__accounts_gateway.page_for_user(user_id, limit=self.__max_accounts)
+        accounts: Dict[str, Tuple[str, bool]] = {}
+        size = 0
+        for account in page.items:
+            key = _normalize(account.id)
+            size += _encoded_size({key: [account.name, account.owner]})
+            if size > self.__max_snapshot_bytes:
+                break
+            accounts[key] = (account.name, account.owner)
+
+        snapshot = AuthorizationSnapshot(
+            user_id=_normalize(user_id),
+            version=version,
+            accounts=accounts,
+            complete=page.next_cursor is None and len(accounts) == len(page.items),
+        )
+        session[SESSION_KEY] = snapshot.to_session()
+
+        return snapshot
+
+    def find_for_user(
+        self, session: MutableMapping[str, Any], account_id: UUID, user_id: UUID
+    ) -> Union[None, AccountRecordWithOwnership]:
+        key = _account_key(account_id)
+        if key is None:
+            return None
+
+        snapshot = self.__current(session, user_id)
+        account = snapshot.accounts.get(key)
+        if account is None:
+            if snapshot.complete:
+                return None
+            return self.__accounts_gateway.find_for_user(
+                account_id=account_id, user_id=user_id
+            )
+
+        name, owner = account
+        return AccountRecordWithOwnership(id=UUID(key), name=name, owner=owner)
+
+    def find_for_owner(
+        self, session: MutableMapping[str, Any], account_id: UUID, user_id: UUID
+    ) -> Union[None, AccountRecord]:
+        key = _account_key(account_id)
+        if key is None:
+            return None
+
+        snapshot = self.__current(session, user_id)
+        account = snapshot.accounts.get(key)
+        if account is None:
+            if snapshot.complete:
+                return None
+            return self.__accounts_gateway.find_for_owner(
+                account_id=account_id, user_id=user_id
+            )
+
+        name, owner = account
+        if not owner:
+            return None
+
+        return AccountRecord(id=UUID(key), name=name)
+
+    def version(self, user_id: UUID) -> int:
+        if self.__authorization_cache is None:
+            version = self.__users_gateway.find_membership_version(user_id)
+        else:
+            version = self.__authorization_cache.get_or_load_for_user(
+                "membership_version",
+                user_id,
+                lambda: self.__users_gateway.find_membership_version(user_id),
+            )
+
+        return 0 if version is None else version
+
+    def __current(
+        self, session: MutableMapping[str, Any], user_id: UUID
+    ) -> AuthorizationSnapshot:
+        snapshot = AuthorizationSnapshot.from_session(session.get(SESSION_KEY))
+        if (
+            snapshot is None
+            or snapshot.user_id != _normalize(user_id)
+            or snapshot.version != self.version(user_id)
+        ):
+            return self.refresh(session, user_id)
+
+        return snapshot
+
+
+def _normalize(id: UUID) -> str:
+    return str(UUID(str(id)))
+
+
+def _encoded_size(value: Any) -> int:
+    return len(json.dumps(value, separators=(",", ":")).encode())
+
+
+def _account_key(account_id: UUID) -> Optional[str]:
+    try:
+        return _normalize(account_id)
+    except ValueError:
+        return None
@@ -1,11 +1,19 @@
 from dataclasses import dataclass
-from typing import Optional, cast, List
+from typing import Optional, cast, List, Iterator, AsyncIterator
 from uuid import UUID
 
-from sqlalchemy import Connection
+from sqlalchemy import Connection, RowMapping
+from sqlalchemy.ext.asyncio import AsyncConnection
 
+from database_support.async_database_template import AsyncDatabaseTemplate
 from database_support.database_template import DatabaseTemplate
-from database_support.result_mapping import map_one_result, map_results
+from database_support.pagination import Page, PageCursor, map_page
+from database_support.result_mapping import (
+    map_one_result,
+    map_results,
+    stream_results,
+    stream_results_async,
+)
 
 
 @dataclass
@@ -14,6 +22,100 @@ class UserRecord:
     email: str
 
 
+@dataclass
+class UserWithAccountRecord:
+    id: UUID
+    email: str
+    account_id: Optional[UUID]
+    account_name: Optional[str]
+
+
+CREATE = """insert into users (email) values (:email) returning id, email"""
+
+CREATE_OR_FIND = """
+    with inserted as (
+        insert into users (email) values (:email)
+        on conflict ((lower(email))) do nothing
+        returning id, email
+    )
+    select id, email from inserted
+    union all
+    select id, email from users where lower(email) = lower(:email)
+    limit 1
+    """
+
+CREATE_OR_FIND_WITH_ACCOUNT = """
+    with inserted as (
+        insert into users (email) values (:email)
+        on conflict ((lower(email))) do nothing
+        returning id, email
+    ), found as (
+        select id, email from inserted
+        union all
+        select id, email from users where lower(email) = lower(:email)
+        limit 1
+    )
+    select found.id, found.email, account.id as account_id, account.name as account_name
+    from found
+    left join lateral (
+        select accounts.id, accounts.name from accounts
+        join memberships on accounts.id = memberships.account_id
+        where memberships.user_id = found.id
+        order by memberships.owner desc, memberships.created_at, memberships.id
+        limit 1
+    ) account on true
+    """
+
+CREATE_MANY = """
+    insert into users (email) values {values}
+    on conflict ((lower(email))) do nothing
+    returning id, email
+    """
+
+FIND_BY_EMAIL = """select id, email from users where lower(email) = lower(:email)"""
+
+FIND_BY_EMAILS = """select id, email from users where lower(email) = any(:emails)"""
+
+FIND_MEMBERSHIP_VERSION = """select membership_version from users where id = :user_id"""
+
+FIND_FOR_ACCOUNT = """select u.id, u.email from users u
+    join public.memberships m on u.id = m.user_id
+    where m.account_id = :account_id
+    """
+
+
+def page_for_account_statement(after: Optional[PageCursor]) -> str:
+    seek = (
+        ""
+        if after is None
+        else "and (m.created_at, m.id) > (:after_created_at, :after_id)"
+    )
+    return f"""select u.id, u.email, m.created_at as cursor_created_at, m.id as cursor_id
+    from users u
+    join public.memberships m on u.id = m.user_id
+    where m.account_id = :account_id
+    {seek}
+    order by m.created_at, m.id
+    limit :limit
+    """
+
+
+def user_record(row: RowMapping) -> UserRecord:
+    return UserRecord(
+        id=cast(UUID, row["id"]),
+        email=row["email"],
+    )
+
+
+def user_with_account_record(row: RowMapping) -> UserWithAccountRecord:
+    return UserWithAccountRecord(
+        id=cast(UUID, row["id"]),
+        email=row["email"],
+        account_id=cast(Optional[UUID], row["account_id"]),
+        account_name=row["account_name"],
+    )
+
+
 class UsersGateway:
     def __init__(self, db: DatabaseTemplate) -> None:
         self.__db = db
@@ -22,52 +124,246 @@ class UsersGateway:
         self, email: str, connection: Optional[Connection] = None
     ) -> Optional[UserRecord]:
         result = self.__db.query(
-            statement="""insert into users (email) values (:email) returning id, email""",
+            statement=CREATE,
+            connection=connection,
+            email=email,
+        )
+
+        return map_one_result(result, user_record)
+
+    def create_or_find(
+        self, email: str, connection: Optional[Connection] = None
+    ) -> Optional[UserRecord]:
+        result = self.__db.query(
+            statement=CREATE_OR_FIND,
+            connection=connection,
+            email=email,
+        )
+
+        return map_one_result(result, user_record)
+
+    def create_or_find_with_account(
+        self, email: str, connection: Optional[Connection] = None
+    ) -> Optional[UserWithAccountRecord]:
+        result = self.__db.query(
+            statement=CREATE_OR_FIND_WITH_ACCOUNT,
             connection=connection,
             email=email,
         )
 
-        return map_one_result(
-            result,
-            lambda row: UserRecord(
-                id=cast(UUID, row["id"]),
-                email=row["email"],
-            ),
+        return map_one_result(result, user_with_account_record)
+
+    def create_many(
+        self, emails: List[str], connection: Optional[Connection] = None
+    ) -> List[UserRecord]:
+        rows = self.__db.insert_many(
+            statement=CREATE_MANY,
+            values=[{"email": email} for email in emails],
+            connection=connection,
         )
 
+        return map_results(rows, user_record)
+
     def find_by_email(
         self, email: str, connection: Optional[Connection] = None
     ) -> Optional[UserRecord]:
         result = self.__db.query(
-            statement="""select id, email from users where email = :email""",
+            statement=FIND_BY_EMAIL,
             connection=connection,
             email=email,
         )
 
-        return map_one_result(
-            result,
-            lambda row: UserRecord(
-                id=cast(UUID, row["id"]),
-                email=row["email"],
-            ),
+        return map_one_result(result, user_record)
+
+    def find_by_emails(
+        self, emails: List[str], connection: Optional[Connection] = None
+    ) -> List[UserRecord]:
+        result = self.__db.query(
+            statement=FIND_BY_EMAILS,
+            connection=connection,
+            emails=[email.lower() for email in emails],
         )
 
+        return map_results(result, user_record)
+
+    def find_membership_version(
+        self, user_id: UUID, connection: Optional[Connection] = None
+    ) -> Optional[int]:
+        result = self.__db.query(
+            statement=FIND_MEMBERSHIP_VERSION,
+            connection=connection,
+            primary=True,
+            user_id=user_id,
+        )
+
+        return map_one_result(result, lambda row: cast(int, row["membership_version"]))
+
     def find_for_account(
         self, account_id: UUID, connection: Optional[Connection] = None
     ) -> List[UserRecord]:
         result = self.__db.query(
-            statement="""select u.id, u.email from users u
-            join public.memberships m on u.id = m.user_id
-            where m.account_id = :account_id
-            """,
+            statement=FIND_FOR_ACCOUNT,
+            connection=connection,
+            account_id=account_id,
+        )
+
+        return map_results(result, user_record)
+
+    def page_for_account(
+        self,
+        account_id: UUID,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        connection: Optional[Connection] = None,
+    ) -> Page[UserRecord]:
+        result = self.__db.query(
+            statement=page_for_account_statement(after),
             connection=connection,
             account_id=account_id,
+            after_created_at=None if after is None else after.created_at,
+            after_id=None if after is None else after.id,
+            limit=limit + 1,
         )
 
-        return map_results(
-            result,
-            lambda row: UserRecord(
-                id=cast(UUID, row["id"]),
-                email=row["email"],
-            ),
+        return map_page(result, limit, user_record)
+
+    def find_for_account_iter(
+        self,
+        account_id: UUID,
+        connection: Optional[Connection] = None,
+        yield_per: int = 1000,
+    ) -> Iterator[UserRecord]:
+        rows = self.__db.stream(
+            statement=FIND_FOR_ACCOUNT,
+            connection=connection,
+            yield_per=yield_per,
+            account_id=account_id,
         )
+
+        return stream_results(rows, user_record)
+
+
+class AsyncUsersGateway:
+    def __init__(self, db: AsyncDatabaseTemplate) -> None:
+        self.__db = db
+
+    async def create(
+        self, email: str, connection: Optional[AsyncConnection] = None
+    ) -> Optional[UserRecord]:
+        result = await self.__db.query(
+            statement=CREATE,
+            connection=connection,
+            email=email,
+        )
+
+        return map_one_result(result, user_record)
+
+    async def create_or_find(
+        self, email: str, connection: Optional[AsyncConnection] = None
+    ) -> Optional[UserRecord]:
+        result = await self.__db.query(
+            statement=CREATE_OR_FIND,
+            connection=connection,
+            email=email,
+        )
+
+        return map_one_result(result, user_record)
+
+    async def create_or_find_with_account(
+        self, email: str, connection: Optional[AsyncConnection] = None
+    ) -> Optional[UserWithAccountRecord]:
+        result = await self.__db.query(
+            statement=CREATE_OR_FIND_WITH_ACCOUNT,
+            connection=connection,
+            email=email,
+        )
+
+        return map_one_result(result, user_with_account_record)
+
+    async def create_many(
+        self, emails: List[str], connection: Optional[AsyncConnection] = None
+    ) -> List[UserRecord]:
+        rows = await self.__db.insert_many(
+            statement=CREATE_MANY,
+            values=[{"email": email} for email in emails],
+            connection=connection,
+        )
+
+        return map_results(rows, user_record)
+
+    async def find_by_email(
+        self, email: str, connection: Optional[AsyncConnection] = None
+    ) -> Optional[UserRecord]:
+        result = await self.__db.query(
+            statement=FIND_BY_EMAIL,
+            connection=connection,
+            email=email,
+        )
+
+        return map_one_result(result, user_record)
+
+    async def find_by_emails(
+        self, emails: List[str], connection: Optional[AsyncConnection] = None
+    ) -> List[UserRecord]:
+        result = await self.__db.query(
+            statement=FIND_BY_EMAILS,
+            connection=connection,
+            emails=[email.lower() for email in emails],
+        )
+
+        return map_results(result, user_record)
+
+    async def find_membership_version(
+        self, user_id: UUID, connection: Optional[AsyncConnection] = None
+    ) -> Optional[int]:
+        result = await self.__db.query(
+            statement=FIND_MEMBERSHIP_VERSION,
+            connection=connection,
+            user_id=user_id,
+        )
+
+        return map_one_result(result, lambda row: cast(int, row["membership_version"]))
+
+    async def find_for_account(
+        self, account_id: UUID, connection: Optional[AsyncConnection] = None
+    ) -> List[UserRecord]:
+        result = await self.__db.query(
+            statement=FIND_FOR_ACCOUNT,
+            connection=connection,
+            account_id=account_id,
+        )
+
+        return map_results(result, user_record)
+
+    async def page_for_account(
+        self,
+        account_id: UUID,
+        limit: int,
+        after: Optional[PageCursor] = None,
+        connection: Optional[AsyncConnection] = None,
+    ) -> Page[UserRecord]:
+        result = await self.__db.query(
+            statement=page_for_account_statement(after),
+            connection=connection,
+            account_id=account_id,
+            after_created_at=None if after is None else after.created_at,
+            after_id=None if after is None else after.id,
+            limit=limit + 1,
+        )
+
+        return map_page(result, limit, user_record)
+
+    def find_for_account_iter(
+        self,
+        account_id: UUID,
+        connection: Optional[AsyncConnection] = None,
+        yield_per: int = 1000,
+    ) -> AsyncIterator[UserRecord]:
+        rows = self.__db.stream(
+            statement=FIND_FOR_ACCOUNT,
+            connection=connection,
+            yield_per=yield_per,
+            account_id=account_id,
+        )
+
+        return stream_results_async(rows, user_record)
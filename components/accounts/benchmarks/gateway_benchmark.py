@@ -0,0 +1,205 @@
+import argparse
+import sys
+from typing import Any, Dict, List, Sequence, cast
+from uuid import UUID
+
+from sqlalchemy import Row
+
+from accounts.accounts_gateway import (
+    LIST_FOR_USER,
+    AccountsGateway,
+    account_record_with_ownership,
+)
+from accounts.users_gateway import (
+    FIND_BY_EMAIL,
+    FIND_FOR_ACCOUNT,
+    UsersGateway,
+    user_record,
+)
+from database_support.result_mapping import map_one_result, map_results
+from test_support.benchmark import (
+    BenchmarkResult,
+    benchmark,
+    calibrate,
+    load_baseline,
+    print_results,
+    regressions,
+    save_baseline,
+)
+from test_support.db_template import TestDatabaseTemplate, test_db_template
+
+SIZES = [1, 100, 10_000]
+ITERATIONS = {1: 500, 100: 200, 10_000: 5}
+BASELINE = "benchmarks/gateway_benchmark_baseline.json"
+
+
+class Seed:
+    def __init__(self, db: TestDatabaseTemplate) -> None:
+        self.account_ids: Dict[int, UUID] = {}
+        self.user_ids: Dict[int, UUID] = {}
+        self.emails: Dict[int, List[str]] = {}
+
+        for size in SIZES:
+            emails = [f"member-{size}-{index}@example.com" for index in range(size)]
+            self.account_ids[size] = db.account(f"account with {size} members")
+            db.add_users(emails, self.account_ids[size])
+            self.emails[size] = emails
+
+            self.user_ids[size] = db.user(f"user-in-{size}@example.com")
+            with db.begin() as connection:
+                account_ids = [
+                    cast(UUID, row.id)
+                    for row in db.insert_many(
+                        "insert into accounts (name) values {values} returning id",
+                        [{"name": f"shared {size} {index}"} for index in range(size)],
+                        connection=connection,
+                    )
+                ]
+                db.insert_many(
+                    """insert into memberships (account_id, user_id, owner)
+                    values {values}""",
+                    [
+                        {
+                            "account_id": account_id,
+                            "user_id": self.user_ids[size],
+                            "owner": False,
+                        }
+                        for account_id in account_ids
+                    ],
+                    connection=connection,
+                )
+
+
+def rows(db: TestDatabaseTemplate, statement: str, **kwargs: Any) -> Sequence[Row[Any]]:
+    return db.query(statement, **kwargs).all()
+
+
+def run(db: TestDatabaseTemplate, seed: Seed) -> List[BenchmarkResult]:
+    users_gateway = UsersGateway(db)
+    accounts_gateway = AccountsGateway(db)
+    single_account_id = seed.account_ids[1]
+    single_user_id = seed.user_ids[1]
+    single_email = seed.emails[1][0]
+
+    results = [
+        calibrate(),
+        benchmark(
+            "map_one_result query 1 row",
+            lambda: map_one_result(
+                db.query(FIND_BY_EMAIL, email=single_email), user_record
+            ),
+            iterations=ITERATIONS[1],
+        ),
+        benchmark(
+            "UsersGateway.find_by_email",
+            lambda: users_gateway.find_by_email(single_email),
+            iterations=ITERATIONS[1],
+        ),
+        benchmark(
+            "UsersGateway.find_membership_version",
+            lambda: users_gateway.find_membership_version(single_user_id),
+            iterations=ITERATIONS[1],
+        ),
+        benchmark(
+            "AccountsGateway.find_for_user",
+            lambda: accounts_gateway.find_for_user(
+                account_id=single_account_id, user_id=single_user_id
+            ),
+            iterations=ITERATIONS[1],
+        ),
+        benchmark(
+            "AccountsGateway.find_for_owner",
+            lambda: accounts_gateway.find_for_owner(
+                account_id=single_account_id, user_id=single_user_id
+            ),
+            iterations=ITERATIONS[1],
+        ),
+    ]
+
+    for size in SIZES:
+        account_id = seed.account_ids[size]
+        user_id = seed.user_ids[size]
+        emails = seed.emails[size]
+        user_rows = rows(db, FIND_FOR_ACCOUNT, account_id=account_id)
+        account_rows = rows(db, LIST_FOR_USER, user_id=user_id)
+        iterations = ITERATIONS[size]
+
+        results += [
+            benchmark(
+                f"map_results users in memory {size} rows",
+                lambda: map_results(user_rows, user_record),
+                iterations=iterations * 10,
+            ),
+            benchmark(
+                f"map_results accounts in memory {size} rows",
+                lambda: map_results(account_rows, account_record_with_ownership),
+                iterations=iterations * 10,
+            ),
+            benchmark(
+                f"UsersGateway.find_for_account {size} rows",
+                lambda: users_gateway.find_for_account(account_id),
+                iterations=iterations,
+            ),
+            benchmark(
+                f"UsersGateway.find_for_account_iter {size} rows",
+                lambda: list(users_gateway.find_for_account_iter(account_id)),
+                iterations=iterations,
+            ),
+            benchmark(
+                f"UsersGateway.page_for_account {size} rows",
+                lambda: users_gateway.page_for_account(account_id, limit=size),
+                iterations=iterations,
+            ),
+            benchmark(
+                f"UsersGateway.find_by_emails {size} rows",
+                lambda: users_gateway.find_by_emails(emails),
+                iterations=iterations,
+            ),
+            benchmark(
+                f"AccountsGateway.list_for_user {size} rows",
+                lambda: accounts_gateway.list_for_user(user_id),
+                iterations=iterations,
+            ),
+            benchmark(
+                f"AccountsGateway.page_for_user {size} rows",
+                lambda: accounts_gateway.page_for_user(user_id, limit=size),
+                iterations=iterations,
+            ),
+        ]
+
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Benchmark gateways and mapping")
+    parser.add_argument("--threshold", type=float, default=0.5)
+    parser.add_argument("--save-baseline", action="store_true")
+    arguments = parser.parse_args()
+
+    db = test_db_template()
+    db.clear()
+    try:
+        results = run(db, Seed(db))
+    finally:
+        db.clear()
+
+    baseline = load_baseline(BASELINE)
+    print_results(results, baseline)
+
+    if arguments.save_baseline or baseline is None:
+        save_baseline(BASELINE, results)
+        return
+
+    found = regressions(results, baseline, arguments.threshold)
+    for regression in found:
+        print(
+            f"{regression.name} regressed {regression.slowdown:.1%}: "
+            f"{regression.actual_microseconds:.3f} µs/call, "
+            f"expected {regression.expected_microseconds:.3f} µs/call"
+        )
+    if len(found) > 0:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
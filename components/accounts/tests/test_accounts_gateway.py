@@ -1,13 +1,20 @@
-from unittest import TestCase
+from typing import List
+from unittest import TestCase, IsolatedAsyncioTestCase
+
+import sqlalchemy
+from sqlalchemy import event
 
 from accounts.accounts_gateway import (
     AccountsGateway,
     AccountRecordWithOwnership,
     AccountRecord,
+    AsyncAccountsGateway,
 )
-from accounts.memberships_gateway import MembershipsGateway
+from accounts.authorization_cache import AuthorizationCache, InMemoryCacheBackend
+from accounts.memberships_gateway import MembershipsGateway, AsyncMembershipsGateway
 from accounts.users_gateway import UsersGateway
-from test_support.db_template import test_db_template
+from database_support.database_template import DatabaseTemplate
+from test_support.db_template import test_db_template, async_test_db_template
 from test_support.unwrap_optional import unwrap
 
 
@@ -65,6 +72,29 @@ class TestAccountsGateway(TestCase):
 
         self.assertEqual([], accounts)
 
+    def test_page_for_user(self) -> None:
+        user_id = unwrap(self, self.users_gateway.create("test@example.com")).id
+        account_ids = [
+            unwrap(self, self.gateway.create(f"Account {index}")).id
+            for index in range(3)
+        ]
+        for account_id in account_ids:
+            self.memberships_gateway.create(
+                account_id=account_id, user_id=user_id, owner=False
+            )
+
+        first_page = self.gateway.page_for_user(user_id, limit=2)
+        last_page = self.gateway.page_for_user(
+            user_id, limit=2, after=first_page.next_cursor
+        )
+
+        self.assertEqual(
+            account_ids,
+            [account.id for account in first_page.items + last_page.items],
+        )
+        self.assertIsNotNone(first_page.next_cursor)
+        self.assertIsNone(last_page.next_cursor)
+
     def test_find_for_user(self) -> None:
         user_id = unwrap(self, self.users_gateway.create("test@example.com")).id
         account_id = unwrap(self, self.gateway.create("Some account")).id
@@ -116,3 +146,201 @@ class TestAccountsGateway(TestCase):
         account = self.gateway.find_for_owner(user_id=user_id, account_id=account_id)
 
         self.assertIsNone(account)
+
+    def test_find_for_user_cached(self) -> None:
+        cache = AuthorizationCache(InMemoryCacheBackend())
+        gateway = AccountsGateway(self.db, cache)
+        memberships_gateway = MembershipsGateway(self.db, cache)
+        user_id = unwrap(self, self.users_gateway.create("test@example.com")).id
+        account_id = unwrap(self, self.gateway.create("Some account")).id
+
+        self.assertIsNone(gateway.find_for_user(user_id=user_id, account_id=account_id))
+        memberships_gateway.create(account_id=account_id, user_id=user_id, owner=True)
+        self.db.query("update accounts set name = 'Renamed account'")
+        member = gateway.find_for_user(user_id=user_id, account_id=account_id)
+        owner = gateway.find_for_owner(user_id=user_id, account_id=account_id)
+        self.assertEqual(
+            member, gateway.find_for_user(user_id=user_id, account_id=account_id)
+        )
+        self.assertEqual(
+            owner, gateway.find_for_owner(user_id=user_id, account_id=account_id)
+        )
+        memberships_gateway.delete(account_id=account_id, user_id=user_id)
+
+        self.assertEqual(
+            AccountRecordWithOwnership(
+                id=account_id, name="Renamed account", owner=True
+            ),
+            member,
+        )
+        self.assertEqual(AccountRecord(id=account_id, name="Renamed account"), owner)
+        self.assertIsNone(gateway.find_for_user(user_id=user_id, account_id=account_id))
+        self.assertIsNone(
+            gateway.find_for_owner(user_id=user_id, account_id=account_id)
+        )
+        self.assertEqual(2, cache.stats().hits)
+        self.assertEqual(5, cache.stats().misses)
+
+    def test_authorization_reads_use_primary(self) -> None:
+        url = "postgresql://localhost:5432/starter_test?user=starter&password=starter"
+        primary = sqlalchemy.create_engine(url, pool_size=1)
+        replica = sqlalchemy.create_engine(url, pool_size=1)
+        db = DatabaseTemplate(primary, replicas=[replica])
+        replica_statements: List[str] = []
+        event.listen(
+            replica,
+            "before_cursor_execute",
+            lambda *args: replica_statements.append(args[2]),
+        )
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+
+        gateway = AccountsGateway(db)
+        gateway.find_for_user(account_id=account_id, user_id=user_id)
+        gateway.find_for_owner(account_id=account_id, user_id=user_id)
+        UsersGateway(db).find_membership_version(user_id)
+
+        self.assertEqual([], replica_statements)
+        primary.dispose()
+        replica.dispose()
+
+    def test_find_for_user_cached_invalidated_after_commit(self) -> None:
+        cache = AuthorizationCache(InMemoryCacheBackend())
+        gateway = AccountsGateway(self.db, cache)
+        memberships_gateway = MembershipsGateway(self.db, cache)
+        user_id = unwrap(self, self.users_gateway.create("test@example.com")).id
+        account_id = unwrap(self, self.gateway.create("Some account")).id
+
+        with self.db.begin() as connection:
+            memberships_gateway.create(
+                account_id=account_id,
+                user_id=user_id,
+                owner=True,
+                connection=connection,
+            )
+            self.assertIsNone(
+                gateway.find_for_user(user_id=user_id, account_id=account_id)
+            )
+
+        self.assertEqual(
+            AccountRecordWithOwnership(id=account_id, name="Some account", owner=True),
+            gateway.find_for_user(user_id=user_id, account_id=account_id),
+        )
+
+
+class TestAsyncAccountsGateway(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.db = test_db_template()
+        self.db.clear()
+        self.async_db = async_test_db_template()
+
+        self.gateway = AsyncAccountsGateway(self.async_db)
+
+    async def test_create(self) -> None:
+        account = unwrap(self, await self.gateway.create("Some account"))
+
+        self.assertEqual(
+            [{"id": account.id, "name": "Some account"}],
+            self.db.query_to_dict("select id, name from accounts"),
+        )
+
+    async def test_list_for_user(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+
+        accounts = await self.gateway.list_for_user(user_id)
+
+        self.assertEqual(
+            [
+                AccountRecordWithOwnership(
+                    id=account_id, name="Some account", owner=True
+                )
+            ],
+            accounts,
+        )
+
+    async def test_page_for_user(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+
+        page = await self.gateway.page_for_user(user_id, limit=1)
+
+        self.assertEqual(
+            [
+                AccountRecordWithOwnership(
+                    id=account_id, name="Some account", owner=True
+                )
+            ],
+            page.items,
+        )
+        self.assertIsNone(page.next_cursor)
+
+    async def test_find_for_user_and_owner(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account", owner=False
+        )
+
+        member = await self.gateway.find_for_user(
+            user_id=user_id, account_id=account_id
+        )
+        owner = await self.gateway.find_for_owner(
+            user_id=user_id, account_id=account_id
+        )
+
+        self.assertEqual(
+            AccountRecordWithOwnership(id=account_id, name="Some account", owner=False),
+            member,
+        )
+        self.assertIsNone(owner)
+
+    async def test_find_for_user_cached(self) -> None:
+        cache = AuthorizationCache(InMemoryCacheBackend())
+        gateway = AsyncAccountsGateway(self.async_db, cache)
+        memberships_gateway = AsyncMembershipsGateway(self.async_db, cache)
+        user_id = self.db.user("test@example.com")
+        account_id = self.db.account("Some account")
+
+        self.assertIsNone(
+            await gateway.find_for_user(user_id=user_id, account_id=account_id)
+        )
+        await memberships_gateway.create(
+            account_id=account_id, user_id=user_id, owner=True
+        )
+        member = await gateway.find_for_user(user_id=user_id, account_id=account_id)
+        self.assertEqual(
+            member, await gateway.find_for_user(user_id=user_id, account_id=account_id)
+        )
+
+        self.assertEqual(
+            AccountRecordWithOwnership(id=account_id, name="Some account", owner=True),
+            member,
+        )
+        self.assertEqual(1, cache.stats().hits)
+        self.assertEqual(2, cache.stats().misses)
+
+    async def test_find_for_user_cached_invalidated_after_commit(self) -> None:
+        cache = AuthorizationCache(InMemoryCacheBackend())
+        gateway = AsyncAccountsGateway(self.async_db, cache)
+        memberships_gateway = AsyncMembershipsGateway(self.async_db, cache)
+        user_id = self.db.user("test@example.com")
+        account_id = self.db.account("Some account")
+
+        async with self.async_db.begin() as connection:
+            await memberships_gateway.create(
+                account_id=account_id,
+                user_id=user_id,
+                owner=True,
+                connection=connection,
+            )
+            self.assertIsNone(
+                await gateway.find_for_user(user_id=user_id, account_id=account_id)
+            )
+
+        self.assertEqual(
+            AccountRecordWithOwnership(id=account_id, name="Some account", owner=True),
+            await gateway.find_for_user(user_id=user_id, account_id=account_id),
+        )
@@ -1,13 +1,49 @@
+from typing import List, Optional
 from unittest import TestCase
 
+from sqlalchemy import Connection
+
 from accounts.accounts_gateway import AccountsGateway
-from accounts.accounts_service import AccountsService
+from accounts.accounts_service import AccountsService, MemberOutcome
 from accounts.memberships_gateway import MembershipsGateway
-from accounts.users_gateway import UsersGateway
-from test_support.db_template import test_db_template
+from accounts.users_gateway import UsersGateway, UserRecord, UserWithAccountRecord
+from test_support.db_template import test_db_template, TestDatabaseTemplate
 from test_support.unwrap_optional import unwrap
 
 
+class ConcurrentlyCreatingUsersGateway(UsersGateway):
+    def __init__(self, db: TestDatabaseTemplate, email: str) -> None:
+        super().__init__(db)
+        self.db = db
+        self.email = email
+
+    def find_by_emails(
+        self, emails: List[str], connection: Optional[Connection] = None
+    ) -> List[UserRecord]:
+        users = super().find_by_emails(emails, connection=connection)
+        if self.email in emails and len(users) == 0:
+            self.db.user(self.email)
+
+        return users
+
+
+class LosingRaceUsersGateway(UsersGateway):
+    def __init__(self, db: TestDatabaseTemplate) -> None:
+        super().__init__(db)
+        self.db = db
+        self.calls = 0
+
+    def create_or_find_with_account(
+        self, email: str, connection: Optional[Connection] = None
+    ) -> Optional[UserWithAccountRecord]:
+        self.calls += 1
+        if self.calls == 1:
+            self.db.user(email)
+            return None
+
+        return super().create_or_find_with_account(email, connection=connection)
+
+
 class TestAccountsService(TestCase):
     def setUp(self) -> None:
         super().setUp()
@@ -33,6 +69,23 @@ class TestAccountsService(TestCase):
         users = self.db.query_to_dict("select id, email from users")
         self.assertEqual("test@example.com", users[0]["email"])
 
+    def test_create_or_find_user_retries_after_concurrent_insert(self) -> None:
+        users_gateway = LosingRaceUsersGateway(self.db)
+        service = AccountsService(
+            db=self.db,
+            accounts_gateway=self.accounts_gateway,
+            users_gateway=users_gateway,
+            memberships_gateway=self.memberships_gateway,
+        )
+
+        user = unwrap(self, service.create_or_find_user("test@example.com"))
+
+        self.assertEqual(2, users_gateway.calls)
+        self.assertEqual(
+            [{"id": user.id, "email": "test@example.com"}],
+            self.db.query_to_dict("select id, email from users"),
+        )
+
     def test_create_or_find_user_already_exists(self) -> None:
         existing_user = unwrap(
             self, self.service.create_or_find_user("test@example.com")
@@ -51,6 +104,16 @@ class TestAccountsService(TestCase):
         self.assertEqual(1, len(self.db.query_to_dict("select 1 from users")))
         self.assertEqual(1, len(self.db.query_to_dict("select 1 from memberships")))
 
+    def test_create_or_find_user_ignores_case(self) -> None:
+        existing_user = unwrap(
+            self, self.service.create_or_find_user("test@example.com")
+        )
+
+        user = unwrap(self, self.service.create_or_find_user("Test@Example.com"))
+
+        self.assertEqual(existing_user.id, user.id)
+        self.assertEqual(1, len(self.db.query_to_dict("select 1 from users")))
+
     def test_add_to_account(self) -> None:
         user = unwrap(self, self.service.create_or_find_user("test@example.com"))
         account = unwrap(self, self.service.create_account(user.id, "some account"))
@@ -94,6 +157,121 @@ class TestAccountsService(TestCase):
             ),
         )
 
+    def test_add_many_to_account(self) -> None:
+        user = unwrap(self, self.service.create_or_find_user("test@example.com"))
+        account = unwrap(self, self.service.create_account(user.id, "some account"))
+        existing_user = unwrap(
+            self, self.service.create_or_find_user("existing@example.com")
+        )
+
+        outcomes = self.service.add_many_to_account(
+            [
+                "new@example.com",
+                "existing@example.com",
+                "Test@example.com",
+                "new@example.com",
+            ],
+            account.id,
+        )
+
+        self.assertEqual(
+            {
+                "new@example.com": MemberOutcome.CREATED,
+                "existing@example.com": MemberOutcome.ADDED,
+                "Test@example.com": MemberOutcome.ALREADY_MEMBER,
+            },
+            outcomes,
+        )
+        self.assertCountEqual(
+            [
+                {"email": "test@example.com", "owner": True},
+                {"email": "existing@example.com", "owner": False},
+                {"email": "new@example.com", "owner": False},
+            ],
+            self.db.query_to_dict(
+                f"""
+            select users.email, memberships.owner from memberships
+                join users on users.id = memberships.user_id
+                where account_id = '{account.id}'
+        """
+            ),
+        )
+        self.assertEqual(
+            [{"id": existing_user.id}],
+            self.db.query_to_dict(
+                "select id from users where email = 'existing@example.com'"
+            ),
+        )
+
+    def test_add_many_to_account_user_created_concurrently(self) -> None:
+        user = unwrap(self, self.service.create_or_find_user("test@example.com"))
+        account = unwrap(self, self.service.create_account(user.id, "some account"))
+        service = AccountsService(
+            db=self.db,
+            accounts_gateway=self.accounts_gateway,
+            users_gateway=ConcurrentlyCreatingUsersGateway(
+                self.db, "racing@example.com"
+            ),
+            memberships_gateway=self.memberships_gateway,
+        )
+
+        outcomes = service.add_many_to_account(
+            ["racing@example.com", "new@example.com"], account.id
+        )
+
+        self.assertEqual(
+            {
+                "racing@example.com": MemberOutcome.ADDED,
+                "new@example.com": MemberOutcome.CREATED,
+            },
+            outcomes,
+        )
+        self.assertEqual(
+            3,
+            len(
+                self.db.query_to_dict(
+                    f"select id from memberships where account_id = '{account.id}'"
+                )
+            ),
+        )
+
+    def test_add_many_to_account_invalid_emails(self) -> None:
+        user = unwrap(self, self.service.create_or_find_user("test@example.com"))
+        account = unwrap(self, self.service.create_account(user.id, "some account"))
+
+        outcomes = self.service.add_many_to_account(
+            ["John", "new@example.com", "<>", "a@b@c"], account.id
+        )
+
+        self.assertEqual(
+            {
+                "John": MemberOutcome.INVALID,
+                "new@example.com": MemberOutcome.CREATED,
+                "<>": MemberOutcome.INVALID,
+                "a@b@c": MemberOutcome.INVALID,
+            },
+            outcomes,
+        )
+        self.assertCountEqual(
+            [{"email": "test@example.com"}, {"email": "new@example.com"}],
+            self.db.query_to_dict("select email from users"),
+        )
+
+    def test_add_many_to_account_only_invalid_emails(self) -> None:
+        user = unwrap(self, self.service.create_or_find_user("test@example.com"))
+        account = unwrap(self, self.service.create_account(user.id, "some account"))
+
+        self.assertEqual(
+            {"a": MemberOutcome.INVALID, "b": MemberOutcome.INVALID},
+            self.service.add_many_to_account(["a", "b"], account.id),
+        )
+
+    def test_add_many_to_account_empty(self) -> None:
+        user = unwrap(self, self.service.create_or_find_user("test@example.com"))
+        account = unwrap(self, self.service.create_account(user.id, "some account"))
+
+        self.assertEqual({}, self.service.add_many_to_account([], account.id))
+
     def test_create_account(self) -> None:
         user = unwrap(self, self.service.create_or_find_user("test@example.com"))
 
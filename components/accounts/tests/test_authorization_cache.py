@@ -0,0 +1,118 @@
+from typing import List, Optional
+from unittest import TestCase
+from uuid import UUID
+
+from accounts.authorization_cache import AuthorizationCache, InMemoryCacheBackend
+
+ACCOUNT_ID = UUID("b49c77eb-83ce-4b3d-9c7e-42559bd10834")
+USER_ID = UUID("aaaa77eb-83ce-4b3d-9c7e-42559bd10834")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestAuthorizationCache(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = FakeClock()
+        self.cache = AuthorizationCache(
+            InMemoryCacheBackend(max_size=2, clock=self.clock), ttl_seconds=10
+        )
+        self.loads: List[str] = []
+
+    def load(self, value: Optional[str]) -> Optional[str]:
+        self.loads.append(str(value))
+        return value
+
+    def test_get_or_load(self) -> None:
+        first = self.cache.get_or_load(
+            "member", ACCOUNT_ID, USER_ID, lambda: self.load("account")
+        )
+        second = self.cache.get_or_load(
+            "member", ACCOUNT_ID, USER_ID, lambda: self.load("other")
+        )
+
+        self.assertEqual("account", first)
+        self.assertEqual("account", second)
+        self.assertEqual(["account"], self.loads)
+        self.assertEqual(0.5, self.cache.stats().hit_ratio)
+
+    def test_get_or_load_does_not_cache_missing_values(self) -> None:
+        self.cache.get_or_load("owner", ACCOUNT_ID, USER_ID, lambda: self.load(None))
+        value = self.cache.get_or_load(
+            "owner", ACCOUNT_ID, USER_ID, lambda: self.load("account")
+        )
+
+        self.assertEqual("account", value)
+        self.assertEqual(["None", "account"], self.loads)
+
+    def test_get_or_load_normalizes_ids(self) -> None:
+        self.cache.get_or_load(
+            "member", ACCOUNT_ID, USER_ID, lambda: self.load("account")
+        )
+        self.cache.invalidate(UUID(str(ACCOUNT_ID).upper()), UUID(str(USER_ID).upper()))
+        self.cache.get_or_load(
+            "member",
+            str(ACCOUNT_ID).upper(),  # type: ignore[arg-type]
+            USER_ID,
+            lambda: self.load("reloaded"),
+        )
+
+        self.assertEqual(["account", "reloaded"], self.loads)
+
+    def test_expires(self) -> None:
+        self.cache.get_or_load(
+            "member", ACCOUNT_ID, USER_ID, lambda: self.load("account")
+        )
+        self.clock.now = 10
+        self.cache.get_or_load(
+            "member", ACCOUNT_ID, USER_ID, lambda: self.load("reloaded")
+        )
+
+        self.assertEqual(["account", "reloaded"], self.loads)
+
+    def test_invalidate(self) -> None:
+        self.cache.get_or_load("member", ACCOUNT_ID, USER_ID, lambda: self.load("a"))
+        self.cache.get_or_load("owner", ACCOUNT_ID, USER_ID, lambda: self.load("b"))
+
+        self.cache.invalidate(ACCOUNT_ID, USER_ID)
+        self.cache.get_or_load("member", ACCOUNT_ID, USER_ID, lambda: self.load("c"))
+        self.cache.get_or_load("owner", ACCOUNT_ID, USER_ID, lambda: self.load("d"))
+
+        self.assertEqual(["a", "b", "c", "d"], self.loads)
+        self.assertEqual(0, self.cache.stats().hits)
+
+    def test_get_or_load_for_user(self) -> None:
+        self.cache.get_or_load_for_user(
+            "membership_version", USER_ID, lambda: self.load("1")
+        )
+        cached = self.cache.get_or_load_for_user(
+            "membership_version", USER_ID, lambda: self.load("2")
+        )
+        self.cache.invalidate(ACCOUNT_ID, USER_ID)
+        reloaded = self.cache.get_or_load_for_user(
+            "membership_version", USER_ID, lambda: self.load("3")
+        )
+
+        self.assertEqual("1", cached)
+        self.assertEqual("3", reloaded)
+        self.assertEqual(["1", "3"], self.loads)
+
+    def test_evicts_least_recently_used(self) -> None:
+        other_user_id = UUID("cccc77eb-83ce-4b3d-9c7e-42559bd10834")
+        self.cache.get_or_load("member", ACCOUNT_ID, USER_ID, lambda: self.load("a"))
+        self.cache.get_or_load("owner", ACCOUNT_ID, USER_ID, lambda: self.load("b"))
+        self.cache.get_or_load("member", ACCOUNT_ID, USER_ID, lambda: self.load("-"))
+        self.cache.get_or_load(
+            "member", ACCOUNT_ID, other_user_id, lambda: self.load("c")
+        )
+
+        self.cache.get_or_load("member", ACCOUNT_ID, USER_ID, lambda: self.load("-"))
+        self.cache.get_or_load("owner", ACCOUNT_ID, USER_ID, lambda: self.load("d"))
+
+        self.assertEqual(["a", "b", "c", "d"], self.loads)
@@ -1,9 +1,13 @@
-from unittest import TestCase
+from unittest import TestCase, IsolatedAsyncioTestCase
 
 from accounts.accounts_gateway import AccountsGateway
-from accounts.memberships_gateway import MembershipsGateway
+from accounts.memberships_gateway import (
+    MembershipsGateway,
+    AsyncMembershipsGateway,
+    MembershipRecord,
+)
 from accounts.users_gateway import UsersGateway
-from test_support.db_template import test_db_template
+from test_support.db_template import test_db_template, async_test_db_template
 from test_support.unwrap_optional import unwrap
 
 
@@ -44,6 +48,57 @@ class TestMembershipsGateway(TestCase):
             result,
         )
 
+    def test_create_many(self) -> None:
+        user_ids = [
+            user.id
+            for user in self.users_gateway.create_many(
+                ["first@example.com", "second@example.com"]
+            )
+        ]
+        account_id = unwrap(self, self.accounts_gateway.create("Some account")).id
+
+        memberships = self.gateway.create_many(account_id=account_id, user_ids=user_ids)
+
+        result = self.db.query_to_dict(
+            "select id, account_id, user_id, owner from memberships"
+        )
+
+        self.assertCountEqual(
+            user_ids, [membership.user_id for membership in memberships]
+        )
+        self.assertCountEqual(
+            [
+                {
+                    "id": membership.id,
+                    "account_id": account_id,
+                    "user_id": membership.user_id,
+                    "owner": False,
+                }
+                for membership in memberships
+            ],
+            result,
+        )
+
+    def test_create_many_skips_existing_members(self) -> None:
+        user_ids = [
+            user.id
+            for user in self.users_gateway.create_many(
+                ["first@example.com", "second@example.com"]
+            )
+        ]
+        account_id = unwrap(self, self.accounts_gateway.create("Some account")).id
+        self.gateway.create(account_id=account_id, user_id=user_ids[0], owner=True)
+
+        memberships = self.gateway.create_many(account_id=account_id, user_ids=user_ids)
+
+        self.assertEqual([user_ids[1]], [m.user_id for m in memberships])
+        self.assertEqual(
+            [{"user_id": user_ids[0], "owner": True}],
+            self.db.query_to_dict(
+                "select user_id, owner from memberships where owner is true"
+            ),
+        )
+
     def test_delete(self) -> None:
         user_id = unwrap(self, self.users_gateway.create("test@example.com")).id
         account_id = unwrap(self, self.accounts_gateway.create("Some account")).id
@@ -56,3 +111,78 @@ class TestMembershipsGateway(TestCase):
         )
 
         self.assertEqual([], result)
+
+    def test_changes_bump_membership_version(self) -> None:
+        user_id = unwrap(self, self.users_gateway.create("test@example.com")).id
+        other_user_id = unwrap(self, self.users_gateway.create("other@example.com")).id
+        account_id = unwrap(self, self.accounts_gateway.create("Some account")).id
+
+        self.gateway.create(account_id=account_id, user_id=user_id, owner=False)
+        self.gateway.create_many(account_id, [user_id, other_user_id])
+        self.gateway.delete(account_id=account_id, user_id=user_id)
+        self.gateway.delete(account_id=account_id, user_id=user_id)
+
+        self.assertEqual(2, self.users_gateway.find_membership_version(user_id))
+        self.assertEqual(1, self.users_gateway.find_membership_version(other_user_id))
+
+
+class TestAsyncMembershipsGateway(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.db = test_db_template()
+        self.db.clear()
+
+        self.gateway = AsyncMembershipsGateway(async_test_db_template())
+
+    async def test_create(self) -> None:
+        user_id = self.db.user("test@example.com")
+        account_id = self.db.account("Some account")
+
+        membership_id = await self.gateway.create(
+            account_id=account_id, user_id=user_id, owner=True
+        )
+
+        self.assertEqual(
+            [
+                {
+                    "id": membership_id,
+                    "account_id": account_id,
+                    "user_id": user_id,
+                    "owner": True,
+                }
+            ],
+            self.db.query_to_dict(
+                "select id, account_id, user_id, owner from memberships"
+            ),
+        )
+
+    async def test_create_many(self) -> None:
+        account_id = self.db.account("Some account")
+        user_ids = [self.db.user(f"user{index}@example.com") for index in range(2)]
+
+        memberships = await self.gateway.create_many(account_id, user_ids)
+
+        self.assertCountEqual(
+            user_ids, [membership.user_id for membership in memberships]
+        )
+        self.assertEqual(
+            [
+                MembershipRecord(
+                    id=membership.id,
+                    account_id=account_id,
+                    user_id=membership.user_id,
+                    owner=False,
+                )
+                for membership in memberships
+            ],
+            memberships,
+        )
+
+    async def test_delete(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+
+        await self.gateway.delete(account_id=account_id, user_id=user_id)
+
+        self.assertEqual([], self.db.query_to_dict("select id from memberships"))
@@ -0,0 +1,186 @@
+import json
+from typing import Any, Dict
+from unittest import TestCase
+from uuid import UUID
+
+from accounts.accounts_gateway import (
+    AccountsGateway,
+    AccountRecordWithOwnership,
+    AccountRecord,
+)
+from accounts.authorization_cache import AuthorizationCache, InMemoryCacheBackend
+from accounts.memberships_gateway import MembershipsGateway
+from accounts.session_authorization import SessionAuthorization
+from accounts.users_gateway import UsersGateway
+from test_support.db_template import test_db_template
+
+
+class TestSessionAuthorization(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.db = test_db_template()
+        self.db.clear()
+
+        self.cache = AuthorizationCache(InMemoryCacheBackend())
+        self.accounts_gateway = AccountsGateway(self.db)
+        self.users_gateway = UsersGateway(self.db)
+        self.memberships_gateway = MembershipsGateway(self.db, self.cache)
+        self.authorization = SessionAuthorization(
+            self.accounts_gateway, self.users_gateway, self.cache
+        )
+        self.session: Dict[str, Any] = {}
+
+    def test_find_for_user(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account", owner=False
+        )
+
+        member = self.authorization.find_for_user(self.session, account_id, user_id)
+        owner = self.authorization.find_for_owner(self.session, account_id, user_id)
+
+        self.assertEqual(
+            AccountRecordWithOwnership(id=account_id, name="Some account", owner=False),
+            member,
+        )
+        self.assertIsNone(owner)
+
+    def test_find_for_owner(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+
+        owner = self.authorization.find_for_owner(self.session, account_id, user_id)
+
+        self.assertEqual(AccountRecord(id=account_id, name="Some account"), owner)
+
+    def test_find_for_user_not_member(self) -> None:
+        user_id = self.db.user("test@example.com")
+        account_id = self.db.account("Some account")
+
+        self.assertIsNone(
+            self.authorization.find_for_user(self.session, account_id, user_id)
+        )
+        self.assertIsNone(
+            self.authorization.find_for_user(self.session, "not-a-uuid", user_id)  # type: ignore[arg-type]
+        )
+
+    def test_answers_from_session_snapshot(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+        self.authorization.refresh(self.session, user_id)
+
+        self.db.query("delete from memberships")
+
+        self.assertIsNotNone(
+            self.authorization.find_for_user(self.session, account_id, user_id)
+        )
+
+    def test_refreshes_when_membership_version_changes(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+        other_account_id = self.db.account("Other account")
+        self.authorization.refresh(self.session, user_id)
+
+        self.memberships_gateway.create(
+            account_id=other_account_id, user_id=user_id, owner=False
+        )
+        self.memberships_gateway.delete(account_id=account_id, user_id=user_id)
+
+        self.assertIsNone(
+            self.authorization.find_for_user(self.session, account_id, user_id)
+        )
+        self.assertIsNotNone(
+            self.authorization.find_for_user(self.session, other_account_id, user_id)
+        )
+
+    def test_refreshes_for_a_different_user(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+        other_user_id = self.db.user("other@example.com")
+        self.authorization.refresh(self.session, user_id)
+
+        self.assertIsNone(
+            self.authorization.find_for_user(self.session, account_id, other_user_id)
+        )
+
+    def test_falls_back_to_queries_beyond_max_accounts(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+        other_account_id = self.db.account("Other account")
+        self.db.membership(user_id=user_id, account_id=other_account_id)
+        authorization = SessionAuthorization(
+            self.accounts_gateway, self.users_gateway, self.cache, max_accounts=1
+        )
+
+        snapshot = authorization.refresh(self.session, user_id)
+
+        self.assertFalse(snapshot.complete)
+        self.assertEqual(1, len(snapshot.accounts))
+        self.assertIsNotNone(
+            authorization.find_for_user(self.session, account_id, user_id)
+        )
+        self.assertIsNotNone(
+            authorization.find_for_user(self.session, other_account_id, user_id)
+        )
+        self.assertIsNone(
+            authorization.find_for_user(
+                self.session, UUID("b49c77eb-83ce-4b3d-9c7e-42559bd10834"), user_id
+            )
+        )
+
+    def test_limits_snapshot_size(self) -> None:
+        user_id = self.db.user("test@example.com")
+        account_ids = [
+            self.db.account(f"{index:02} " + "a" * 57) for index in range(50)
+        ]
+        for account_id in account_ids:
+            self.db.membership(user_id=user_id, account_id=account_id)
+        authorization = SessionAuthorization(
+            self.accounts_gateway,
+            self.users_gateway,
+            self.cache,
+            max_snapshot_bytes=1000,
+        )
+
+        snapshot = authorization.refresh(self.session, user_id)
+
+        self.assertFalse(snapshot.complete)
+        self.assertLess(0, len(snapshot.accounts))
+        self.assertLess(
+            len(json.dumps(self.session["authorization"]["accounts"])), 1100
+        )
+        for account_id in account_ids:
+            self.assertIsNotNone(
+                authorization.find_for_user(self.session, account_id, user_id)
+            )
+
+    def test_ignores_malformed_session_snapshot(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+        self.session["authorization"] = {"version": "nonsense"}
+
+        self.assertIsNotNone(
+            self.authorization.find_for_user(self.session, account_id, user_id)
+        )
+
+    def test_version(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "Some account"
+        )
+        other_account_id = self.db.account("Other account")
+        before = self.authorization.version(user_id)
+
+        self.memberships_gateway.create(
+            account_id=other_account_id, user_id=user_id, owner=False
+        )
+
+        self.assertGreater(self.authorization.version(user_id), before)
+        self.assertEqual(
+            0,
+            self.authorization.version(UUID("b49c77eb-83ce-4b3d-9c7e-42559bd10834")),
+        )
@@ -1,7 +1,15 @@
-from unittest import TestCase
+from unittest import TestCase, IsolatedAsyncioTestCase
+from uuid import UUID
 
-from accounts.users_gateway import UsersGateway, UserRecord
-from test_support.db_template import test_db_template
+from sqlalchemy.exc import IntegrityError
+
+from accounts.users_gateway import (
+    UsersGateway,
+    UserRecord,
+    UserWithAccountRecord,
+    AsyncUsersGateway,
+)
+from test_support.db_template import test_db_template, async_test_db_template
 from test_support.unwrap_optional import unwrap
 
 
@@ -29,12 +37,247 @@ class TestUsersGateway(TestCase):
             result,
         )
 
+    def test_create_many(self) -> None:
+        users = self.gateway.create_many(
+            ["first@example.com", "second@example.com", "third@example.com"]
+        )
+
+        self.assertCountEqual(
+            ["first@example.com", "second@example.com", "third@example.com"],
+            [user.email for user in users],
+        )
+
+        result = self.db.query_to_dict("select id, email from users order by email")
+
+        self.assertEqual(
+            sorted(
+                [{"id": user.id, "email": user.email} for user in users],
+                key=lambda user: str(user["email"]),
+            ),
+            result,
+        )
+
+    def test_create_many_skips_existing_emails(self) -> None:
+        self.gateway.create("Existing@example.com")
+
+        users = self.gateway.create_many(["existing@example.com", "new@example.com"])
+
+        self.assertEqual(["new@example.com"], [user.email for user in users])
+        self.assertEqual(
+            [{"email": "Existing@example.com"}, {"email": "new@example.com"}],
+            self.db.query_to_dict("select email from users order by email"),
+        )
+
+    def test_create_many_empty(self) -> None:
+        self.assertEqual([], self.gateway.create_many([]))
+
     def test_find_by_email(self) -> None:
         user_id = unwrap(self, self.gateway.create("test@example.com")).id
 
         user = self.gateway.find_by_email("test@example.com")
         self.assertEqual(UserRecord(id=user_id, email="test@example.com"), user)
 
+    def test_find_by_emails(self) -> None:
+        users = self.gateway.create_many(["first@example.com", "second@example.com"])
+        self.gateway.create("third@example.com")
+
+        found = self.gateway.find_by_emails(
+            ["first@example.com", "second@example.com", "missing@example.com"]
+        )
+
+        self.assertCountEqual(users, found)
+
+    def test_find_for_account(self) -> None:
+        account_id = self.db.account("some account")
+        self.db.add_users(["first@example.com", "second@example.com"], account_id)
+        self.db.user("other@example.com")
+
+        users = self.gateway.find_for_account(account_id)
+
+        self.assertCountEqual(
+            ["first@example.com", "second@example.com"], [user.email for user in users]
+        )
+
+    def test_page_for_account(self) -> None:
+        account_id = self.db.account("some account")
+        emails = [f"user{index}@example.com" for index in range(5)]
+        self.db.add_users(emails, account_id)
+
+        first_page = self.gateway.page_for_account(account_id, limit=2)
+        second_page = self.gateway.page_for_account(
+            account_id, limit=2, after=first_page.next_cursor
+        )
+        last_page = self.gateway.page_for_account(
+            account_id, limit=2, after=second_page.next_cursor
+        )
+
+        self.assertEqual(2, len(first_page.items))
+        self.assertEqual(2, len(second_page.items))
+        self.assertEqual(1, len(last_page.items))
+        self.assertIsNone(last_page.next_cursor)
+        self.assertCountEqual(
+            emails,
+            [
+                user.email
+                for page in [first_page, second_page, last_page]
+                for user in page.items
+            ],
+        )
+
+    def test_find_for_account_iter(self) -> None:
+        account_id = self.db.account("some account")
+        emails = [f"user{index}@example.com" for index in range(5)]
+        self.db.add_users(emails, account_id)
+        self.db.user("other@example.com")
+
+        users = self.gateway.find_for_account_iter(account_id, yield_per=2)
+
+        self.assertCountEqual(emails, [user.email for user in users])
+
+    def test_find_by_email_ignores_case(self) -> None:
+        user_id = unwrap(self, self.gateway.create("Test@Example.com")).id
+
+        user = self.gateway.find_by_email("test@example.COM")
+        self.assertEqual(UserRecord(id=user_id, email="Test@Example.com"), user)
+
+    def test_create_duplicate_email(self) -> None:
+        self.gateway.create("test@example.com")
+
+        with self.assertRaises(IntegrityError):
+            self.gateway.create("TEST@example.com")
+
+    def test_create_or_find(self) -> None:
+        created = unwrap(self, self.gateway.create_or_find("test@example.com"))
+        found = unwrap(self, self.gateway.create_or_find("Test@example.com"))
+
+        self.assertEqual(UserRecord(id=created.id, email="test@example.com"), found)
+        self.assertEqual(1, len(self.db.query_to_dict("select id from users")))
+
+    def test_create_or_find_with_account_new_user(self) -> None:
+        record = unwrap(
+            self, self.gateway.create_or_find_with_account("test@example.com")
+        )
+
+        self.assertEqual("test@example.com", record.email)
+        self.assertIsNone(record.account_id)
+        self.assertIsNone(record.account_name)
+        self.assertEqual(
+            [{"id": record.id}],
+            self.db.query_to_dict("select id from users"),
+        )
+
+    def test_create_or_find_with_account_prefers_owned_account(self) -> None:
+        user_id = self.db.user("test@example.com")
+        self.db.membership(user_id=user_id, account_id=self.db.account("member of"))
+        owned_account_id = self.db.account("owned account")
+        self.db.query(
+            """insert into memberships (account_id, user_id, owner)
+            values (:account_id, :user_id, true)""",
+            account_id=owned_account_id,
+            user_id=user_id,
+        )
+
+        record = self.gateway.create_or_find_with_account("Test@example.com")
+
+        self.assertEqual(
+            UserWithAccountRecord(
+                id=user_id,
+                email="test@example.com",
+                account_id=owned_account_id,
+                account_name="owned account",
+            ),
+            record,
+        )
+
+    def test_find_membership_version(self) -> None:
+        user_id = self.db.user("test@example.com")
+
+        self.assertEqual(0, self.gateway.find_membership_version(user_id))
+        self.assertIsNone(
+            self.gateway.find_membership_version(
+                UUID("aaaa77eb-83ce-4b3d-9c7e-42559bd10834")
+            )
+        )
+
     def test_find_by_email_not_found(self) -> None:
         user = self.gateway.find_by_email("test@example.com")
         self.assertIsNone(user)
+
+
+class TestAsyncUsersGateway(IsolatedAsyncioTestCase):
+    async def asyncSetUp(self) -> None:
+        await super().asyncSetUp()
+        self.db = test_db_template()
+        self.db.clear()
+        self.async_db = async_test_db_template()
+
+        self.gateway = AsyncUsersGateway(self.async_db)
+
+    async def test_create(self) -> None:
+        user = unwrap(self, await self.gateway.create("test@example.com"))
+
+        self.assertEqual(
+            [{"id": user.id, "email": "test@example.com"}],
+            self.db.query_to_dict("select id, email from users"),
+        )
+
+    async def test_create_many(self) -> None:
+        users = await self.gateway.create_many(
+            ["first@example.com", "second@example.com"]
+        )
+
+        self.assertCountEqual(
+            ["first@example.com", "second@example.com"],
+            [user.email for user in users],
+        )
+
+    async def test_create_or_find_with_account(self) -> None:
+        user_id, account_id = self.db.account_with_user(
+            "test@example.com", "some account"
+        )
+
+        user = await self.gateway.create_or_find_with_account("Test@example.com")
+
+        self.assertEqual(
+            UserWithAccountRecord(
+                id=user_id,
+                email="test@example.com",
+                account_id=account_id,
+                account_name="some account",
+            ),
+            user,
+        )
+
+    async def test_find_by_emails(self) -> None:
+        user_id = self.db.user("test@example.com")
+        self.db.user("other@example.com")
+
+        users = await self.gateway.find_by_emails(["TEST@example.com"])
+
+        self.assertEqual([UserRecord(id=user_id, email="test@example.com")], users)
+
+    async def test_page_for_account(self) -> None:
+        account_id = self.db.account("some account")
+        emails = [f"user{index}@example.com" for index in range(3)]
+        self.db.add_users(emails, account_id)
+
+        first_page = await self.gateway.page_for_account(account_id, limit=2)
+        last_page = await self.gateway.page_for_account(
+            account_id, limit=2, after=first_page.next_cursor
+        )
+
+        self.assertIsNone(last_page.next_cursor)
+        self.assertCountEqual(
+            emails,
+            [user.email for page in [first_page, last_page] for user in page.items],
+        )
+
+    async def test_find_for_account_iter(self) -> None:
+        account_id = self.db.account("some account")
+        emails = [f"user{index}@example.com" for index in range(5)]
+        self.db.add_users(emails, account_id)
+        self.db.user("other@example.com")
+
+        users = self.gateway.find_for_account_iter(account_id, yield_per=2)
+
+        self.assertCountEqual(emails, [user.email async for user in users])
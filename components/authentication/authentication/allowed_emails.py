@@ -1,18 +1,148 @@
+import logging
+import os
+import threading
+import time
+from typing import Callable, Dict, FrozenSet, Iterable, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class DomainTrie:
+    def __init__(self, domains: Iterable[str] = ()) -> None:
+        self.__children: Dict[str, DomainTrie] = {}
+        self.__terminal = False
+        for domain in domains:
+            self.add(domain)
+
+    def add(self, domain: str) -> None:
+        node = self
+        for label in reversed(domain.split(".")):
+            node = node.__children.setdefault(label, DomainTrie())
+        node.__terminal = True
+
+    def includes_subdomain_of(self, domain: str) -> bool:
+        node = self
+        labels = domain.split(".")
+        for remaining in range(len(labels) - 1, 0, -1):
+            child = node.__children.get(labels[remaining])
+            if child is None:
+                return False
+            if child.__terminal:
+                return True
+            node = child
+
+        return False
+
+
+class Allowlist:
+    def __init__(
+        self,
+        domains: Iterable[str],
+        addresses: Iterable[str],
+        allow_all_when_empty: bool,
+    ) -> None:
+        patterns = [domain.strip() for domain in domains]
+        self.__addresses = normalize(addresses)
+        self.__domains = normalize(
+            pattern for pattern in patterns if not pattern.startswith("*.")
+        )
+        wildcard_domains = normalize(
+            pattern[2:] for pattern in patterns if pattern.startswith("*.")
+        )
+        self.__wildcard_domains = DomainTrie(wildcard_domains)
+        self.__allow_all = allow_all_when_empty and (
+            len(self.__addresses) + len(self.__domains) + len(wildcard_domains) == 0
+        )
+
+    @classmethod
+    def parse(cls, lines: Iterable[str]) -> "Allowlist":
+        entries = [
+            line.strip()
+            for line in lines
+            if line.strip() != "" and not line.strip().startswith("#")
+        ]
+        return cls(
+            domains=[entry for entry in entries if "@" not in entry],
+            addresses=[entry for entry in entries if "@" in entry],
+            allow_all_when_empty=False,
+        )
+
+    def include(self, email: str) -> bool:
+        if self.__allow_all:
+            return True
+
+        normalized = email.strip().lower()
+        if normalized in self.__addresses:
+            return True
+
+        domain = normalized.rpartition("@")[2]
+        return (
+            domain in self.__domains
+            or self.__wildcard_domains.includes_subdomain_of(domain)
+        )
+
+
+def normalize(entries: Iterable[str]) -> FrozenSet[str]:
+    return frozenset(entry.strip().lower() for entry in entries if entry.strip() != "")
+
+
 class AllowedEmails:
     def __init__(self, domains: str, addresses: str):
-        self.domains = [] if domains == "" else domains.split(",")
-        self.addresses = [] if addresses == "" else addresses.split(",")
+        self.__allowlist = Allowlist(
+            domains.split(","), addresses.split(","), allow_all_when_empty=True
+        )
+        self.__path: Optional[str] = None
+        self.__check_interval_seconds = 0.0
+        self.__clock: Callable[[], float] = time.monotonic
+        self.__checked_at = 0.0
+        self.__file_version: Optional[Tuple[float, int]] = None
+        self.__lock = threading.Lock()
+
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        check_interval_seconds: float = 5,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> "AllowedEmails":
+        allowed_emails = cls(domains="", addresses="")
+        allowed_emails.__path = path
+        allowed_emails.__check_interval_seconds = check_interval_seconds
+        allowed_emails.__clock = clock
+        allowed_emails.__load(path, clock())
+        return allowed_emails
 
     def include(self, email: str) -> bool:
-        if len(self.domains) == 0 and len(self.addresses) == 0:
-            return True
+        if self.__path is not None:
+            self.__reload_if_changed(self.__path)
 
-        for domain in self.domains:
-            if email.split("@")[-1] == domain:
-                return True
+        return self.__allowlist.include(email)
 
-        for address in self.addresses:
-            if address == email:
-                return True
+    def __reload_if_changed(self, path: str) -> None:
+        now = self.__clock()
+        if now - self.__checked_at < self.__check_interval_seconds:
+            return
+        if not self.__lock.acquire(blocking=False):
+            return
 
-        return False
+        try:
+            self.__checked_at = now
+            if self.__version(path) != self.__file_version:
+                self.__load(path, now)
+        except OSError:
+            logger.exception("unable to reload allowed emails from %s", path)
+        finally:
+            self.__lock.release()
+
+    def __load(self, path: str, now: float) -> None:
+        version = self.__version(path)
+        with open(path) as file:
+            self.__allowlist = Allowlist.parse(file.read().splitlines())
+
+        self.__file_version = version
+        self.__checked_at = now
+
+    @staticmethod
+    def __version(path: str) -> Tuple[float, int]:
+        stat = os.stat(path)
+        return stat.st_mtime, stat.st_size
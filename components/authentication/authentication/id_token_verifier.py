@@ -0,0 +1,109 @@
+import threading
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, cast
+
+import jwt
+import requests
+
+GOOGLE_JWKS_URL = "https://www.googleapis.com/oauth2/v3/certs"
+GOOGLE_ISSUERS = ["https://accounts.google.com", "accounts.google.com"]
+
+JwksFetcher = Callable[[], Dict[str, Any]]
+
+
+def http_jwks_fetcher(
+    session: requests.Session,
+    url: str = GOOGLE_JWKS_URL,
+    timeout: Tuple[float, float] = (3.05, 10),
+) -> JwksFetcher:
+    def fetch() -> Dict[str, Any]:
+        response = session.get(url, timeout=timeout)
+        response.raise_for_status()
+        return cast(Dict[str, Any], response.json())
+
+    return fetch
+
+
+class IdTokenVerifier:
+    def __init__(
+        self,
+        client_id: str,
+        fetch_jwks: JwksFetcher,
+        issuers: List[str] = GOOGLE_ISSUERS,
+        refresh_seconds: float = 3600,
+        min_refresh_seconds: float = 60,
+        leeway_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.__client_id = client_id
+        self.__fetch_jwks = fetch_jwks
+        self.__issuers = issuers
+        self.__refresh_seconds = refresh_seconds
+        self.__min_refresh_seconds = min_refresh_seconds
+        self.__leeway_seconds = leeway_seconds
+        self.__clock = clock
+        self.__keys: Dict[str, jwt.PyJWK] = {}
+        self.__fetched_at: Optional[float] = None
+        self.__attempted_at: Optional[float] = None
+        self.__lock = threading.Lock()
+
+    def email(self, id_token: str) -> Optional[str]:
+        try:
+            key_id = jwt.get_unverified_header(id_token).get("kid")
+        except jwt.PyJWTError:
+            return None
+
+        key = self.__key(key_id)
+        if key is None:
+            return None
+
+        try:
+            claims = jwt.decode(
+                id_token,
+                key,
+                algorithms=["RS256"],
+                audience=self.__client_id,
+                issuer=self.__issuers,
+                leeway=self.__leeway_seconds,
+                options={"require": ["exp", "iat", "aud", "iss"]},
+            )
+        except jwt.PyJWTError:
+            return None
+
+        if claims.get("email_verified") is not True:
+            return None
+
+        return cast(Optional[str], claims.get("email"))
+
+    def __key(self, key_id: Optional[str]) -> Optional[jwt.PyJWK]:
+        with self.__lock:
+            now = self.__clock()
+            if self.__should_refresh(key_id, now):
+                self.__refresh(now)
+
+            return None if key_id is None else self.__keys.get(key_id)
+
+    def __should_refresh(self, key_id: Optional[str], now: float) -> bool:
+        if (
+            self.__attempted_at is not None
+            and now - self.__attempted_at < self.__min_refresh_seconds
+        ):
+            return False
+
+        return (
+            self.__fetched_at is None
+            or now - self.__fetched_at >= self.__refresh_seconds
+            or key_id not in self.__keys
+        )
+
+    def __refresh(self, now: float) -> None:
+        self.__attempted_at = now
+        try:
+            key_set = jwt.PyJWKSet.from_dict(self.__fetch_jwks())
+        except (requests.RequestException, ValueError, jwt.PyJWTError):
+            return
+
+        self.__keys = {
+            key.key_id: key for key in key_set.keys if key.key_id is not None
+        }
+        self.__fetched_at = now
@@ -1,56 +1,239 @@
-from typing import cast, Optional
+import asyncio
+from typing import cast, Optional, Dict, Any
 from urllib.parse import urlencode
 
+import httpx
 import requests
+from requests.adapters import HTTPAdapter
+from urllib3 import Retry
+
+from authentication.id_token_verifier import IdTokenVerifier, http_jwks_fetcher
+
+AUTH_URL = "https://accounts.google.com/o/oauth2/auth"
+TOKEN_URL = "https://accounts.google.com/o/oauth2/token"
+USER_INFO_URL = "https://www.googleapis.com/oauth2/v3/userinfo"
 
 
 class OAuthClient:
-    def __init__(self, client_id: str, client_secret: str, host_url: str):
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        host_url: str,
+        connect_timeout_seconds: float = 3.05,
+        read_timeout_seconds: float = 10,
+        retries: int = 2,
+        pool_size: int = 10,
+        id_token_verifier: Optional[IdTokenVerifier] = None,
+    ):
         self.__client_id = client_id
         self.__client_secret = client_secret
         self.__host_url = host_url
+        self.__timeout = (connect_timeout_seconds, read_timeout_seconds)
+        self.__session = requests.Session()
+        self.__session.mount(
+            "https://",
+            HTTPAdapter(
+                pool_connections=2,
+                pool_maxsize=pool_size,
+                max_retries=Retry(
+                    total=retries,
+                    backoff_factor=0.1,
+                    status_forcelist=[502, 503, 504],
+                    raise_on_status=False,
+                ),
+            ),
+        )
+        self.__id_token_verifier = id_token_verifier or IdTokenVerifier(
+            client_id, http_jwks_fetcher(self.__session, timeout=self.__timeout)
+        )
 
     def auth_url(self, state: str) -> str:
-        query_string = urlencode(
-            {
-                "client_id": self.__client_id,
-                "redirect_uri": f"{self.__host_url}/oauth/callback",
-                "response_type": "code",
-                "scope": "email",
-                "state": state,
-            }
-        )
-        return f"https://accounts.google.com/o/oauth2/auth?{query_string}"
+        return auth_url(self.__client_id, self.__host_url, state)
+
+    def fetch_email(self, code: str) -> Optional[str]:
+        tokens = self.__fetch_tokens(code)
+        if tokens is None:
+            return None
+
+        id_token = tokens.get("id_token")
+        if id_token is not None:
+            return self.__id_token_verifier.email(id_token)
+
+        access_token = tokens.get("access_token")
+        if access_token is None:
+            return None
+
+        return self.read_email_from_token(access_token)
 
     def fetch_access_token(self, code: str) -> Optional[str]:
-        response = requests.post(
-            "https://accounts.google.com/o/oauth2/token",
-            data={
-                "client_id": self.__client_id,
-                "client_secret": self.__client_secret,
-                "code": code,
-                "grant_type": "authorization_code",
-                "redirect_uri": f"{self.__host_url}/oauth/callback",
-            },
-            headers={"Accept": "application/json"},
-        )
+        tokens = self.__fetch_tokens(code)
+        if tokens is None:
+            return None
+
+        return cast(str, tokens.get("access_token"))
+
+    def read_email_from_token(self, token: str) -> Optional[str]:
+        try:
+            response = self.__session.get(
+                USER_INFO_URL,
+                headers=user_info_headers(token),
+                timeout=self.__timeout,
+            )
+        except requests.RequestException:
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        return cast(Optional[str], response.json().get("email", None))
+
+    def close(self) -> None:
+        self.__session.close()
+
+    def __fetch_tokens(self, code: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = self.__session.post(
+                TOKEN_URL,
+                data=token_request(
+                    self.__client_id, self.__client_secret, self.__host_url, code
+                ),
+                headers={"Accept": "application/json"},
+                timeout=self.__timeout,
+            )
+        except requests.RequestException:
+            return None
 
         if response.status_code != 200:
             return None
 
-        return cast(str, response.json().get("access_token"))
+        return cast(Dict[str, Any], response.json())
+
 
-    @staticmethod
-    def read_email_from_token(token: str) -> Optional[str]:
-        response = requests.get(
-            "https://www.googleapis.com/oauth2/v3/userinfo",
-            headers={
-                "Authorization": f"Bearer {token}",
-                "Accept": "application/json",
-            },
+class AsyncOAuthClient:
+    def __init__(
+        self,
+        client_id: str,
+        client_secret: str,
+        host_url: str,
+        connect_timeout_seconds: float = 3.05,
+        read_timeout_seconds: float = 10,
+        retries: int = 2,
+        pool_size: int = 10,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+        id_token_verifier: Optional[IdTokenVerifier] = None,
+    ):
+        self.__client_id = client_id
+        self.__client_secret = client_secret
+        self.__host_url = host_url
+        self.__jwks_session = requests.Session()
+        self.__id_token_verifier = id_token_verifier or IdTokenVerifier(
+            client_id,
+            http_jwks_fetcher(
+                self.__jwks_session,
+                timeout=(connect_timeout_seconds, read_timeout_seconds),
+            ),
         )
+        self.__client = httpx.AsyncClient(
+            timeout=httpx.Timeout(
+                read_timeout_seconds, connect=connect_timeout_seconds
+            ),
+            transport=transport
+            or httpx.AsyncHTTPTransport(
+                retries=retries,
+                limits=httpx.Limits(
+                    max_connections=pool_size, max_keepalive_connections=pool_size
+                ),
+            ),
+        )
+
+    def auth_url(self, state: str) -> str:
+        return auth_url(self.__client_id, self.__host_url, state)
+
+    async def fetch_email(self, code: str) -> Optional[str]:
+        tokens = await self.__fetch_tokens(code)
+        if tokens is None:
+            return None
+
+        id_token = tokens.get("id_token")
+        if id_token is not None:
+            return await asyncio.to_thread(self.__id_token_verifier.email, id_token)
+
+        access_token = tokens.get("access_token")
+        if access_token is None:
+            return None
+
+        return await self.read_email_from_token(access_token)
+
+    async def fetch_access_token(self, code: str) -> Optional[str]:
+        tokens = await self.__fetch_tokens(code)
+        if tokens is None:
+            return None
+
+        return cast(str, tokens.get("access_token"))
+
+    async def read_email_from_token(self, token: str) -> Optional[str]:
+        try:
+            response = await self.__client.get(
+                USER_INFO_URL, headers=user_info_headers(token)
+            )
+        except httpx.HTTPError:
+            return None
 
         if response.status_code != 200:
             return None
 
         return cast(Optional[str], response.json().get("email", None))
+
+    async def aclose(self) -> None:
+        await self.__client.aclose()
+        self.__jwks_session.close()
+
+    async def __fetch_tokens(self, code: str) -> Optional[Dict[str, Any]]:
+        try:
+            response = await self.__client.post(
+                TOKEN_URL,
+                data=token_request(
+                    self.__client_id, self.__client_secret, self.__host_url, code
+                ),
+                headers={"Accept": "application/json"},
+            )
+        except httpx.HTTPError:
+            return None
+
+        if response.status_code != 200:
+            return None
+
+        return cast(Dict[str, Any], response.json())
+
+
+def auth_url(client_id: str, host_url: str, state: str) -> str:
+    query_string = urlencode(
+        {
+            "client_id": client_id,
+            "redirect_uri": f"{host_url}/oauth/callback",
+            "response_type": "code",
+            "scope": "openid email",
+            "state": state,
+        }
+    )
+    return f"{AUTH_URL}?{query_string}"
+
+
+def token_request(
+    client_id: str, client_secret: str, host_url: str, code: str
+) -> Dict[str, Any]:
+    return {
+        "client_id": client_id,
+        "client_secret": client_secret,
+        "code": code,
+        "grant_type": "authorization_code",
+        "redirect_uri": f"{host_url}/oauth/callback",
+    }
+
+
+def user_info_headers(token: str) -> Dict[str, str]:
+    return {
+        "Authorization": f"Bearer {token}",
+        "Accept": "application/json",
+    }
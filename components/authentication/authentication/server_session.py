@@ -0,0 +1,273 @@
+import hashlib
+import logging
+import secrets
+import threading
+import time
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Callable, Dict, Optional, Protocol, Sequence, Tuple
+
+from flask import Flask, Request, Response
+from flask.json.tag import TaggedJSONSerializer
+from flask.sessions import SessionInterface, SessionMixin
+from werkzeug.datastructures import CallbackDict
+
+from database_support.database_template import DatabaseTemplate
+from database_support.result_mapping import map_one_result
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class StoredSession:
+    data: Dict[str, Any]
+    expires_in_seconds: float
+
+
+class SessionStore(Protocol):
+    def load(self, key: str) -> Optional[StoredSession]:
+        ...
+
+    def save(self, key: str, data: Dict[str, Any], lifetime_seconds: float) -> None:
+        ...
+
+    def delete(self, key: str) -> None:
+        ...
+
+    def delete_expired(self) -> int:
+        ...
+
+
+class InMemorySessionStore:
+    def __init__(self, clock: Callable[[], float] = time.monotonic) -> None:
+        self.__clock = clock
+        self.__sessions: Dict[str, Tuple[float, Dict[str, Any]]] = {}
+        self.__lock = threading.Lock()
+
+    def load(self, key: str) -> Optional[StoredSession]:
+        with self.__lock:
+            entry = self.__sessions.get(key)
+            if entry is None:
+                return None
+
+            expires_at, data = entry
+            expires_in_seconds = expires_at - self.__clock()
+            if expires_in_seconds <= 0:
+                return None
+
+            return StoredSession(dict(data), expires_in_seconds)
+
+    def save(self, key: str, data: Dict[str, Any], lifetime_seconds: float) -> None:
+        with self.__lock:
+            self.__sessions[key] = (self.__clock() + lifetime_seconds, dict(data))
+
+    def delete(self, key: str) -> None:
+        with self.__lock:
+            self.__sessions.pop(key, None)
+
+    def delete_expired(self) -> int:
+        with self.__lock:
+            now = self.__clock()
+            expired = [
+                key
+                for key, (expires_at, _) in self.__sessions.items()
+                if expires_at <= now
+            ]
+            for key in expired:
+                del self.__sessions[key]
+
+            return len(expired)
+
+
+class DatabaseSessionStore:
+    def __init__(self, db: DatabaseTemplate, sweep_batch_size: int = 1000) -> None:
+        self.__db = db
+        self.__sweep_batch_size = sweep_batch_size
+        self.__serializer = TaggedJSONSerializer()
+
+    def load(self, key: str) -> Optional[StoredSession]:
+        with self.__db.begin() as connection:
+            result = self.__db.query(
+                statement="""
+                select data, extract(epoch from expires_at - now()) as expires_in_seconds
+                from sessions where id = :id and expires_at > now()
+                """,
+                connection=connection,
+                id=key,
+            )
+
+        return map_one_result(
+            result,
+            lambda row: StoredSession(
+                data=self.__serializer.loads(row["data"]),
+                expires_in_seconds=float(row["expires_in_seconds"]),
+            ),
+        )
+
+    def save(self, key: str, data: Dict[str, Any], lifetime_seconds: float) -> None:
+        self.__db.query(
+            statement="""
+            insert into sessions (id, data, expires_at)
+                values (:id, :data, now() + make_interval(secs => :lifetime_seconds))
+            on conflict (id) do update
+                set data = excluded.data, expires_at = excluded.expires_at
+            """,
+            id=key,
+            data=self.__serializer.dumps(data),
+            lifetime_seconds=lifetime_seconds,
+        )
+
+    def delete(self, key: str) -> None:
+        self.__db.query("delete from sessions where id = :id", id=key)
+
+    def delete_expired(self) -> int:
+        deleted = 0
+        while True:
+            result = self.__db.query(
+                statement="""
+                delete from sessions where id in (
+                    select id from sessions where expires_at <= now()
+                    limit :batch_size
+                    for update skip locked
+                )
+                """,
+                batch_size=self.__sweep_batch_size,
+            )
+            deleted += result.rowcount
+            if result.rowcount < self.__sweep_batch_size:
+                return deleted
+
+
+class ServerSession(CallbackDict[str, Any], SessionMixin):
+    def __init__(
+        self,
+        session_id: Optional[str] = None,
+        initial: Optional[Dict[str, Any]] = None,
+        expires_in_seconds: float = 0,
+    ) -> None:
+        def on_update(_: CallbackDict[str, Any]) -> None:
+            self.modified = True
+
+        super().__init__(initial, on_update)
+        self.session_id = session_id
+        self.expires_in_seconds = expires_in_seconds
+        self.previous_session_id: Optional[str] = None
+        self.modified = False
+
+    def regenerate(self) -> None:
+        if self.session_id is not None:
+            self.previous_session_id = self.session_id
+        self.session_id = None
+        self.modified = True
+
+
+class ServerSessionInterface(SessionInterface):
+    def __init__(
+        self,
+        store: SessionStore,
+        lifetime_seconds: float,
+        skip_paths: Sequence[str] = (),
+    ) -> None:
+        self.__store = store
+        self.__lifetime_seconds = lifetime_seconds
+        self.__skip_paths = tuple(skip_paths)
+
+    def open_session(self, app: Flask, request: Request) -> ServerSession:
+        session_id = request.cookies.get(self.get_cookie_name(app))
+        if session_id is None or request.path.startswith(self.__skip_paths):
+            return ServerSession()
+
+        stored = self.__store.load(_key(session_id))
+        if stored is None:
+            return ServerSession()
+
+        return ServerSession(session_id, stored.data, stored.expires_in_seconds)
+
+    def save_session(
+        self, app: Flask, session: SessionMixin, response: Response
+    ) -> None:
+        if not isinstance(session, ServerSession):
+            return
+
+        if session.previous_session_id is not None:
+            self.__store.delete(_key(session.previous_session_id))
+
+        if len(session) == 0:
+            if session.session_id is not None and session.modified:
+                self.__store.delete(_key(session.session_id))
+                self.__delete_cookie(app, response)
+            elif session.previous_session_id is not None:
+                self.__delete_cookie(app, response)
+            return
+
+        if session.session_id is None:
+            session.session_id = secrets.token_urlsafe(32)
+        elif not session.modified and not self.__needs_refresh(session):
+            return
+
+        self.__store.save(
+            _key(session.session_id), dict(session), self.__lifetime_seconds
+        )
+        response.set_cookie(
+            self.get_cookie_name(app),
+            session.session_id,
+            expires=datetime.now(timezone.utc)
+            + timedelta(seconds=self.__lifetime_seconds),
+            httponly=self.get_cookie_httponly(app),
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add("Cookie")
+
+    def __needs_refresh(self, session: ServerSession) -> bool:
+        return session.expires_in_seconds < self.__lifetime_seconds / 2
+
+    def __delete_cookie(self, app: Flask, response: Response) -> None:
+        response.delete_cookie(
+            self.get_cookie_name(app),
+            domain=self.get_cookie_domain(app),
+            path=self.get_cookie_path(app),
+            secure=self.get_cookie_secure(app),
+            httponly=self.get_cookie_httponly(app),
+            samesite=self.get_cookie_samesite(app),
+        )
+        response.vary.add("Cookie")
+
+
+class SessionSweeper:
+    def __init__(self, store: SessionStore, interval_seconds: float) -> None:
+        self.__store = store
+        self.__interval_seconds = interval_seconds
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(
+            target=self.__run, name="session-sweeper", daemon=True
+        )
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__thread.join()
+
+    def sweep(self) -> int:
+        try:
+            return self.__store.delete_expired()
+        except Exception:
+            logger.exception("unable to delete expired sessions")
+            return 0
+
+    def __run(self) -> None:
+        while not self.__stopped.wait(self.__interval_seconds):
+            self.sweep()
+
+
+def regenerate_session(session: SessionMixin) -> None:
+    if isinstance(session, ServerSession):
+        session.regenerate()
+
+
+def _key(session_id: str) -> str:
+    return hashlib.sha256(session_id.encode()).hexdigest()
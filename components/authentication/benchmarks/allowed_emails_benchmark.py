@@ -0,0 +1,75 @@
+from authentication.allowed_emails import AllowedEmails
+from test_support.benchmark import benchmark, print_results
+
+DOMAINS = 50_000
+WILDCARD_DOMAINS = 20_000
+ADDRESSES = 30_000
+
+
+class LinearAllowedEmails:
+    def __init__(self, domains: str, addresses: str):
+        self.domains = [] if domains == "" else domains.split(",")
+        self.addresses = [] if addresses == "" else addresses.split(",")
+
+    def include(self, email: str) -> bool:
+        for domain in self.domains:
+            if email.split("@")[-1] == domain:
+                return True
+
+        for address in self.addresses:
+            if address == email:
+                return True
+
+        return False
+
+
+def main() -> None:
+    domains = [f"partner{index}.example.com" for index in range(DOMAINS)]
+    wildcard_domains = [
+        f"*.tenant{index}.example.org" for index in range(WILDCARD_DOMAINS)
+    ]
+    addresses = [f"user{index}@example.net" for index in range(ADDRESSES)]
+
+    allowed_emails = AllowedEmails(
+        ",".join(domains + wildcard_domains), ",".join(addresses)
+    )
+    linear = LinearAllowedEmails(",".join(domains), ",".join(addresses))
+
+    results = [
+        benchmark(
+            "construct 100k entries",
+            lambda: AllowedEmails(
+                ",".join(domains + wildcard_domains), ",".join(addresses)
+            ),
+            iterations=1,
+        ),
+        benchmark(
+            "domain hit", lambda: allowed_emails.include("a@partner49999.example.com")
+        ),
+        benchmark(
+            "wildcard hit",
+            lambda: allowed_emails.include("a@eu.tenant19999.example.org"),
+        ),
+        benchmark(
+            "address hit", lambda: allowed_emails.include("User29999@Example.net")
+        ),
+        benchmark("miss", lambda: allowed_emails.include("a@unknown.example.com")),
+        benchmark(
+            "linear scan address hit",
+            lambda: linear.include("user29999@example.net"),
+            iterations=20,
+            repeat=3,
+        ),
+        benchmark(
+            "linear scan miss",
+            lambda: linear.include("a@unknown.example.com"),
+            iterations=20,
+            repeat=3,
+        ),
+    ]
+
+    print_results(results)
+
+
+if __name__ == "__main__":
+    main()
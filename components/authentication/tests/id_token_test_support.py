@@ -0,0 +1,51 @@
+import json
+import time
+from typing import Any, Dict
+
+import jwt
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jwt.algorithms import RSAAlgorithm
+
+
+class SigningKey:
+    def __init__(self, key_id: str) -> None:
+        self.key_id = key_id
+        self.__private_key = rsa.generate_private_key(
+            public_exponent=65537, key_size=2048
+        )
+
+    def jwk(self) -> Dict[str, Any]:
+        jwk: Dict[str, Any] = json.loads(
+            RSAAlgorithm.to_jwk(self.__private_key.public_key())
+        )
+        jwk.update({"kid": self.key_id, "alg": "RS256", "use": "sig"})
+        return jwk
+
+    def id_token(self, **claims: Any) -> str:
+        now = int(time.time())
+        payload = {
+            "iss": "https://accounts.google.com",
+            "aud": "some_client_id",
+            "iat": now,
+            "exp": now + 3600,
+            "email": "test@example.com",
+            "email_verified": True,
+        }
+        payload.update(claims)
+
+        return jwt.encode(
+            payload,
+            self.__private_key,
+            algorithm="RS256",
+            headers={"kid": self.key_id},
+        )
+
+
+class StubJwksFetcher:
+    def __init__(self, *keys: SigningKey) -> None:
+        self.keys = list(keys)
+        self.calls = 0
+
+    def __call__(self) -> Dict[str, Any]:
+        self.calls += 1
+        return {"keys": [key.jwk() for key in self.keys]}
@@ -1,3 +1,6 @@
+import os
+import tempfile
+from typing import Optional
 from unittest import TestCase
 
 from authentication.allowed_emails import AllowedEmails
@@ -21,3 +24,90 @@ class TestAllowedEmails(TestCase):
                 "test@other.example.com"
             )
         )
+
+    def test_include_ignores_case(self) -> None:
+        allowed_emails = AllowedEmails("Example.com", "Someone@Other.com")
+
+        self.assertTrue(allowed_emails.include("TEST@example.COM"))
+        self.assertTrue(allowed_emails.include("someone@other.com"))
+        self.assertFalse(allowed_emails.include("someone.else@other.com"))
+
+    def test_include_wildcard_domain(self) -> None:
+        allowed_emails = AllowedEmails("*.example.com, partner.com", "")
+
+        self.assertTrue(allowed_emails.include("test@ok.example.com"))
+        self.assertTrue(allowed_emails.include("test@deep.ok.example.com"))
+        self.assertTrue(allowed_emails.include("test@partner.com"))
+        self.assertFalse(allowed_emails.include("test@example.com"))
+        self.assertFalse(allowed_emails.include("test@badexample.com"))
+        self.assertFalse(allowed_emails.include("test@sub.partner.com"))
+
+    def test_from_file(self) -> None:
+        path = self.__write(
+            "# partners\n", "*.example.com\n", "\n", "Someone@Other.com\n"
+        )
+
+        allowed_emails = AllowedEmails.from_file(path)
+
+        self.assertTrue(allowed_emails.include("test@ok.example.com"))
+        self.assertTrue(allowed_emails.include("someone@other.com"))
+        self.assertFalse(allowed_emails.include("test@other.com"))
+
+    def test_from_file_empty_allows_no_one(self) -> None:
+        allowed_emails = AllowedEmails.from_file(self.__write("# nobody yet\n"))
+
+        self.assertFalse(allowed_emails.include("test@example.com"))
+
+    def test_from_file_missing(self) -> None:
+        with self.assertRaises(FileNotFoundError):
+            AllowedEmails.from_file(os.path.join(self.__directory(), "missing.txt"))
+
+    def test_from_file_reloads_changes(self) -> None:
+        clock = FakeClock()
+        path = self.__write("example.com\n")
+        allowed_emails = AllowedEmails.from_file(
+            path, check_interval_seconds=5, clock=clock
+        )
+
+        self.__write("other.com\n", path=path)
+        os.utime(path, (0, 0))
+        still_cached = allowed_emails.include("test@other.com")
+        clock.now = 5
+        reloaded = allowed_emails.include("test@other.com")
+
+        self.assertFalse(still_cached)
+        self.assertTrue(reloaded)
+        self.assertFalse(allowed_emails.include("test@example.com"))
+
+    def test_from_file_keeps_list_when_file_is_removed(self) -> None:
+        clock = FakeClock()
+        path = self.__write("example.com\n")
+        allowed_emails = AllowedEmails.from_file(
+            path, check_interval_seconds=5, clock=clock
+        )
+
+        os.remove(path)
+        clock.now = 5
+
+        with self.assertLogs("authentication.allowed_emails"):
+            self.assertTrue(allowed_emails.include("test@example.com"))
+
+    def __directory(self) -> str:
+        directory = tempfile.TemporaryDirectory()
+        self.addCleanup(directory.cleanup)
+        return directory.name
+
+    def __write(self, *lines: str, path: Optional[str] = None) -> str:
+        if path is None:
+            path = os.path.join(self.__directory(), "allowed_emails.txt")
+        with open(path, "w") as file:
+            file.writelines(lines)
+        return path
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
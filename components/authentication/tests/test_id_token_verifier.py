@@ -0,0 +1,102 @@
+import time
+from typing import Any, Dict
+from unittest import TestCase
+
+from authentication.id_token_verifier import IdTokenVerifier
+from tests.id_token_test_support import SigningKey, StubJwksFetcher
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestIdTokenVerifier(TestCase):
+    first_key: SigningKey
+    second_key: SigningKey
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        super().setUpClass()
+        cls.first_key = SigningKey("first")
+        cls.second_key = SigningKey("second")
+
+    def setUp(self) -> None:
+        super().setUp()
+        self.fetcher = StubJwksFetcher(self.first_key)
+        self.clock = FakeClock()
+        self.verifier = IdTokenVerifier(
+            "some_client_id",
+            self.fetcher,
+            refresh_seconds=3600,
+            min_refresh_seconds=60,
+            clock=self.clock,
+        )
+
+    def test_email(self) -> None:
+        self.assertEqual(
+            "test@example.com", self.verifier.email(self.first_key.id_token())
+        )
+
+    def test_email_caches_keys(self) -> None:
+        self.verifier.email(self.first_key.id_token())
+        self.verifier.email(self.first_key.id_token())
+
+        self.assertEqual(1, self.fetcher.calls)
+
+    def test_email_refreshes_keys_periodically(self) -> None:
+        self.verifier.email(self.first_key.id_token())
+        self.clock.now = 3600
+        self.verifier.email(self.first_key.id_token())
+
+        self.assertEqual(2, self.fetcher.calls)
+
+    def test_email_refreshes_keys_for_unknown_key_id(self) -> None:
+        self.verifier.email(self.first_key.id_token())
+        self.fetcher.keys.append(self.second_key)
+
+        self.assertIsNone(self.verifier.email(self.second_key.id_token()))
+        self.clock.now = 60
+        self.assertEqual(
+            "test@example.com", self.verifier.email(self.second_key.id_token())
+        )
+        self.assertEqual(2, self.fetcher.calls)
+
+    def test_email_fetch_failure(self) -> None:
+        def failing_fetch() -> Dict[str, Any]:
+            raise ValueError("unavailable")
+
+        verifier = IdTokenVerifier("some_client_id", failing_fetch)
+
+        self.assertIsNone(verifier.email(self.first_key.id_token()))
+
+    def test_email_wrong_audience(self) -> None:
+        self.assertIsNone(
+            self.verifier.email(self.first_key.id_token(aud="other_client_id"))
+        )
+
+    def test_email_wrong_issuer(self) -> None:
+        self.assertIsNone(
+            self.verifier.email(self.first_key.id_token(iss="https://example.com"))
+        )
+
+    def test_email_expired(self) -> None:
+        self.assertIsNone(
+            self.verifier.email(self.first_key.id_token(exp=int(time.time()) - 60))
+        )
+
+    def test_email_not_verified(self) -> None:
+        self.assertIsNone(
+            self.verifier.email(self.first_key.id_token(email_verified=False))
+        )
+
+    def test_email_bad_signature(self) -> None:
+        forged = SigningKey("first").id_token()
+
+        self.assertIsNone(self.verifier.email(forged))
+
+    def test_email_malformed_token(self) -> None:
+        self.assertIsNone(self.verifier.email("not a token"))
@@ -1,8 +1,12 @@
-from unittest import TestCase
+from unittest import TestCase, IsolatedAsyncioTestCase
 
+import httpx
+import requests
 import responses
 
-from authentication.oauth_client import OAuthClient
+from authentication.id_token_verifier import IdTokenVerifier
+from authentication.oauth_client import OAuthClient, AsyncOAuthClient
+from tests.id_token_test_support import SigningKey, StubJwksFetcher
 
 
 class TestOAuthClient(TestCase):
@@ -12,7 +16,7 @@ class TestOAuthClient(TestCase):
         )
         auth_url = client.auth_url("some_state")
         self.assertEqual(
-            "https://accounts.google.com/o/oauth2/auth?client_id=some_client_id&redirect_uri=https%3A%2F%2Fexample.com%2Foauth%2Fcallback&response_type=code&scope=email&state=some_state",
+            "https://accounts.google.com/o/oauth2/auth?client_id=some_client_id&redirect_uri=https%3A%2F%2Fexample.com%2Foauth%2Fcallback&response_type=code&scope=openid+email&state=some_state",
             auth_url,
         )
 
@@ -36,6 +40,52 @@ class TestOAuthClient(TestCase):
             recorded_request.body,
         )
 
+    @responses.activate
+    def test_fetch_email_from_id_token(self) -> None:
+        key = SigningKey("some_key")
+        client = OAuthClient(
+            "some_client_id",
+            "some_client_secret",
+            "https://example.com",
+            id_token_verifier=IdTokenVerifier("some_client_id", StubJwksFetcher(key)),
+        )
+        responses.post(
+            "https://accounts.google.com/o/oauth2/token",
+            json={"access_token": "some_access_token", "id_token": key.id_token()},
+        )
+
+        email = client.fetch_email("some_code")
+
+        self.assertEqual("test@example.com", email)
+        self.assertEqual(1, len(responses.calls))
+
+    @responses.activate
+    def test_fetch_email_without_id_token(self) -> None:
+        client = OAuthClient(
+            "some_client_id", "some_client_secret", "https://example.com"
+        )
+        responses.post(
+            "https://accounts.google.com/o/oauth2/token",
+            json={"access_token": "some_access_token"},
+        )
+        responses.get(
+            "https://www.googleapis.com/oauth2/v3/userinfo",
+            json={"email": "test@example.com"},
+        )
+
+        email = client.fetch_email("some_code")
+
+        self.assertEqual("test@example.com", email)
+
+    @responses.activate
+    def test_fetch_email_bad_request(self) -> None:
+        client = OAuthClient(
+            "some_client_id", "some_client_secret", "https://example.com"
+        )
+        responses.post("https://accounts.google.com/o/oauth2/token", status=400)
+
+        self.assertIsNone(client.fetch_email("some_code"))
+
     @responses.activate
     def test_fetch_access_token_bad_request(self) -> None:
         client = OAuthClient(
@@ -47,14 +97,31 @@ class TestOAuthClient(TestCase):
 
         self.assertIsNone(access_token)
 
+    @responses.activate
+    def test_fetch_access_token_timeout(self) -> None:
+        client = OAuthClient(
+            "some_client_id", "some_client_secret", "https://example.com"
+        )
+        responses.post(
+            "https://accounts.google.com/o/oauth2/token",
+            body=requests.exceptions.ConnectTimeout(),
+        )
+
+        access_token = client.fetch_access_token("some_code")
+
+        self.assertIsNone(access_token)
+
     @responses.activate
     def test_read_email_from_token(self) -> None:
+        client = OAuthClient(
+            "some_client_id", "some_client_secret", "https://example.com"
+        )
         user_info_endpoint = responses.get(
             "https://www.googleapis.com/oauth2/v3/userinfo",
             json={"email": "test@example.com"},
         )
 
-        email = OAuthClient.read_email_from_token("some_token")
+        email = client.read_email_from_token("some_token")
 
         self.assertEqual("test@example.com", email)
         self.assertEqual(1, user_info_endpoint.call_count)
@@ -63,8 +130,101 @@ class TestOAuthClient(TestCase):
 
     @responses.activate
     def test_read_email_from_token_bad_request(self) -> None:
+        client = OAuthClient(
+            "some_client_id", "some_client_secret", "https://example.com"
+        )
         responses.get("https://www.googleapis.com/oauth2/v3/userinfo", status=400)
 
-        email = OAuthClient.read_email_from_token("some_token")
+        email = client.read_email_from_token("some_token")
 
         self.assertIsNone(email)
+
+
+class TestAsyncOAuthClient(IsolatedAsyncioTestCase):
+    async def test_fetch_access_token(self) -> None:
+        requests_made = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_made.append(request)
+            return httpx.Response(200, json={"access_token": "some_access_token"})
+
+        client = AsyncOAuthClient(
+            "some_client_id",
+            "some_client_secret",
+            "https://example.com",
+            transport=httpx.MockTransport(handler),
+        )
+
+        access_token = await client.fetch_access_token("some_code")
+        await client.aclose()
+
+        self.assertEqual("some_access_token", access_token)
+        self.assertEqual(
+            "https://accounts.google.com/o/oauth2/token", str(requests_made[0].url)
+        )
+        self.assertEqual(
+            b"client_id=some_client_id&client_secret=some_client_secret&code=some_code&grant_type=authorization_code&redirect_uri=https%3A%2F%2Fexample.com%2Foauth%2Fcallback",
+            requests_made[0].content,
+        )
+
+    async def test_fetch_email_from_id_token(self) -> None:
+        key = SigningKey("some_key")
+        client = AsyncOAuthClient(
+            "some_client_id",
+            "some_client_secret",
+            "https://example.com",
+            transport=httpx.MockTransport(
+                lambda request: httpx.Response(
+                    200,
+                    json={
+                        "access_token": "some_access_token",
+                        "id_token": key.id_token(),
+                    },
+                )
+            ),
+            id_token_verifier=IdTokenVerifier("some_client_id", StubJwksFetcher(key)),
+        )
+
+        self.assertEqual("test@example.com", await client.fetch_email("some_code"))
+
+    async def test_fetch_access_token_timeout(self) -> None:
+        def handler(request: httpx.Request) -> httpx.Response:
+            raise httpx.ConnectTimeout("timed out", request=request)
+
+        client = AsyncOAuthClient(
+            "some_client_id",
+            "some_client_secret",
+            "https://example.com",
+            transport=httpx.MockTransport(handler),
+        )
+
+        self.assertIsNone(await client.fetch_access_token("some_code"))
+
+    async def test_read_email_from_token(self) -> None:
+        requests_made = []
+
+        def handler(request: httpx.Request) -> httpx.Response:
+            requests_made.append(request)
+            return httpx.Response(200, json={"email": "test@example.com"})
+
+        client = AsyncOAuthClient(
+            "some_client_id",
+            "some_client_secret",
+            "https://example.com",
+            transport=httpx.MockTransport(handler),
+        )
+
+        email = await client.read_email_from_token("some_token")
+
+        self.assertEqual("test@example.com", email)
+        self.assertEqual("Bearer some_token", requests_made[0].headers["Authorization"])
+
+    async def test_read_email_from_token_bad_request(self) -> None:
+        client = AsyncOAuthClient(
+            "some_client_id",
+            "some_client_secret",
+            "https://example.com",
+            transport=httpx.MockTransport(lambda request: httpx.Response(400)),
+        )
+
+        self.assertIsNone(await client.read_email_from_token("some_token"))
@@ -0,0 +1,273 @@
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional, cast
+from unittest import TestCase
+from uuid import UUID
+
+import sqlalchemy
+from flask import Flask, session
+from flask.testing import FlaskClient
+from sqlalchemy import event
+
+from authentication.server_session import (
+    DatabaseSessionStore,
+    InMemorySessionStore,
+    ServerSessionInterface,
+    SessionSweeper,
+    StoredSession,
+    regenerate_session,
+)
+from database_support.database_template import DatabaseTemplate
+from test_support.db_template import test_db_template
+from test_support.unwrap_optional import unwrap
+
+USER_ID = UUID("aaaa77eb-83ce-4b3d-9c7e-42559bd10834")
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestInMemorySessionStore(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = FakeClock()
+        self.store = InMemorySessionStore(clock=self.clock)
+
+    def test_save_and_load(self) -> None:
+        self.store.save("some_key", {"user_id": USER_ID}, lifetime_seconds=10)
+        self.clock.now = 4
+
+        self.assertEqual(
+            StoredSession({"user_id": USER_ID}, expires_in_seconds=6),
+            self.store.load("some_key"),
+        )
+        self.assertIsNone(self.store.load("other_key"))
+
+    def test_expires(self) -> None:
+        self.store.save("some_key", {"user_id": USER_ID}, lifetime_seconds=10)
+        self.store.save("other_key", {"user_id": USER_ID}, lifetime_seconds=20)
+        self.clock.now = 10
+
+        self.assertIsNone(self.store.load("some_key"))
+        self.assertEqual(1, self.store.delete_expired())
+        self.assertIsNotNone(self.store.load("other_key"))
+
+    def test_delete(self) -> None:
+        self.store.save("some_key", {"user_id": USER_ID}, lifetime_seconds=10)
+
+        self.store.delete("some_key")
+
+        self.assertIsNone(self.store.load("some_key"))
+
+
+class TestDatabaseSessionStore(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.db = test_db_template()
+        self.db.clear()
+        self.store = DatabaseSessionStore(self.db, sweep_batch_size=2)
+
+    def test_save_and_load(self) -> None:
+        self.store.save("some_key", {"user_id": USER_ID}, lifetime_seconds=60)
+        self.store.save(
+            "some_key", {"user_id": USER_ID, "username": "a"}, lifetime_seconds=60
+        )
+
+        stored = unwrap(self, self.store.load("some_key"))
+
+        self.assertEqual({"user_id": USER_ID, "username": "a"}, stored.data)
+        self.assertAlmostEqual(60, stored.expires_in_seconds, delta=5)
+        self.assertIsNone(self.store.load("other_key"))
+
+    def test_expired_sessions(self) -> None:
+        for index in range(5):
+            self.store.save(f"expired_{index}", {}, lifetime_seconds=-1)
+        self.store.save("current", {}, lifetime_seconds=60)
+
+        self.assertIsNone(self.store.load("expired_0"))
+        self.assertEqual(5, self.store.delete_expired())
+        self.assertEqual(
+            ["current"],
+            [row["id"] for row in self.db.query_to_dict("select id from sessions")],
+        )
+
+    def test_delete(self) -> None:
+        self.store.save("some_key", {}, lifetime_seconds=60)
+
+        self.store.delete("some_key")
+
+        self.assertIsNone(self.store.load("some_key"))
+
+    def test_load_reads_primary_without_pinning_later_reads(self) -> None:
+        url = "postgresql://localhost:5432/starter_test?user=starter&password=starter"
+        primary = sqlalchemy.create_engine(url, pool_size=1)
+        replica = sqlalchemy.create_engine(url, pool_size=1)
+        db = DatabaseTemplate(primary, replicas=[replica])
+        self.store.save("some_key", {"user_id": USER_ID}, lifetime_seconds=60)
+        replica_statements: List[str] = []
+        event.listen(
+            replica,
+            "before_cursor_execute",
+            lambda *args: replica_statements.append(args[2]),
+        )
+
+        stored = DatabaseSessionStore(db).load("some_key")
+        db.query("select 1")
+
+        self.assertEqual({"user_id": USER_ID}, unwrap(self, stored).data)
+        self.assertEqual(["select 1"], replica_statements)
+        primary.dispose()
+        replica.dispose()
+
+
+class CountingSessionStore(InMemorySessionStore):
+    def __init__(self, clock: FakeClock) -> None:
+        super().__init__(clock=clock)
+        self.loads = 0
+
+    def load(self, key: str) -> Optional[StoredSession]:
+        self.loads += 1
+        return super().load(key)
+
+
+class TestServerSessionInterface(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.clock = FakeClock()
+        self.store = CountingSessionStore(clock=self.clock)
+        self.app = self.__app()
+        self.client = self.app.test_client()
+
+    def test_stores_session_on_server(self) -> None:
+        response = self.client.post("/login")
+        session_id = self.__session_id()
+
+        self.assertEqual(str(USER_ID), self.__user_id(self.client))
+        self.assertNotIn(str(USER_ID), response.headers["Set-Cookie"])
+        self.assertEqual(43, len(session_id))
+        self.assertIsNone(self.store.load(session_id))
+
+    def test_cookie_expires_with_the_stored_session(self) -> None:
+        response = self.client.post("/login")
+
+        cookie = unwrap(self, self.client.get_cookie("session"))
+        expires = unwrap(self, cookie.expires)
+        self.assertIn("Expires=", response.headers["Set-Cookie"])
+        self.assertAlmostEqual(
+            100, (expires - datetime.now(timezone.utc)).total_seconds(), delta=5
+        )
+
+    def test_does_not_load_session_for_skipped_paths(self) -> None:
+        self.client.post("/login")
+        loads = self.store.loads
+
+        response = self.client.get("/assets/app.css")
+
+        self.assertEqual(200, response.status_code)
+        self.assertNotIn("Set-Cookie", response.headers)
+        self.assertEqual(loads, self.store.loads)
+        self.assertEqual(str(USER_ID), self.__user_id(self.client))
+
+    def test_does_not_save_unmodified_session(self) -> None:
+        self.client.post("/login")
+
+        response = self.client.get("/user")
+
+        self.assertNotIn("Set-Cookie", response.headers)
+
+    def test_refreshes_expiry_after_half_the_lifetime(self) -> None:
+        self.client.post("/login")
+        self.clock.now = 51
+
+        response = self.client.get("/user")
+
+        self.assertIn("Set-Cookie", response.headers)
+        self.clock.now = 140
+        self.assertEqual(str(USER_ID), self.__user_id(self.client))
+
+    def test_regenerates_session_id_on_login(self) -> None:
+        self.client.post("/login")
+        first_session_id = self.__session_id()
+
+        self.client.post("/login")
+
+        self.assertNotEqual(first_session_id, self.__session_id())
+        self.assertIsNone(self.__user_id(self.__client_with(first_session_id)))
+        self.assertEqual(str(USER_ID), self.__user_id(self.client))
+
+    def test_clears_session(self) -> None:
+        self.client.post("/login")
+        session_id = self.__session_id()
+
+        response = self.client.post("/logout")
+
+        self.assertIn("session=;", response.headers["Set-Cookie"])
+        self.assertIsNone(self.__user_id(self.client))
+        self.assertIsNone(self.__user_id(self.__client_with(session_id)))
+
+    def test_expired_session(self) -> None:
+        self.client.post("/login")
+        self.clock.now = 100
+
+        self.assertIsNone(self.__user_id(self.client))
+
+    def __app(self) -> Flask:
+        app = Flask(__name__)
+        app.session_interface = ServerSessionInterface(
+            self.store, lifetime_seconds=100, skip_paths=["/assets/"]
+        )
+
+        @app.post("/login")
+        def login() -> Dict[str, Any]:
+            regenerate_session(session)
+            session["user_id"] = USER_ID
+            return {}
+
+        @app.post("/logout")
+        def logout() -> Dict[str, Any]:
+            session.clear()
+            return {}
+
+        @app.get("/assets/app.css")
+        def asset() -> str:
+            return ""
+
+        @app.get("/user")
+        def user() -> Dict[str, Any]:
+            return {"user_id": session.get("user_id")}
+
+        return app
+
+    def __client_with(self, session_id: str) -> FlaskClient:
+        client = self.app.test_client()
+        client.set_cookie("session", session_id)
+        return client
+
+    def __session_id(self) -> str:
+        cookie = self.client.get_cookie("session")
+        assert cookie is not None
+        return cookie.value
+
+    @staticmethod
+    def __user_id(client: FlaskClient) -> Optional[Any]:
+        return cast(Dict[str, Any], client.get("/user").json).get("user_id")
+
+
+class TestSessionSweeper(TestCase):
+    def test_sweep(self) -> None:
+        clock = FakeClock()
+        store = InMemorySessionStore(clock=clock)
+        store.save("some_key", {}, lifetime_seconds=1)
+        clock.now = 1
+
+        self.assertEqual(1, SessionSweeper(store, interval_seconds=60).sweep())
+
+    def test_start_and_stop(self) -> None:
+        sweeper = SessionSweeper(InMemorySessionStore(), interval_seconds=60)
+
+        sweeper.start()
+        sweeper.stop()
@@ -0,0 +1,131 @@
+import time
+from contextlib import _AsyncGeneratorContextManager, asynccontextmanager
+from typing import Optional, Any, Dict, List, Mapping, Sequence, AsyncIterator
+
+import sqlalchemy
+from sqlalchemy import CursorResult, Row
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncConnection
+
+from database_support.database_template import batch_inserts
+from database_support.pool_metrics import PoolMetrics, PoolStats
+from database_support.statement_cache import StatementCache, StatementCacheInfo
+
+
+class AsyncDatabaseTemplate:
+    def __init__(self, engine: AsyncEngine, statement_cache_size: int = 128) -> None:
+        self.__engine = engine
+        self.__statements = StatementCache(statement_cache_size)
+        self.__pool_metrics = PoolMetrics()
+
+    def begin(self) -> _AsyncGeneratorContextManager[AsyncConnection]:
+        return self.__begin()
+
+    async def query(
+        self,
+        statement: str,
+        connection: Optional[AsyncConnection] = None,
+        **kwargs: Any,
+    ) -> CursorResult[None]:
+        if connection is None:
+            async with self.begin() as connection:
+                return await self.__execute(connection, statement, kwargs)
+
+        else:
+            return await self.__execute(connection, statement, kwargs)
+
+    async def stream(
+        self,
+        statement: str,
+        connection: Optional[AsyncConnection] = None,
+        yield_per: int = 1000,
+        **kwargs: Any,
+    ) -> AsyncIterator[Row[Any]]:
+        if connection is None:
+            async with self.begin() as connection:
+                async for row in self.__stream(
+                    connection, statement, yield_per, kwargs
+                ):
+                    yield row
+
+        else:
+            async for row in self.__stream(connection, statement, yield_per, kwargs):
+                yield row
+
+    async def insert_many(
+        self,
+        statement: str,
+        values: Sequence[Mapping[str, Any]],
+        connection: Optional[AsyncConnection] = None,
+        batch_size: int = 1000,
+    ) -> List[Row[Any]]:
+        if len(values) == 0:
+            return []
+
+        if connection is None:
+            async with self.begin() as connection:
+                return await self.__insert_batches(
+                    connection, statement, values, batch_size
+                )
+
+        else:
+            return await self.__insert_batches(
+                connection, statement, values, batch_size
+            )
+
+    def statement_cache_info(self) -> StatementCacheInfo:
+        return self.__statements.info()
+
+    def pool_stats(self) -> PoolStats:
+        return self.__pool_metrics.stats(self.__engine.pool)
+
+    async def dispose(self) -> None:
+        await self.__engine.dispose()
+
+    @asynccontextmanager
+    async def __begin(self) -> AsyncIterator[AsyncConnection]:
+        started = time.perf_counter()
+        async with self.__engine.connect() as connection:
+            self.__pool_metrics.record_checkout(time.perf_counter() - started)
+            async with connection.begin():
+                yield connection
+
+    async def __execute(
+        self, connection: AsyncConnection, statement: str, parameters: Dict[str, Any]
+    ) -> CursorResult[None]:
+        return await connection.execute(self.__statements.text(statement), parameters)
+
+    async def __stream(
+        self,
+        connection: AsyncConnection,
+        statement: str,
+        yield_per: int,
+        parameters: Dict[str, Any],
+    ) -> AsyncIterator[Row[Any]]:
+        result = await connection.stream(
+            self.__statements.text(statement),
+            parameters,
+            execution_options={"yield_per": yield_per},
+        )
+        try:
+            async for row in result:
+                yield row
+        finally:
+            await result.close()
+
+    async def __insert_batches(
+        self,
+        connection: AsyncConnection,
+        statement: str,
+        values: Sequence[Mapping[str, Any]],
+        batch_size: int,
+    ) -> List[Row[Any]]:
+        rows: List[Row[Any]] = []
+
+        for batch_statement, parameters in batch_inserts(statement, values, batch_size):
+            result = await connection.execute(
+                sqlalchemy.text(batch_statement), parameters
+            )
+            if result.returns_rows:
+                rows.extend(result)
+
+        return rows
@@ -0,0 +1,117 @@
+import logging
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Optional
+
+from database_support.database_template import DatabaseTemplate
+from database_support.pool_metrics import PoolStats
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    status: str
+    checkout_seconds: Optional[float]
+    round_trip_seconds: Optional[float]
+    age_seconds: float
+    pool: PoolStats
+    error: Optional[str] = None
+
+
+class DatabaseProbe:
+    def __init__(
+        self,
+        db: DatabaseTemplate,
+        interval_seconds: float = 5,
+        max_checkout_seconds: float = 0.25,
+        max_round_trip_seconds: float = 0.25,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.__db = db
+        self.__interval_seconds = interval_seconds
+        self.__max_checkout_seconds = max_checkout_seconds
+        self.__max_round_trip_seconds = max_round_trip_seconds
+        self.__clock = clock
+        self.__checked_at: Optional[float] = None
+        self.__checkout_seconds: Optional[float] = None
+        self.__round_trip_seconds: Optional[float] = None
+        self.__error: Optional[str] = None
+        self.__lock = threading.Lock()
+        self.__stopped = threading.Event()
+        self.__thread = threading.Thread(
+            target=self.__run, name="database-probe", daemon=True
+        )
+
+    def start(self) -> None:
+        self.__thread.start()
+
+    def stop(self) -> None:
+        self.__stopped.set()
+        self.__thread.join()
+
+    def check(self) -> None:
+        checkout_seconds: Optional[float] = None
+        round_trip_seconds: Optional[float] = None
+        error: Optional[str] = None
+
+        started = time.perf_counter()
+        try:
+            with self.__db.begin() as connection:
+                acquired = time.perf_counter()
+                checkout_seconds = acquired - started
+                self.__db.query("select 1", connection=connection)
+                round_trip_seconds = time.perf_counter() - acquired
+        except Exception as e:
+            logger.exception("database probe failed")
+            error = type(e).__name__
+
+        with self.__lock:
+            self.__checked_at = self.__clock()
+            self.__checkout_seconds = checkout_seconds
+            self.__round_trip_seconds = round_trip_seconds
+            self.__error = error
+
+    def result(self) -> ProbeResult:
+        with self.__lock:
+            checked_at = self.__checked_at
+            checkout_seconds = self.__checkout_seconds
+            round_trip_seconds = self.__round_trip_seconds
+            error = self.__error
+
+        age_seconds = 0.0 if checked_at is None else self.__clock() - checked_at
+        return ProbeResult(
+            status=self.__status(
+                checked_at, checkout_seconds, round_trip_seconds, age_seconds, error
+            ),
+            checkout_seconds=checkout_seconds,
+            round_trip_seconds=round_trip_seconds,
+            age_seconds=age_seconds,
+            pool=self.__db.pool_stats(),
+            error=error,
+        )
+
+    def __status(
+        self,
+        checked_at: Optional[float],
+        checkout_seconds: Optional[float],
+        round_trip_seconds: Optional[float],
+        age_seconds: float,
+        error: Optional[str],
+    ) -> str:
+        if checked_at is None or error is not None:
+            return "DOWN"
+        if age_seconds > 3 * self.__interval_seconds:
+            return "DOWN"
+        if (checkout_seconds or 0.0) > self.__max_checkout_seconds:
+            return "DEGRADED"
+        if (round_trip_seconds or 0.0) > self.__max_round_trip_seconds:
+            return "DEGRADED"
+
+        return "UP"
+
+    def __run(self) -> None:
+        self.check()
+        while not self.__stopped.wait(self.__interval_seconds):
+            self.check()
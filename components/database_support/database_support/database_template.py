@@ -1,26 +1,265 @@
-from contextlib import _GeneratorContextManager
-from typing import Optional, Any, TypeVar
+import time
+from contextlib import _GeneratorContextManager, contextmanager
+from contextvars import ContextVar
+from typing import (
+    Optional,
+    Any,
+    TypeVar,
+    Dict,
+    List,
+    Mapping,
+    Sequence,
+    Iterator,
+    Generator,
+    Tuple,
+)
 
 import sqlalchemy
+from sqlalchemy import Engine, Connection, CursorResult, Row
+from sqlalchemy.exc import OperationalError
 
-from sqlalchemy import Engine, Connection, CursorResult
+from database_support.pool_metrics import PoolMetrics, PoolStats
+from database_support.replica_set import ReplicaSet
+from database_support.statement_cache import StatementCache, StatementCacheInfo
+from database_support.statement_events import (
+    StatementEvent,
+    StatementListener,
+    calling_method,
+)
 
 T = TypeVar("T")
 
+VALUES = "{values}"
+
 
 class DatabaseTemplate:
-    def __init__(self, engine: Engine) -> None:
+    def __init__(
+        self,
+        engine: Engine,
+        statement_cache_size: int = 128,
+        prepare_statements: bool = False,
+        replicas: Sequence[Engine] = (),
+        replica_retry_seconds: float = 30,
+        listeners: Sequence[StatementListener] = (),
+    ) -> None:
         self.__engine = engine
+        self.__statements = StatementCache(statement_cache_size)
+        self.__prepare_statements = prepare_statements
+        self.__pool_metrics = PoolMetrics()
+        self.__replicas = ReplicaSet(replicas, replica_retry_seconds)
+        self.__listeners = list(listeners)
+        self.__wrote: ContextVar[bool] = ContextVar(
+            f"database_template_wrote_{id(self)}", default=False
+        )
 
     def begin(self) -> _GeneratorContextManager[Connection]:
-        return self.__engine.begin()
+        return self.__begin(self.__engine)
+
+    def reset_read_your_writes(self) -> None:
+        self.__wrote.set(False)
 
     def query(
-        self, statement: str, connection: Optional[Connection] = None, **kwargs: Any
+        self,
+        statement: str,
+        connection: Optional[Connection] = None,
+        primary: bool = False,
+        **kwargs: Any,
     ) -> CursorResult[None]:
+        if connection is None:
+            with self.__read_connection(statement, primary) as connection:
+                return self.__execute(connection, statement, kwargs)
+
+        else:
+            return self.__execute(connection, statement, kwargs)
+
+    def stream(
+        self,
+        statement: str,
+        connection: Optional[Connection] = None,
+        yield_per: int = 1000,
+        **kwargs: Any,
+    ) -> Generator[Row[Any], None, None]:
+        caller = calling_method() if len(self.__listeners) > 0 else None
+        return self.__stream_rows(statement, connection, yield_per, kwargs, caller)
+
+    def insert_many(
+        self,
+        statement: str,
+        values: Sequence[Mapping[str, Any]],
+        connection: Optional[Connection] = None,
+        batch_size: int = 1000,
+    ) -> List[Row[Any]]:
+        if len(values) == 0:
+            return []
+
         if connection is None:
             with self.begin() as connection:
-                return connection.execute(sqlalchemy.text(statement), kwargs)
+                return self.__insert_batches(connection, statement, values, batch_size)
+
+        else:
+            return self.__insert_batches(connection, statement, values, batch_size)
+
+    def statement_cache_info(self) -> StatementCacheInfo:
+        return self.__statements.info()
+
+    def pool_stats(self) -> PoolStats:
+        return self.__pool_metrics.stats(self.__engine.pool)
+
+    def __stream_rows(
+        self,
+        statement: str,
+        connection: Optional[Connection],
+        yield_per: int,
+        parameters: Dict[str, Any],
+        caller: Optional[str],
+    ) -> Generator[Row[Any], None, None]:
+        if connection is None:
+            with self.__read_connection(statement, False) as connection:
+                yield from self.__stream(
+                    connection, statement, yield_per, parameters, caller
+                )
 
         else:
-            return connection.execute(sqlalchemy.text(statement), kwargs)
+            yield from self.__stream(
+                connection, statement, yield_per, parameters, caller
+            )
+
+    @contextmanager
+    def __begin(self, engine: Engine) -> Iterator[Connection]:
+        started = time.perf_counter()
+        with engine.connect() as connection:
+            if engine is self.__engine:
+                self.__pool_metrics.record_checkout(time.perf_counter() - started)
+            with connection.begin():
+                yield connection
+
+    @contextmanager
+    def __read_connection(self, statement: str, primary: bool) -> Iterator[Connection]:
+        replica = None if primary else self.__replica_for(statement)
+        if replica is not None:
+            try:
+                connection = replica.connect()
+            except OperationalError:
+                self.__replicas.mark_down(replica)
+            else:
+                with connection, connection.begin():
+                    yield connection
+                return
+
+        with self.begin() as connection:
+            yield connection
+
+    def __replica_for(self, statement: str) -> Optional[Engine]:
+        if len(self.__replicas) == 0 or self.__wrote.get():
+            return None
+        if not is_read(statement):
+            return None
+
+        return self.__replicas.next()
+
+    def __execute(
+        self, connection: Connection, statement: str, parameters: Dict[str, Any]
+    ) -> CursorResult[None]:
+        self.__record_write(statement)
+        started = time.perf_counter()
+        if self.__prepare_statements:
+            result = self.__statements.execute_prepared(
+                connection, statement, parameters
+            )
+        else:
+            result = connection.execute(self.__statements.text(statement), parameters)
+
+        if len(self.__listeners) > 0:
+            self.__notify(statement, time.perf_counter() - started, result.rowcount)
+        return result
+
+    def __stream(
+        self,
+        connection: Connection,
+        statement: str,
+        yield_per: int,
+        parameters: Dict[str, Any],
+        caller: Optional[str],
+    ) -> Iterator[Row[Any]]:
+        self.__record_write(statement)
+        started = time.perf_counter()
+        result = connection.execute(
+            self.__statements.text(statement),
+            parameters,
+            execution_options={"stream_results": True, "yield_per": yield_per},
+        )
+        row_count = 0
+        try:
+            for row in result:
+                row_count += 1
+                yield row
+        finally:
+            result.close()
+            if len(self.__listeners) > 0:
+                self.__notify(
+                    statement, time.perf_counter() - started, row_count, caller
+                )
+
+    def __insert_batches(
+        self,
+        connection: Connection,
+        statement: str,
+        values: Sequence[Mapping[str, Any]],
+        batch_size: int,
+    ) -> List[Row[Any]]:
+        rows: List[Row[Any]] = []
+        self.__wrote.set(True)
+
+        for batch_statement, parameters in batch_inserts(statement, values, batch_size):
+            started = time.perf_counter()
+            result = connection.execute(sqlalchemy.text(batch_statement), parameters)
+            if len(self.__listeners) > 0:
+                self.__notify(statement, time.perf_counter() - started, result.rowcount)
+            if result.returns_rows:
+                rows.extend(result)
+
+        return rows
+
+    def __record_write(self, statement: str) -> None:
+        if not is_read(statement):
+            self.__wrote.set(True)
+
+    def __notify(
+        self,
+        statement: str,
+        duration_seconds: float,
+        row_count: int,
+        caller: Optional[str] = None,
+    ) -> None:
+        event = StatementEvent(
+            statement=statement,
+            duration_seconds=duration_seconds,
+            row_count=row_count,
+            caller=calling_method() if caller is None else caller,
+        )
+        for listener in self.__listeners:
+            listener(event)
+
+
+def is_read(statement: str) -> bool:
+    return statement.lstrip().lower().startswith("select")
+
+
+def batch_inserts(
+    statement: str, values: Sequence[Mapping[str, Any]], batch_size: int
+) -> Iterator[Tuple[str, Dict[str, Any]]]:
+    columns = list(values[0].keys())
+
+    for start in range(0, len(values), batch_size):
+        batch = values[start : start + batch_size]
+        parameters: Dict[str, Any] = {}
+        tuples = []
+        for index, value in enumerate(batch):
+            tuples.append(
+                "(" + ", ".join(f":{column}_{index}" for column in columns) + ")"
+            )
+            parameters.update(
+                {f"{column}_{index}": value[column] for column in columns}
+            )
+
+        yield statement.replace(VALUES, ", ".join(tuples)), parameters
@@ -0,0 +1,54 @@
+import base64
+import binascii
+from dataclasses import dataclass
+from datetime import datetime
+from typing import TypeVar, Generic, List, Optional, Iterable, Any, Callable
+from uuid import UUID
+
+from sqlalchemy import Row, RowMapping
+
+T = TypeVar("T")
+
+
+@dataclass(frozen=True)
+class PageCursor:
+    created_at: datetime
+    id: UUID
+
+    def encode(self) -> str:
+        value = f"{self.created_at.isoformat()}|{self.id}"
+        return base64.urlsafe_b64encode(value.encode()).decode()
+
+    @classmethod
+    def decode(cls, value: Optional[str]) -> Optional["PageCursor"]:
+        if value is None or value == "":
+            return None
+
+        try:
+            created_at, id = base64.urlsafe_b64decode(value).decode().split("|")
+            return cls(created_at=datetime.fromisoformat(created_at), id=UUID(id))
+        except (binascii.Error, UnicodeDecodeError, ValueError):
+            return None
+
+
+@dataclass
+class Page(Generic[T]):
+    items: List[T]
+    next_cursor: Optional[PageCursor]
+
+
+def map_page(
+    result: Iterable[Row[Any]], limit: int, mapping: Callable[[RowMapping], T]
+) -> Page[T]:
+    rows = list(result)
+    items = [mapping(row._mapping) for row in rows[:limit]]
+    if len(rows) <= limit:
+        return Page(items=items, next_cursor=None)
+
+    last = rows[limit - 1]._mapping
+    return Page(
+        items=items,
+        next_cursor=PageCursor(
+            created_at=last["cursor_created_at"], id=last["cursor_id"]
+        ),
+    )
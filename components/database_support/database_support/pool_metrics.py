@@ -0,0 +1,56 @@
+import threading
+from dataclasses import dataclass
+
+from sqlalchemy import Pool, QueuePool
+
+
+@dataclass
+class PoolStats:
+    size: int
+    checked_out: int
+    checked_in: int
+    overflow: int
+    checkouts: int
+    checkout_wait_seconds_total: float
+    checkout_wait_seconds_max: float
+
+
+class PoolMetrics:
+    def __init__(self) -> None:
+        self.__lock = threading.Lock()
+        self.__checkouts = 0
+        self.__wait_total = 0.0
+        self.__wait_max = 0.0
+
+    def record_checkout(self, wait_seconds: float) -> None:
+        with self.__lock:
+            self.__checkouts += 1
+            self.__wait_total += wait_seconds
+            self.__wait_max = max(self.__wait_max, wait_seconds)
+
+    def stats(self, pool: Pool) -> PoolStats:
+        with self.__lock:
+            checkouts = self.__checkouts
+            wait_total = self.__wait_total
+            wait_max = self.__wait_max
+
+        if not isinstance(pool, QueuePool):
+            return PoolStats(
+                size=0,
+                checked_out=0,
+                checked_in=0,
+                overflow=0,
+                checkouts=checkouts,
+                checkout_wait_seconds_total=wait_total,
+                checkout_wait_seconds_max=wait_max,
+            )
+
+        return PoolStats(
+            size=pool.size(),
+            checked_out=pool.checkedout(),
+            checked_in=pool.checkedin(),
+            overflow=max(pool.overflow(), 0),
+            checkouts=checkouts,
+            checkout_wait_seconds_total=wait_total,
+            checkout_wait_seconds_max=wait_max,
+        )
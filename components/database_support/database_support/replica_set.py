@@ -0,0 +1,39 @@
+import threading
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from sqlalchemy import Engine
+
+
+class ReplicaSet:
+    def __init__(
+        self,
+        engines: Sequence[Engine],
+        retry_after_seconds: float = 30,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.__engines: List[Engine] = list(engines)
+        self.__retry_after_seconds = retry_after_seconds
+        self.__clock = clock
+        self.__down_until: Dict[int, float] = {}
+        self.__next = 0
+        self.__lock = threading.Lock()
+
+    def next(self) -> Optional[Engine]:
+        with self.__lock:
+            now = self.__clock()
+            for _ in range(len(self.__engines)):
+                index = self.__next
+                self.__next = (self.__next + 1) % len(self.__engines)
+                if self.__down_until.get(index, 0) <= now:
+                    return self.__engines[index]
+
+            return None
+
+    def mark_down(self, engine: Engine) -> None:
+        with self.__lock:
+            index = self.__engines.index(engine)
+            self.__down_until[index] = self.__clock() + self.__retry_after_seconds
+
+    def __len__(self) -> int:
+        return len(self.__engines)
@@ -1,6 +1,16 @@
-from typing import TypeVar, Callable, Optional, List
-
-from sqlalchemy import CursorResult, RowMapping
+from typing import (
+    TypeVar,
+    Callable,
+    Optional,
+    List,
+    Iterable,
+    Any,
+    Iterator,
+    AsyncIterable,
+    AsyncIterator,
+)
+
+from sqlalchemy import CursorResult, RowMapping, Row
 
 T = TypeVar("T")
 
@@ -19,6 +29,26 @@ def map_one_result(
 
 
 def map_results(
-    result: CursorResult[None], mapping: Callable[[RowMapping], T]
+    result: Iterable[Row[Any]], mapping: Callable[[RowMapping], T]
 ) -> List[T]:
     return [mapping(row._mapping) for row in result]
+
+
+def stream_results(
+    result: Iterable[Row[Any]], mapping: Callable[[RowMapping], T]
+) -> Iterator[T]:
+    for row in result:
+        yield mapping(row._mapping)
+
+
+async def map_results_async(
+    result: AsyncIterable[Row[Any]], mapping: Callable[[RowMapping], T]
+) -> List[T]:
+    return [mapping(row._mapping) async for row in result]
+
+
+async def stream_results_async(
+    result: AsyncIterable[Row[Any]], mapping: Callable[[RowMapping], T]
+) -> AsyncIterator[T]:
+    async for row in result:
+        yield mapping(row._mapping)
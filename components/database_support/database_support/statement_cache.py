@@ -0,0 +1,93 @@
+import itertools
+import re
+import threading
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import Any, Dict, List, Tuple
+
+import sqlalchemy
+from sqlalchemy import Connection, CursorResult, TextClause
+
+_bind_parameter = re.compile(r"%\((\w+)\)s")
+_prepared_names = itertools.count(1)
+
+
+@dataclass
+class StatementCacheInfo:
+    hits: int
+    misses: int
+    size: int
+    max_size: int
+    prepared_hits: int
+    prepared_misses: int
+
+
+class StatementCache:
+    def __init__(self, max_size: int = 128) -> None:
+        self.__max_size = max_size
+        self.__text = lru_cache(maxsize=max_size)(sqlalchemy.text)
+        self.__lock = threading.Lock()
+        self.__prepared_hits = 0
+        self.__prepared_misses = 0
+
+    def text(self, statement: str) -> TextClause:
+        return self.__text(statement)
+
+    def execute_prepared(
+        self, connection: Connection, statement: str, parameters: Dict[str, Any]
+    ) -> CursorResult[None]:
+        prepared: Dict[str, Tuple[str, List[str]]] = connection.info.setdefault(
+            "prepared_statements", {}
+        )
+
+        entry = prepared.get(statement)
+        if entry is None:
+            entry = self.__prepare(connection, statement)
+            prepared[statement] = entry
+            self.__count(hit=False)
+        else:
+            self.__count(hit=True)
+
+        name, parameter_names = entry
+        if len(parameter_names) == 0:
+            return connection.execute(self.text(f"execute {name}"))
+
+        arguments = ", ".join(f":{parameter}" for parameter in parameter_names)
+        return connection.execute(self.text(f"execute {name}({arguments})"), parameters)
+
+    def info(self) -> StatementCacheInfo:
+        text_info = self.__text.cache_info()
+        with self.__lock:
+            return StatementCacheInfo(
+                hits=text_info.hits,
+                misses=text_info.misses,
+                size=text_info.currsize,
+                max_size=self.__max_size,
+                prepared_hits=self.__prepared_hits,
+                prepared_misses=self.__prepared_misses,
+            )
+
+    def __prepare(
+        self, connection: Connection, statement: str
+    ) -> Tuple[str, List[str]]:
+        compiled = str(self.text(statement).compile(dialect=connection.dialect))
+        parameter_names: List[str] = []
+
+        def positional(match: re.Match[str]) -> str:
+            parameter = match.group(1)
+            if parameter not in parameter_names:
+                parameter_names.append(parameter)
+            return f"${parameter_names.index(parameter) + 1}"
+
+        sql = _bind_parameter.sub(positional, compiled)
+        name = f"template_statement_{next(_prepared_names)}"
+        connection.exec_driver_sql(f"prepare {name} as {sql}")
+
+        return name, parameter_names
+
+    def __count(self, hit: bool) -> None:
+        with self.__lock:
+            if hit:
+                self.__prepared_hits += 1
+            else:
+                self.__prepared_misses += 1
@@ -0,0 +1,38 @@
+import sys
+from dataclasses import dataclass
+from types import FrameType
+from typing import Callable, Optional
+
+IGNORED_MODULES = frozenset(
+    [
+        "contextlib",
+        "database_support.database_template",
+        "database_support.result_mapping",
+    ]
+)
+
+
+@dataclass(frozen=True)
+class StatementEvent:
+    statement: str
+    duration_seconds: float
+    row_count: int
+    caller: str
+
+
+StatementListener = Callable[[StatementEvent], None]
+
+
+def calling_method() -> str:
+    frame: Optional[FrameType] = sys._getframe(1)
+    while frame is not None and frame.f_globals.get("__name__") in IGNORED_MODULES:
+        frame = frame.f_back
+
+    if frame is None:
+        return "unknown"
+
+    owner = frame.f_locals.get("self")
+    if owner is None:
+        return f"{frame.f_globals.get('__name__')}.{frame.f_code.co_name}"
+
+    return f"{type(owner).__name__}.{frame.f_code.co_name}"
@@ -0,0 +1,91 @@
+from typing import List
+from unittest import TestCase
+
+import sqlalchemy
+
+from database_support.database_probe import DatabaseProbe
+from database_support.database_template import DatabaseTemplate
+from tests.test_database_template import TEST_DATABASE_URL
+
+
+class TestDatabaseProbe(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.engine = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        self.db = DatabaseTemplate(self.engine)
+        self.now: List[float] = [100.0]
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        super().tearDown()
+
+    def probe(self, db: DatabaseTemplate, **kwargs: float) -> DatabaseProbe:
+        return DatabaseProbe(
+            db, interval_seconds=5, clock=lambda: self.now[0], **kwargs
+        )
+
+    def test_down_before_first_check(self) -> None:
+        result = self.probe(self.db).result()
+
+        self.assertEqual("DOWN", result.status)
+        self.assertIsNone(result.round_trip_seconds)
+
+    def test_up(self) -> None:
+        probe = self.probe(self.db)
+
+        probe.check()
+        self.now[0] += 2
+        result = probe.result()
+
+        self.assertEqual("UP", result.status)
+        self.assertGreater(result.round_trip_seconds or 0, 0)
+        self.assertGreater(result.checkout_seconds or 0, 0)
+        self.assertEqual(2, result.age_seconds)
+        self.assertEqual(1, result.pool.checked_in)
+        self.assertIsNone(result.error)
+
+    def test_result_does_not_query(self) -> None:
+        probe = self.probe(self.db)
+        probe.check()
+        checkouts = self.db.pool_stats().checkouts
+
+        for _ in range(10):
+            probe.result()
+
+        self.assertEqual(checkouts, self.db.pool_stats().checkouts)
+
+    def test_degraded_when_slow(self) -> None:
+        probe = self.probe(self.db, max_round_trip_seconds=0)
+
+        probe.check()
+
+        self.assertEqual("DEGRADED", probe.result().status)
+
+    def test_down_when_stale(self) -> None:
+        probe = self.probe(self.db)
+
+        probe.check()
+        self.now[0] += 16
+
+        self.assertEqual("DOWN", probe.result().status)
+
+    def test_down_when_unreachable(self) -> None:
+        engine = sqlalchemy.create_engine(
+            "postgresql://localhost:1/starter_test?user=starter&password=starter"
+        )
+        probe = self.probe(DatabaseTemplate(engine))
+
+        with self.assertLogs("database_support.database_probe", "ERROR"):
+            probe.check()
+        result = probe.result()
+
+        self.assertEqual("DOWN", result.status)
+        self.assertEqual("OperationalError", result.error)
+
+    def test_start_and_stop(self) -> None:
+        probe = self.probe(self.db)
+
+        probe.start()
+        probe.stop()
+
+        self.assertEqual("UP", probe.result().status)
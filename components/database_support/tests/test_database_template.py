@@ -0,0 +1,356 @@
+from typing import cast, List, Any, Iterator
+from unittest import TestCase
+
+import sqlalchemy
+from sqlalchemy import QueuePool, Engine, Row, event
+
+from database_support.database_template import DatabaseTemplate
+from database_support.statement_events import StatementEvent
+from database_support.result_mapping import (
+    map_one_result,
+    map_results,
+    stream_results,
+)
+
+TEST_DATABASE_URL = (
+    "postgresql://localhost:5432/starter_test?user=starter&password=starter"
+)
+
+
+def record_statements(engine: Engine) -> List[str]:
+    statements: List[str] = []
+
+    def record(*args: Any) -> None:
+        statements.append(args[2])
+
+    event.listen(engine, "before_cursor_execute", record)
+    return statements
+
+
+class TestDatabaseTemplate(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.engine = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+
+    def tearDown(self) -> None:
+        self.engine.dispose()
+        super().tearDown()
+
+    def test_query(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        result = db.query("select :value as value", value=42)
+
+        self.assertEqual(42, map_one_result(result, lambda row: row["value"]))
+
+    def test_query_reuses_statements(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        db.query("select :value as value", value=1)
+        db.query("select :value as value", value=2)
+        db.query("select 1")
+
+        info = db.statement_cache_info()
+        self.assertEqual(1, info.hits)
+        self.assertEqual(2, info.misses)
+        self.assertEqual(2, info.size)
+
+    def test_query_evicts_least_recently_used_statements(self) -> None:
+        db = DatabaseTemplate(self.engine, statement_cache_size=1)
+
+        db.query("select 1")
+        db.query("select 2")
+        db.query("select 1")
+
+        info = db.statement_cache_info()
+        self.assertEqual(0, info.hits)
+        self.assertEqual(3, info.misses)
+        self.assertEqual(1, info.size)
+
+    def test_query_prepared(self) -> None:
+        db = DatabaseTemplate(self.engine, prepare_statements=True)
+
+        with db.begin() as connection:
+            first = db.query(
+                "select cast(:value as int) + :value as value, '%' as percent",
+                connection=connection,
+                value=1,
+            )
+            second = db.query(
+                "select cast(:value as int) + :value as value, '%' as percent",
+                connection=connection,
+                value=20,
+            )
+
+            self.assertEqual(
+                [{"value": 2, "percent": "%"}],
+                map_results(first, lambda row: dict(row)),
+            )
+            self.assertEqual(
+                [{"value": 40, "percent": "%"}],
+                map_results(second, lambda row: dict(row)),
+            )
+
+        info = db.statement_cache_info()
+        self.assertEqual(1, info.prepared_hits)
+        self.assertEqual(1, info.prepared_misses)
+
+    def test_query_prepared_is_per_connection(self) -> None:
+        db = DatabaseTemplate(self.engine, prepare_statements=True)
+
+        db.query("select 1")
+        db.query("select 1")
+        self.engine.dispose()
+        db.query("select 1")
+
+        info = db.statement_cache_info()
+        self.assertEqual(1, info.prepared_hits)
+        self.assertEqual(2, info.prepared_misses)
+
+    def test_stream(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        rows = db.stream(
+            "select value from generate_series(1, :count) value",
+            yield_per=2,
+            count=5,
+        )
+
+        self.assertEqual(
+            [1, 2, 3, 4, 5], list(stream_results(rows, lambda row: row["value"]))
+        )
+
+    def test_stream_releases_connection_when_closed(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        rows = db.stream("select value from generate_series(1, 10) value", yield_per=2)
+        next(rows)
+        rows.close()
+
+        self.assertEqual(0, cast(QueuePool, self.engine.pool).checkedout())
+
+    def test_listeners(self) -> None:
+        events: List[StatementEvent] = []
+        db = DatabaseTemplate(self.engine, listeners=[events.append])
+
+        db.query("select value from generate_series(1, 3) value")
+        list(db.stream("select value from generate_series(1, 5) value", yield_per=2))
+
+        self.assertEqual(
+            [
+                "select value from generate_series(1, 3) value",
+                "select value from generate_series(1, 5) value",
+            ],
+            [event.statement for event in events],
+        )
+        self.assertEqual([3, 5], [event.row_count for event in events])
+        self.assertEqual(
+            ["TestDatabaseTemplate.test_listeners"] * 2,
+            [event.caller for event in events],
+        )
+        self.assertGreater(events[0].duration_seconds, 0)
+
+    def test_stream_listeners_name_the_calling_method(self) -> None:
+        events: List[StatementEvent] = []
+        db = DatabaseTemplate(self.engine, listeners=[events.append])
+
+        def consume(rows: Iterator[Row[Any]]) -> None:
+            list(rows)
+
+        consume(db.stream("select value from generate_series(1, 3) value"))
+
+        self.assertEqual(
+            ["TestDatabaseTemplate.test_stream_listeners_name_the_calling_method"],
+            [event.caller for event in events],
+        )
+
+    def test_pool_stats(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        with db.begin():
+            during = db.pool_stats()
+        after = db.pool_stats()
+
+        self.assertEqual(1, during.size)
+        self.assertEqual(1, during.checked_out)
+        self.assertEqual(0, after.checked_out)
+        self.assertEqual(1, after.checked_in)
+        self.assertEqual(1, after.checkouts)
+        self.assertGreater(after.checkout_wait_seconds_total, 0)
+        self.assertEqual(
+            after.checkout_wait_seconds_total, after.checkout_wait_seconds_max
+        )
+
+    def test_pool_stats_overflow(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        with db.begin(), db.begin():
+            stats = db.pool_stats()
+
+        self.assertEqual(2, stats.checked_out)
+        self.assertEqual(1, stats.overflow)
+
+    def test_query_reads_from_replicas(self) -> None:
+        first = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        second = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        db = DatabaseTemplate(self.engine, replicas=[first, second])
+        primary_statements = record_statements(self.engine)
+        first_statements = record_statements(first)
+        second_statements = record_statements(second)
+
+        db.query("select 1")
+        db.query("select 2")
+        list(db.stream("select 3"))
+
+        self.assertEqual([], primary_statements)
+        self.assertEqual(["select 1", "select 3"], first_statements)
+        self.assertEqual(["select 2"], second_statements)
+
+    def test_query_reads_own_writes_from_primary(self) -> None:
+        replica = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        db = DatabaseTemplate(self.engine, replicas=[replica])
+        primary_statements = record_statements(self.engine)
+        replica_statements = record_statements(replica)
+
+        db.query("create temporary table items (id serial)")
+        db.query("select 1")
+        with db.begin() as connection:
+            db.query("select 2", connection=connection)
+        db.reset_read_your_writes()
+        db.query("select 3")
+
+        self.assertEqual(
+            ["create temporary table items (id serial)", "select 1", "select 2"],
+            primary_statements,
+        )
+        self.assertEqual(["select 3"], replica_statements)
+
+    def test_query_reads_from_primary_when_asked(self) -> None:
+        replica = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        db = DatabaseTemplate(self.engine, replicas=[replica])
+        primary_statements = record_statements(self.engine)
+        replica_statements = record_statements(replica)
+
+        db.query("select 1", primary=True)
+        db.query("select 2")
+
+        self.assertEqual(["select 1"], primary_statements)
+        self.assertEqual(["select 2"], replica_statements)
+
+    def test_read_only_transaction_does_not_pin_to_primary(self) -> None:
+        replica = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        db = DatabaseTemplate(self.engine, replicas=[replica])
+        primary_statements = record_statements(self.engine)
+        replica_statements = record_statements(replica)
+
+        with db.begin() as connection:
+            db.query("select 1", connection=connection)
+        db.query("select 2")
+
+        self.assertEqual(["select 1"], primary_statements)
+        self.assertEqual(["select 2"], replica_statements)
+
+    def test_write_in_transaction_pins_to_primary(self) -> None:
+        replica = sqlalchemy.create_engine(TEST_DATABASE_URL, pool_size=1)
+        db = DatabaseTemplate(self.engine, replicas=[replica])
+        primary_statements = record_statements(self.engine)
+        replica_statements = record_statements(replica)
+
+        with db.begin() as connection:
+            db.query("create temporary table items (id serial)", connection=connection)
+        db.query("select 1")
+
+        self.assertEqual(
+            ["create temporary table items (id serial)", "select 1"],
+            primary_statements,
+        )
+        self.assertEqual([], replica_statements)
+
+    def test_query_falls_back_to_primary(self) -> None:
+        unavailable = sqlalchemy.create_engine(
+            "postgresql://localhost:1/starter_test?user=starter&password=starter"
+        )
+        db = DatabaseTemplate(self.engine, replicas=[unavailable])
+
+        result = db.query("select 42 as value")
+
+        self.assertEqual(42, map_one_result(result, lambda row: row["value"]))
+        self.assertEqual(
+            [42],
+            list(
+                stream_results(
+                    db.stream("select 42 as value"), lambda row: row["value"]
+                )
+            ),
+        )
+
+    def test_insert_many(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        with db.begin() as connection:
+            db.query(
+                "create temporary table items (id serial, name varchar)",
+                connection=connection,
+            )
+
+            rows = db.insert_many(
+                "insert into items (name) values {values} returning id, name",
+                values=[{"name": f"item {index}"} for index in range(5)],
+                connection=connection,
+                batch_size=2,
+            )
+
+            self.assertCountEqual(
+                [f"item {index}" for index in range(5)], [row.name for row in rows]
+            )
+
+    def test_insert_many_with_literal_braces(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        with db.begin() as connection:
+            db.query(
+                "create temporary table items (name varchar, tags text[], data json)",
+                connection=connection,
+            )
+
+            rows = db.insert_many(
+                """insert into items (name, tags, data)
+                select name, '{}', '{"a": [1]}' from (values {values}) v(name)
+                returning name, tags, data""",
+                values=[{"name": "first"}, {"name": "second"}],
+                connection=connection,
+            )
+
+            self.assertCountEqual(
+                [("first", [], {"a": [1]}), ("second", [], {"a": [1]})],
+                [(row.name, row.tags, row.data) for row in rows],
+            )
+
+    def test_insert_many_listeners(self) -> None:
+        events: List[StatementEvent] = []
+        db = DatabaseTemplate(self.engine, listeners=[events.append])
+
+        with db.begin() as connection:
+            db.query(
+                "create temporary table items (id serial, name varchar)",
+                connection=connection,
+            )
+            rows = db.insert_many(
+                "insert into items (name) values {values}",
+                values=[{"name": f"item {index}"} for index in range(3)],
+                connection=connection,
+                batch_size=2,
+            )
+
+        self.assertEqual([], rows)
+        self.assertEqual([-1, 2, 1], [event.row_count for event in events])
+        self.assertEqual(
+            "insert into items (name) values {values}", events[-1].statement
+        )
+
+    def test_insert_many_empty(self) -> None:
+        db = DatabaseTemplate(self.engine)
+
+        self.assertEqual(
+            [], db.insert_many("insert into items (name) values {values}", values=[])
+        )
@@ -0,0 +1,21 @@
+from datetime import datetime
+from unittest import TestCase
+from uuid import UUID
+
+from database_support.pagination import PageCursor
+
+
+class TestPageCursor(TestCase):
+    def test_encode_decode(self) -> None:
+        cursor = PageCursor(
+            created_at=datetime(2023, 10, 18, 7, 1, 33, 536063),
+            id=UUID("aaaa77eb-83ce-4b3d-9c7e-42559bd10834"),
+        )
+
+        self.assertEqual(cursor, PageCursor.decode(cursor.encode()))
+
+    def test_decode_invalid(self) -> None:
+        self.assertIsNone(PageCursor.decode(None))
+        self.assertIsNone(PageCursor.decode(""))
+        self.assertIsNone(PageCursor.decode("not a cursor"))
+        self.assertIsNone(PageCursor.decode("bm90fGEgY3Vyc29y"))
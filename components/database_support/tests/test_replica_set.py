@@ -0,0 +1,52 @@
+from unittest import TestCase
+
+import sqlalchemy
+
+from database_support.replica_set import ReplicaSet
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class TestReplicaSet(TestCase):
+    def setUp(self) -> None:
+        super().setUp()
+        self.first = sqlalchemy.create_engine("postgresql://localhost/first")
+        self.second = sqlalchemy.create_engine("postgresql://localhost/second")
+        self.clock = FakeClock()
+        self.replicas = ReplicaSet(
+            [self.first, self.second], retry_after_seconds=10, clock=self.clock
+        )
+
+    def test_next_round_robin(self) -> None:
+        self.assertEqual(
+            [self.first, self.second, self.first],
+            [self.replicas.next() for _ in range(3)],
+        )
+
+    def test_next_skips_replicas_marked_down(self) -> None:
+        self.replicas.mark_down(self.first)
+
+        self.assertEqual(
+            [self.second, self.second], [self.replicas.next() for _ in range(2)]
+        )
+
+        self.clock.now = 10
+
+        self.assertEqual(
+            {self.first, self.second}, {self.replicas.next() for _ in range(2)}
+        )
+
+    def test_next_all_down(self) -> None:
+        self.replicas.mark_down(self.first)
+        self.replicas.mark_down(self.second)
+
+        self.assertIsNone(self.replicas.next())
+
+    def test_next_no_replicas(self) -> None:
+        self.assertIsNone(ReplicaSet([]).next())
@@ -0,0 +1,109 @@
+import json
+import os
+import timeit
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+CALIBRATION = "calibration"
+
+
+@dataclass
+class BenchmarkResult:
+    name: str
+    iterations: int
+    best_seconds: float
+
+    @property
+    def microseconds_per_call(self) -> float:
+        return self.best_seconds / self.iterations * 1_000_000
+
+
+@dataclass
+class Regression:
+    name: str
+    expected_microseconds: float
+    actual_microseconds: float
+
+    @property
+    def slowdown(self) -> float:
+        return self.actual_microseconds / self.expected_microseconds - 1
+
+
+def benchmark(
+    name: str, function: Callable[[], object], iterations: int = 10000, repeat: int = 5
+) -> BenchmarkResult:
+    timings = timeit.Timer(function).repeat(repeat=repeat, number=iterations)
+    return BenchmarkResult(name=name, iterations=iterations, best_seconds=min(timings))
+
+
+def calibrate() -> BenchmarkResult:
+    return benchmark(
+        CALIBRATION,
+        lambda: sorted(str(value) for value in range(1000)),
+        iterations=200,
+    )
+
+
+def print_results(
+    results: List[BenchmarkResult], baseline: Optional[Dict[str, float]] = None
+) -> None:
+    width = max(len(result.name) for result in results)
+    scale = machine_scale(results, baseline or {})
+    for result in results:
+        line = f"{result.name:<{width}}  {result.microseconds_per_call:>12.3f} µs/call"
+        expected = (baseline or {}).get(result.name)
+        if expected is not None and result.name != CALIBRATION:
+            change = result.microseconds_per_call / (expected * scale) - 1
+            line += f"  {change:+8.1%}"
+        print(line)
+
+
+def load_baseline(path: str) -> Optional[Dict[str, float]]:
+    try:
+        with open(path) as file:
+            baseline: Dict[str, float] = json.load(file)
+            return baseline
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path: str, results: List[BenchmarkResult]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {result.name: round(result.microseconds_per_call, 3) for result in results},
+            file,
+            indent=2,
+        )
+        file.write("\n")
+
+
+def regressions(
+    results: List[BenchmarkResult], baseline: Dict[str, float], threshold: float
+) -> List[Regression]:
+    scale = machine_scale(results, baseline)
+    found = []
+    for result in results:
+        expected = baseline.get(result.name)
+        if expected is None or result.name == CALIBRATION:
+            continue
+
+        regression = Regression(
+            name=result.name,
+            expected_microseconds=expected * scale,
+            actual_microseconds=result.microseconds_per_call,
+        )
+        if regression.slowdown > threshold:
+            found.append(regression)
+
+    return found
+
+
+def machine_scale(results: List[BenchmarkResult], baseline: Dict[str, float]) -> float:
+    calibration = next(
+        (result for result in results if result.name == CALIBRATION), None
+    )
+    if calibration is None or CALIBRATION not in baseline:
+        return 1.0
+
+    return calibration.microseconds_per_call / baseline[CALIBRATION]
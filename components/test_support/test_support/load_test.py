@@ -0,0 +1,137 @@
+import json
+import os
+import statistics
+import threading
+import time
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+RequestFunction = Callable[[int], bool]
+
+
+@dataclass
+class LoadTestResult:
+    name: str
+    concurrency: int
+    requests: int
+    errors: int
+    duration_seconds: float
+    latencies_seconds: List[float]
+
+    @property
+    def throughput(self) -> float:
+        return self.requests / self.duration_seconds if self.duration_seconds else 0.0
+
+    def percentile(self, percent: int) -> float:
+        if len(self.latencies_seconds) < 2:
+            return sum(self.latencies_seconds)
+
+        return statistics.quantiles(self.latencies_seconds, n=100)[percent - 1]
+
+    def summary(self) -> Dict[str, float]:
+        return {
+            "concurrency": self.concurrency,
+            "requests": self.requests,
+            "errors": self.errors,
+            "throughput": round(self.throughput, 3),
+            "p50_ms": round(self.percentile(50) * 1000, 3),
+            "p95_ms": round(self.percentile(95) * 1000, 3),
+            "p99_ms": round(self.percentile(99) * 1000, 3),
+        }
+
+
+def load_test(
+    name: str,
+    worker: Callable[[int], RequestFunction],
+    concurrency: int = 8,
+    requests_per_worker: int = 100,
+) -> LoadTestResult:
+    functions = [worker(index) for index in range(concurrency)]
+    latencies: List[List[float]] = [[] for _ in range(concurrency)]
+    errors = [0] * concurrency
+    barrier = threading.Barrier(concurrency + 1)
+
+    def run(index: int) -> None:
+        barrier.wait()
+        for request in range(requests_per_worker):
+            started = time.perf_counter()
+            try:
+                succeeded = functions[index](request)
+            except Exception:
+                succeeded = False
+            latencies[index].append(time.perf_counter() - started)
+            if not succeeded:
+                errors[index] += 1
+
+    threads = [
+        threading.Thread(target=run, args=(index,), name=f"load-test-{index}")
+        for index in range(concurrency)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    started = time.perf_counter()
+    for thread in threads:
+        thread.join()
+
+    return LoadTestResult(
+        name=name,
+        concurrency=concurrency,
+        requests=concurrency * requests_per_worker,
+        errors=sum(errors),
+        duration_seconds=time.perf_counter() - started,
+        latencies_seconds=[latency for worker in latencies for latency in worker],
+    )
+
+
+def print_load_results(
+    results: List[LoadTestResult],
+    baseline: Optional[Dict[str, Dict[str, float]]] = None,
+) -> None:
+    width = max(len(result.name) for result in results)
+    print(
+        f"{'':<{width}}  {'req/s':>10}  {'p50 ms':>10}  {'p95 ms':>10}"
+        f"  {'p99 ms':>10}  {'errors':>6}"
+    )
+    for result in results:
+        summary = result.summary()
+        print(
+            f"{result.name:<{width}}  {summary['throughput']:>10.1f}"
+            f"  {summary['p50_ms']:>10.2f}  {summary['p95_ms']:>10.2f}"
+            f"  {summary['p99_ms']:>10.2f}  {result.errors:>6}"
+        )
+        previous = (baseline or {}).get(result.name)
+        if previous is not None:
+            print(
+                f"{'':<{width}}  {change(summary, previous, 'throughput'):>10}"
+                f"  {change(summary, previous, 'p50_ms'):>10}"
+                f"  {change(summary, previous, 'p95_ms'):>10}"
+                f"  {change(summary, previous, 'p99_ms'):>10}"
+            )
+
+
+def change(summary: Dict[str, float], previous: Dict[str, float], key: str) -> str:
+    if previous.get(key, 0) == 0:
+        return "-"
+
+    return f"{(summary[key] - previous[key]) / previous[key] * 100:+.1f}%"
+
+
+def save_load_results(path: str, results: List[LoadTestResult]) -> None:
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as file:
+        json.dump(
+            {result.name: result.summary() for result in results},
+            file,
+            indent=2,
+            sort_keys=True,
+        )
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Dict[str, float]]]:
+    try:
+        with open(path) as file:
+            baseline: Dict[str, Dict[str, float]] = json.load(file)
+            return baseline
+    except FileNotFoundError:
+        return None
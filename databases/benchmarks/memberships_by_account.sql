@@ -0,0 +1,82 @@
+-- Compares lookups of memberships by account_id with the indexes from
+-- memberships_account_created_at_id and with memberships_account_covering,
+-- which adds user_id and owner to it, at 1M memberships.
+-- Runs in a scratch schema that is dropped at the end.
+
+\set ON_ERROR_STOP on
+\timing on
+
+drop schema if exists benchmark cascade;
+create schema benchmark;
+set search_path = benchmark;
+
+create table accounts (like public.accounts including defaults including constraints);
+create table users (like public.users including defaults including constraints);
+create table memberships (like public.memberships including defaults including constraints);
+alter table accounts add primary key (id);
+alter table users add primary key (id);
+alter table memberships add primary key (id);
+
+insert into accounts (name)
+select 'account ' || n from generate_series(1, 1000) n;
+
+insert into users (email)
+select 'user' || n || '@example.com' from generate_series(1, 100000) n;
+
+insert into memberships (account_id, user_id, owner)
+select account_ids.ids[1 + (numbered_users.n * 10 + k) % 1000], numbered_users.id, k = 0
+from (select id, row_number() over () as n from users) numbered_users,
+     (select array_agg(id) as ids from accounts) account_ids,
+     generate_series(0, 9) k;
+
+create unique index memberships_unique_user_and_account on memberships (user_id, account_id);
+create index memberships_account_created_at_id on memberships (account_id, created_at, id);
+create index memberships_user_created_at_id on memberships (user_id, created_at, id);
+vacuum analyze accounts, users, memberships;
+
+select memberships.account_id, memberships.user_id
+from memberships
+order by memberships.account_id, memberships.user_id
+limit 1 \gset
+
+\echo 'find_for_account with memberships_account_created_at_id'
+explain (analyze, buffers, costs off)
+select u.id, u.email from users u
+join memberships m on u.id = m.user_id
+where m.account_id = :'account_id';
+
+\echo 'page_for_account with memberships_account_created_at_id'
+explain (analyze, buffers, costs off)
+select u.id, u.email, m.created_at as cursor_created_at, m.id as cursor_id
+from users u
+join memberships m on u.id = m.user_id
+where m.account_id = :'account_id'
+order by m.created_at, m.id
+limit 51;
+
+\echo 'delete lookup with memberships_unique_user_and_account'
+explain (analyze, buffers, costs off)
+select owner from memberships
+where account_id = :'account_id' and user_id = :'user_id';
+
+create index memberships_account_covering on memberships (account_id, created_at, id) include (user_id, owner);
+drop index memberships_account_created_at_id;
+vacuum analyze memberships;
+
+\echo 'find_for_account with memberships_account_covering'
+explain (analyze, buffers, costs off)
+select u.id, u.email from users u
+join memberships m on u.id = m.user_id
+where m.account_id = :'account_id';
+
+\echo 'page_for_account with memberships_account_covering'
+explain (analyze, buffers, costs off)
+select u.id, u.email, m.created_at as cursor_created_at, m.id as cursor_id
+from users u
+join memberships m on u.id = m.user_id
+where m.account_id = :'account_id'
+order by m.created_at, m.id
+limit 51;
+
+reset search_path;
+drop schema benchmark cascade;
@@ -0,0 +1,35 @@
+"""create sessions table
+
+Revision ID: 5b7d2e8a41c6
+Revises: c3a1f0e9b2d4
+Create Date: 2026-10-18 15:02:44.108723
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "5b7d2e8a41c6"
+down_revision: Union[str, None] = "c3a1f0e9b2d4"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+    create table sessions (
+        id varchar not null primary key,
+        data text not null,
+        expires_at timestamp not null
+    );
+
+    create index sessions_expires_at on sessions (expires_at);
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute("drop table sessions")
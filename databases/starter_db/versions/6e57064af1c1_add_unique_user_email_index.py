@@ -0,0 +1,61 @@
+"""add unique user email index
+
+Revision ID: 6e57064af1c1
+Revises: 9e0e0f7e6fe1
+Create Date: 2026-10-18 10:03:17.881402
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "6e57064af1c1"
+down_revision: Union[str, None] = "9e0e0f7e6fe1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+    create temporary table duplicate_users on commit drop as
+        select id, keeper_id from (
+            select id, first_value(id) over (
+                partition by lower(email) order by created_at nulls last, id
+            ) as keeper_id
+            from users
+        ) ranked
+        where id != keeper_id;
+
+    insert into memberships (account_id, user_id, owner, created_at)
+        select memberships.account_id, duplicate_users.keeper_id,
+            bool_or(memberships.owner), min(memberships.created_at)
+        from memberships
+        join duplicate_users on memberships.user_id = duplicate_users.id
+        group by memberships.account_id, duplicate_users.keeper_id
+    on conflict (user_id, account_id) do update
+        set owner = memberships.owner or excluded.owner;
+
+    delete from memberships using duplicate_users
+        where memberships.user_id = duplicate_users.id;
+
+    delete from users using duplicate_users
+        where users.id = duplicate_users.id;
+    """
+    )
+
+    with op.get_context().autocommit_block():
+        op.execute("drop index concurrently if exists users_unique_email")
+        op.execute(
+            """
+        create unique index concurrently users_unique_email
+            on users (lower(email));
+        """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("drop index concurrently if exists users_unique_email")
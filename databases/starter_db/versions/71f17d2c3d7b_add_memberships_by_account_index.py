@@ -0,0 +1,41 @@
+"""add memberships by account index
+
+Revision ID: 71f17d2c3d7b
+Revises: 6e57064af1c1
+Create Date: 2026-10-18 10:41:09.517230
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "71f17d2c3d7b"
+down_revision: Union[str, None] = "6e57064af1c1"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+        create index concurrently if not exists memberships_account_covering
+            on memberships (account_id, created_at, id) include (user_id, owner);
+        """
+        )
+        op.execute(
+            "drop index concurrently if exists memberships_account_created_at_id"
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+        create index concurrently if not exists memberships_account_created_at_id
+            on memberships (account_id, created_at, id);
+        """
+        )
+        op.execute("drop index concurrently if exists memberships_account_covering")
@@ -0,0 +1,41 @@
+"""add membership pagination indexes
+
+Revision ID: 9e0e0f7e6fe1
+Revises: 0c42ad691606
+Create Date: 2026-10-18 09:12:41.204518
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "9e0e0f7e6fe1"
+down_revision: Union[str, None] = "0c42ad691606"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute(
+            """
+        create index concurrently if not exists memberships_account_created_at_id
+            on memberships (account_id, created_at, id);
+        """
+        )
+        op.execute(
+            """
+        create index concurrently if not exists memberships_user_created_at_id
+            on memberships (user_id, created_at, id);
+        """
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.execute("drop index concurrently if exists memberships_user_created_at_id")
+        op.execute(
+            "drop index concurrently if exists memberships_account_created_at_id"
+        )
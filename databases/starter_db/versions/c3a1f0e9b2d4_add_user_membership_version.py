@@ -0,0 +1,29 @@
+"""add user membership version
+
+Revision ID: c3a1f0e9b2d4
+Revises: 71f17d2c3d7b
+Create Date: 2026-10-18 14:21:09.417305
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = "c3a1f0e9b2d4"
+down_revision: Union[str, None] = "71f17d2c3d7b"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.execute(
+        """
+    alter table users add column membership_version bigint not null default 0;
+    """
+    )
+
+
+def downgrade() -> None:
+    op.execute("alter table users drop column membership_version")